@@ -0,0 +1,7 @@
+"""
+Benchmarks for the Tkinter and PyQt front-ends' data layers.
+
+Each module is a standalone script, run from the repository root, e.g.::
+
+    python -m benchmarks.bulk_insert
+"""
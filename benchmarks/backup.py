@@ -0,0 +1,103 @@
+"""
+Compares the previous SQL text dump (``iterdump`` out, ``executescript`` in) with the
+online-backup images written by ``DatabaseManager.backup``, plain and gzip-compressed:
+time, file size and peak RSS, each backup and restore in a fresh process.
+
+Usage::
+
+    python -m benchmarks.backup [--rows N]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.bulk_insert import student_rows
+from benchmarks.support import ROOT, load_tk_app, timer
+
+
+FORMATS = {
+    "dump": "backup.sql",
+    "image": "backup.db",
+    "image.gz": "backup.db.gz",
+}
+
+
+def dump_backup(manager, filename):
+    # The previous DatabaseManager.backup.
+    with open(filename, "w") as file:
+        for line in manager.connection.iterdump():
+            file.write("%s\n" % line)
+
+
+def dump_restore(manager, filename):
+    # The previous DatabaseManager.restore.
+    with open(filename, "r") as file:
+        script = file.read()
+    manager.cursor.executescript(script)
+    manager.connection.commit()
+
+
+def run_one(directory, backup_format, step):
+    """
+    Backs up or restores once in this process and prints the measurements as JSON.
+    """
+    app = load_tk_app()
+    file_name = os.path.join(directory, FORMATS[backup_format])
+    if step == "backup":
+        manager = app.DatabaseManager(os.path.join(directory, "source.db"))
+        with timer() as elapsed:
+            if backup_format == "dump":
+                dump_backup(manager, file_name)
+            else:
+                manager.backup(file_name)
+    else:
+        manager = app.DatabaseManager(os.path.join(directory, f"restored-{backup_format}.db"))
+        with timer() as elapsed:
+            if backup_format == "dump":
+                dump_restore(manager, file_name)
+            else:
+                manager.restore(file_name)
+    manager.close()
+    print(json.dumps({
+        "seconds": elapsed["seconds"],
+        "bytes": os.path.getsize(file_name),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--run", nargs=3, metavar=("DIRECTORY", "FORMAT", "STEP"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(*args.run)
+        return
+
+    app = load_tk_app()
+    directory = tempfile.mkdtemp(prefix="bench-backup-")
+    source = os.path.join(directory, "source.db")
+    app.create_tables(source)
+    manager = app.DatabaseManager(source)
+    manager.create_students(student_rows(args.rows))
+    manager.close()
+
+    print(f"{'format':<10} {'step':<8} {'seconds':>9} {'MB':>9} {'peak RSS MB':>12}")
+    for backup_format in FORMATS:
+        for step in ("backup", "restore"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.backup", "--run", directory, backup_format, step],
+                cwd=ROOT, check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{backup_format:<10} {step:<8} {result['seconds']:>9.2f} "
+                  f"{result['bytes'] / 1e6:>9.1f} {result['peak_rss_kb'] / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares validating student rows with ``StudentSchema(many=True).load`` against
+``database.validate_batch`` on the same rows as a DataFrame, with one invalid row in
+every hundred, and checks that both report the same errors.
+
+Usage::
+
+    python -m benchmarks.batch_validation [--rows N]
+"""
+import argparse
+
+from benchmarks.support import load_qt_app, report, timer
+
+INVALID = [
+    {"age": "0"},
+    {"age": "twenty"},
+    {"age": "9" * 5000},
+    {"email": "not-an-email"},
+    {"email": "a@b"},
+    {"name": ""},
+]
+
+
+def student_records(count):
+    """
+    Builds ``count`` student rows as text, as they are read from a CSV file.
+    """
+    records = []
+    for i in range(count):
+        record = {"name": f"Student {i}", "age": str(18 + i % 10), "email": f"student{i}@mail.com",
+                  "student_id": f"S{i:07d}"}
+        if i % 100 == 99:
+            record.update(INVALID[i // 100 % len(INVALID)])
+        records.append({key: value for key, value in record.items() if value != ""})
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    db = load_qt_app().database
+    records = student_records(args.rows)
+    frame = pd.DataFrame(records, dtype=object)
+
+    with timer() as elapsed:
+        try:
+            db.StudentSchema(many=True).load(records)
+            expected = {}
+        except db.ValidationError as err:
+            expected = err.messages
+    report("marshmallow many=True", args.rows, elapsed["seconds"])
+
+    with timer() as elapsed:
+        values, invalid, errors = db.validate_batch(db.StudentSchema, frame)
+    report("validate_batch", args.rows, elapsed["seconds"])
+
+    print(f"{int(invalid.sum())} invalid rows, messages {'match' if errors == expected else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares per-row ``DatabaseManager.create_student`` with the bulk ``create_students``,
+under each SQLite connection profile.
+
+Usage::
+
+    python -m benchmarks.bulk_insert [--rows N] [--per-row-rows N] [--batch-size N]
+                                     [--profiles durable fast-bulk read-mostly]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.support import load_tk_app, report, timer
+
+
+def student_rows(count):
+    """
+    Generates synthetic (name, age, email) tuples.
+
+    :param count: The number of rows to generate.
+    :type count: int
+    """
+    for i in range(count):
+        yield (f"Student {i}", 18 + i % 10, f"student{i}@mail.com")
+
+
+def fresh_manager(app, directory, name, profile):
+    """
+    Opens a DatabaseManager on a new database file with the app's tables.
+    """
+    path = os.path.join(directory, name)
+    app.create_tables(path, profile)
+    return app.DatabaseManager(path, profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=40000, help="rows for the bulk path")
+    parser.add_argument("--per-row-rows", type=int, default=2000, help="rows for the per-row path")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--profiles", nargs="+", default=None, help="connection profiles to compare")
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    directory = tempfile.mkdtemp(prefix="bench-bulk-")
+
+    for profile in args.profiles or list(app.SQLITE_PROFILES):
+        manager = fresh_manager(app, directory, f"per_row_{profile}.db", profile)
+        with timer() as elapsed:
+            for row in student_rows(args.per_row_rows):
+                manager.create_student(*row)
+        manager.close()
+        report(f"{profile}: create_student (per row)", args.per_row_rows, elapsed["seconds"])
+
+        manager = fresh_manager(app, directory, f"bulk_{profile}.db", profile)
+        with timer() as elapsed:
+            inserted = manager.create_students(student_rows(args.rows), batch_size=args.batch_size)
+        manager.close()
+        report(f"{profile}: create_students (batch {args.batch_size})", inserted, elapsed["seconds"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Compares the 'data.json' snapshot with the mmap-backed columnar 'data.col': file size,
+save time, time until read_data() returns, and time to build every record.
+
+Usage::
+
+    python -m benchmarks.columnar_snapshot [--sizes 100000 1000000] [--courses-per-student 6]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.snapshot_codec import populate
+from benchmarks.support import load_tk_app, timer, working_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--courses-per-student", type=int, default=6)
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    print(f"{'records':>10} {'format':>9} {'MB':>8} {'save ms':>9} {'open ms':>9} {'first record ms':>16} {'all records ms':>15}")
+    for size in args.sizes:
+        with working_directory(tempfile.mkdtemp(prefix="bench-columnar-")):
+            populate(app, size, args.courses_per_student)
+            for snapshot_format in ("json", "columnar"):
+                with timer() as save:
+                    app.update_data(snapshot_format)
+                megabytes = os.path.getsize(app.SNAPSHOT_FILES[snapshot_format]) / 1e6
+                with timer() as opened:
+                    students, instructors, courses = app.read_data(snapshot_format)
+                with timer() as first:
+                    students[size // 2]
+                with timer() as full:
+                    for student in students:
+                        pass
+                print(f"{size:>10} {snapshot_format:>9} {megabytes:>8.1f} {save['seconds'] * 1000:>9.1f} "
+                      f"{opened['seconds'] * 1000:>9.2f} {first['seconds'] * 1000:>16.3f} {full['seconds'] * 1000:>15.1f}")
+                del students, instructors, courses
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Measures read throughput of ``PooledDatabaseManager`` as reader threads are added,
+while a writer thread keeps inserting students through the same manager.
+
+Each reader runs a full-table ``COUNT(*) ... LIKE`` scan, which spends its time inside
+SQLite with the GIL released, so reads can overlap. The writer commits one row per
+transaction for the whole run. Parallel reads need more than one CPU; the number
+available is printed first. On a single CPU the readers take turns, and any rise in
+reads/s is taken from the writer, whose writes/s drops accordingly.
+
+The run doubles as a check of the pooled and async paths: every concurrent read must
+return what the same query returns on a plain DatabaseManager, every write counted by
+the writer must be in the file afterwards, and the same reads and writes made through
+AsyncDatabaseManager must agree with the serial ones. A mismatch raises AssertionError.
+
+Usage::
+
+    python -m benchmarks.concurrency [--rows N] [--threads 1 2 4 8] [--seconds S]
+                                     [--profile durable]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.bulk_insert import student_rows
+from benchmarks.support import load_tk_app
+
+# Only the seeded rows are counted, so the answer does not move while the writer runs.
+QUERY = "SELECT COUNT(*) FROM students WHERE email LIKE ? AND student_id <= ?"
+WRITER_QUERY = "SELECT COUNT(*) FROM students WHERE email LIKE 'writer%'"
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+def pattern(index):
+    return f"%{index}7%"
+
+
+def count_matches(manager, index, seeded):
+    """
+    Runs the read query for reader ``index`` through ``manager``.
+    """
+    with manager.reading() as cursor:
+        cursor.execute(QUERY, (pattern(index), seeded))
+        return cursor.fetchone()[0]
+
+
+def count_writes(path):
+    """
+    Counts the writer's rows with a plain DatabaseManager.
+    """
+    manager = load_tk_app().DatabaseManager(path)
+    with manager.reading() as cursor:
+        cursor.execute(WRITER_QUERY)
+        written = cursor.fetchone()[0]
+    manager.close()
+    return written
+
+
+def reader(manager, stop, counts, index, expected, seeded):
+    """
+    Runs the read query until ``stop`` is set, counting completed queries and
+    answers that differ from ``expected``.
+    """
+    while not stop.is_set():
+        if count_matches(manager, index, seeded) != expected[index]:
+            counts["wrong"] += 1
+        counts[index] += 1
+
+
+def writer(manager, stop, counts, start):
+    """
+    Inserts one student per transaction until ``stop`` is set.
+    """
+    i = start
+    while not stop.is_set():
+        manager.create_student(f"Writer {i}", 20, f"writer{i}@mail.com")
+        counts["writes"] += 1
+        i += 1
+
+
+def run(manager, threads, seconds, write_offset, expected, seeded):
+    """
+    Runs ``threads`` readers alongside one writer for ``seconds``.
+
+    :return: Reads per second, writes per second and the number of writes.
+    :rtype: tuple
+    :raises AssertionError: If any read returned a wrong answer.
+    """
+    stop = threading.Event()
+    counts = {"writes": 0, "wrong": 0}
+    counts.update((i, 0) for i in range(threads))
+    workers = [threading.Thread(target=writer, args=(manager, stop, counts, write_offset))]
+    workers += [threading.Thread(target=reader, args=(manager, stop, counts, i, expected, seeded))
+                for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    assert counts["wrong"] == 0, f"{counts['wrong']} concurrent reads differed from the serial result"
+    reads = sum(counts[i] for i in range(threads))
+    return reads / seconds, counts["writes"] / seconds, counts["writes"]
+
+
+async def check_async(path, pool_size, expected, seeded, write_offset):
+    """
+    Makes the readers' queries and a batch of writes concurrently through
+    AsyncDatabaseManager and compares them with the serial results.
+
+    :return: The number of rows written.
+    :rtype: int
+    """
+    app = load_tk_app()
+    async with app.AsyncDatabaseManager(path, pool_size=pool_size) as db:
+        writes = 50
+        results = await asyncio.gather(
+            *(db.run(count_matches, db.manager, i, seeded) for i in range(len(expected))),
+            *(db.create_student(f"Writer {write_offset + i}", 20, f"writer{write_offset + i}@mail.com")
+              for i in range(writes)))
+        assert results[:len(expected)] == expected, "async reads differed from the serial result"
+        students = await db.read_students()
+    serial = app.DatabaseManager(path)
+    assert students == serial.read_students(), "async read_students differed from the serial result"
+    serial.close()
+    return writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="students seeded before the run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of each run")
+    parser.add_argument("--profile", default="durable")
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-pool-"), "students.db")
+    app.create_tables(path, args.profile)
+    serial = app.DatabaseManager(path, args.profile)
+    serial.create_students(student_rows(args.rows))
+    expected = [count_matches(serial, i, args.rows) for i in range(max(args.threads))]
+    serial.close()
+    manager = app.PooledDatabaseManager(path, pool_size=max(args.threads), profile=args.profile)
+
+    print(f"{available_cpus()} CPUs available")
+    print(f"{'readers':>8} {'reads/s':>10} {'scaling':>8} {'writes/s':>10}")
+    baseline = None
+    written = 0
+    for threads in args.threads:
+        reads, writes, count = run(manager, threads, args.seconds, written, expected, args.rows)
+        written += count
+        assert count_writes(path) == written, "a committed write is missing from the file"
+        baseline = baseline or reads
+        print(f"{threads:>8} {reads:>10.1f} {reads / baseline:>7.2f}x {writes:>10.1f}")
+    manager.close()
+
+    written += asyncio.run(check_async(path, max(args.threads), expected, args.rows, written))
+    assert count_writes(path) == written, "an async write is missing from the file"
+    print("concurrent and async results match the serial path")
+
+
+if __name__ == "__main__":
+    main()
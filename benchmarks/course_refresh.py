@@ -0,0 +1,67 @@
+"""
+Counts the SQL statements needed to build course view rows, with the lazy
+per-course instructor lookup and with ``database.course_query()``.
+
+Usage::
+
+    python -m benchmarks.course_refresh [--courses N]
+"""
+import argparse
+
+from sqlalchemy import event
+
+from benchmarks.support import load_qt_app, report, timer
+
+
+def seed(db, count):
+    """
+    Inserts ``count`` courses, every other one with an instructor.
+    """
+    instructors = [db.InstructorTable(name=f"Instructor {i}", age=40, email=f"instructor{i}@mail.com",
+                                       instructor_id=f"I{i}") for i in range(count // 10 + 1)]
+    db.session.add_all(instructors)
+    db.session.add_all(db.CourseTable(course_name=f"Course {i}", course_id=f"C{i}",
+                                        instructor=instructors[i % len(instructors)] if i % 2 else None)
+                        for i in range(count))
+    db.session.commit()
+
+
+def measure(db, label, build_rows):
+    """
+    Runs ``build_rows`` against an empty identity map and reports time and statements.
+    """
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    db.session.expunge_all()
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        with timer() as elapsed:
+            rows = build_rows()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    report(label, len(rows), elapsed["seconds"])
+    print(f"{'':<32} {len(statements):>10} statements")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--courses", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = load_qt_app()
+    db = app.database
+    seed(db, args.courses)
+
+    def lazy_rows():
+        rows = []
+        for course in db.session.query(db.CourseTable).all():
+            instructor = db.session.query(db.InstructorTable).filter_by(id=course.instructor_id).first()
+            rows.append((course.course_name, course.course_id, instructor.instructor_id if instructor else "N/A"))
+        return rows
+
+    measure(db, "per-course instructor query", lazy_rows)
+    measure(db, "course_query() (joined load)", lambda: [app.course_row(course) for course in db.course_query().all()])
+
+
+if __name__ == "__main__":
+    main()
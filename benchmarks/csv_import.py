@@ -0,0 +1,137 @@
+"""
+Measures ``database.import_from_csv``: students, then instructors, courses that
+reference them and enrollments, from generated CSV files with one invalid row in
+every thousand.
+
+Before timing, it checks that an import failing part-way through the file (a byte
+that is not UTF-8) leaves no rows behind and the search index triggers in place.
+Afterwards it exports every table with ``export_to_csv``, imports the files into a
+new database and checks that nothing was rejected or changed, and that a row with
+two unknown foreign keys is rejected with both errors.
+
+Usage::
+
+    python -m benchmarks.csv_import [--students N] [--courses N] [--enrollments N]
+                                    [--chunk-size N]
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+
+from benchmarks.support import load_qt_app, report, timer
+
+
+def write_csv(file_name, header, rows):
+    with open(file_name, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def student_rows(count):
+    for i in range(count):
+        email = "not-an-email" if i % 1000 == 999 else f"student{i}@mail.com"
+        yield (f"Student {i}", 18 + i % 10, email, f"S{i:07d}")
+
+
+def check_failed_import(db, directory):
+    """
+    Imports a students file that cannot be decoded near its end and checks that the
+    import rolled back and that full-text search still sees students added after it.
+    """
+    file_name = os.path.join(directory, "broken.csv")
+    with open(file_name, "wb") as file:
+        file.write(b"name,age,email,student_id\n")
+        file.writelines(f"Broken {i},20,broken{i}@mail.com,B{i:07d}\n".encode() for i in range(50000))
+        file.write(b"caf\xe9,20,cafe@mail.com,B9999999\n")
+    try:
+        db.import_from_csv("students", file_name)
+    except UnicodeDecodeError:
+        pass
+    else:
+        raise AssertionError("the broken file was imported")
+    assert db.student_query().count() == 0, "the failed import left rows behind"
+    db.session.add(db.StudentTable(name="Searchable", age=20, email="searchable@mail.com", student_id="Q0000001"))
+    db.session.commit()
+    found = db.full_text_search(db.student_query(), db.StudentTable, "searchable").all()
+    assert [student.student_id for student in found] == ["Q0000001"], "the search index trigger is missing"
+    db.session.delete(found[0])
+    db.session.commit()
+    print("failed import rolled back; search triggers intact")
+
+
+def exported_rows(db, table_name, file_name):
+    """
+    Exports a table and reads the file back without its ``id`` column, sorted.
+    """
+    db.export_to_csv(table_name, file_name)
+    with open(file_name, newline="") as file:
+        rows = [{name: value for name, value in row.items() if name != "id"} for row in csv.DictReader(file)]
+    return sorted(rows, key=lambda row: sorted(row.items()))
+
+
+def check_round_trip(db, directory, tables):
+    """
+    Exports ``tables`` from the current database, imports the files into a new one
+    and compares the two exports.
+    """
+    exports = {}
+    for table_name in tables:
+        file_name = os.path.join(directory, f"export_{table_name}.csv")
+        exports[table_name] = exported_rows(db, table_name, file_name)
+    db.init_database(f"sqlite:///{os.path.join(directory, 'round_trip.db')}")
+    for table_name in tables:
+        file_name = os.path.join(directory, f"export_{table_name}.csv")
+        imported, rejected = db.import_from_csv(table_name, file_name)
+        assert rejected == 0 and imported == len(exports[table_name]), \
+            f"{table_name}: {rejected} exported rows were rejected on import"
+        reexport = exported_rows(db, table_name, os.path.join(directory, f"reexport_{table_name}.csv"))
+        assert reexport == exports[table_name], f"{table_name} changed in the export/import round trip"
+
+    file_name = os.path.join(directory, "unknown_keys.csv")
+    write_csv(file_name, ["student_id", "course_id"], [("S-missing", "C-missing")])
+    db.import_from_csv("student_course", file_name, file_name + ".rejects.csv")
+    with open(file_name + ".rejects.csv", newline="") as file:
+        errors = json.loads(next(csv.DictReader(file))["errors"])
+    assert sorted(errors) == ["course_id", "student_id"], f"only {sorted(errors)} reported"
+    print("export/import round trip matches; every foreign key error reported")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--courses", type=int, default=1000)
+    parser.add_argument("--enrollments", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-import-")
+    db = load_qt_app(directory).database
+    check_failed_import(db, directory)
+    files = {
+        "students": os.path.join(directory, "students.csv"),
+        "instructors": os.path.join(directory, "instructors.csv"),
+        "courses": os.path.join(directory, "courses.csv"),
+        "student_course": os.path.join(directory, "enrollments.csv"),
+    }
+    write_csv(files["students"], ["name", "age", "email", "student_id"], student_rows(args.students))
+    write_csv(files["instructors"], ["name", "age", "email", "instructor_id"],
+              ((f"Instructor {i}", 40, f"instructor{i}@mail.com", f"I{i:05d}") for i in range(args.courses // 10 + 1)))
+    write_csv(files["courses"], ["course_name", "course_id", "instructor_id"],
+              ((f"Course {i}", f"C{i:05d}", f"I{i // 10:05d}") for i in range(args.courses)))
+    write_csv(files["student_course"], ["student_id", "course_id"],
+              ((f"S{i % args.students:07d}", f"C{(i * 7) % args.courses:05d}") for i in range(args.enrollments)))
+
+    for table_name, file_name in files.items():
+        with timer() as elapsed:
+            imported, rejected = db.import_from_csv(
+                table_name, file_name, file_name + ".rejects.csv", chunk_size=args.chunk_size)
+        report(f"{table_name} ({rejected} rejected)", imported, elapsed["seconds"])
+
+    check_round_trip(db, directory, files)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures registration latency for a student who already has N courses: the previous
+``course not in student.courses`` check against ``database.enroll`` (one
+INSERT ... ON CONFLICT DO NOTHING) and the in-memory ``EnrollmentCache``.
+
+Usage::
+
+    python -m benchmarks.enrollment [--existing 0 10 100 1000] [--registrations 50]
+"""
+import argparse
+
+from benchmarks.support import load_qt_app, timer
+
+
+def seed(db, students, courses):
+    """
+    Inserts ``students`` students and ``courses`` courses.
+    """
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO students (name, age, email, student_id) VALUES (?, ?, ?, ?)",
+            [(f"Student {i}", 20, f"student{i}@mail.com", f"S{i:07d}") for i in range(students)])
+        connection.exec_driver_sql(
+            "INSERT INTO courses (course_name, course_id) VALUES (?, ?)",
+            [(f"Course {i}", f"C{i:05d}") for i in range(courses)])
+
+
+def give_courses(db, student, count):
+    """
+    Registers ``student`` for courses 1 to ``count``.
+    """
+    if not count:
+        return
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT OR IGNORE INTO student_course (student_id, course_id) VALUES (?, ?)",
+            [(student, course) for course in range(1, count + 1)])
+
+
+def check_packing(db):
+    """
+    Checks that pairs which share a packed key under a 32-bit split, and pairs at the
+    ends of SQLite's integer range, stay distinct in the cache.
+    """
+    low, high = -2 ** 63, 2 ** 63 - 1
+    pairs = [(1, 2 ** 32), (2, 0), (0, 2 ** 32), (1, 0), (1, -1), (0, -1),
+             (low, high), (high, low), (low, low), (high, high)]
+    cache = db.EnrollmentCache(pairs)
+    assert len(cache) == len(pairs), len(cache)
+    assert all(pair in cache for pair in pairs)
+    assert (2, 2 ** 32) not in cache and (-1, 0) not in cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--existing", type=int, nargs="+", default=[0, 10, 100, 1000])
+    parser.add_argument("--registrations", type=int, default=50)
+    args = parser.parse_args()
+
+    db = load_qt_app().database
+    check_packing(db)
+    most = max(args.existing)
+    seed(db, 3 * len(args.existing), most + 3 * args.registrations)
+    print(f"{'existing':>9} {'relationship ms':>16} {'enroll ms':>10} {'cached ms':>10}")
+    for n, existing in enumerate(args.existing):
+        students = [3 * n + 1, 3 * n + 2, 3 * n + 3]
+        for student in students:
+            give_courses(db, student, existing)
+        new_courses = [most + 1 + i for i in range(args.registrations)]
+
+        with timer() as relationship:
+            for course_key in new_courses:
+                student = db.session.get(db.StudentTable, students[0])
+                course = db.session.get(db.CourseTable, course_key)
+                if course not in student.courses:
+                    student.courses.append(course)
+                    db.session.commit()
+        with timer() as enroll:
+            for course_key in new_courses:
+                db.enroll(students[1], course_key)
+        cache = db.EnrollmentCache.load()
+        with timer() as cached:
+            for course_key in new_courses:
+                cache.enroll(students[2], course_key)
+        print(f"{existing:>9} {relationship['seconds'] / args.registrations * 1000:>16.2f} "
+              f"{enroll['seconds'] / args.registrations * 1000:>10.2f} {cached['seconds'] / args.registrations * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
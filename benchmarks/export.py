@@ -0,0 +1,89 @@
+"""
+Measures the streaming exporters on the ``student_course`` table: throughput in MB/s
+of output and peak RSS, each format in a fresh process.
+
+Usage::
+
+    python -m benchmarks.export [--rows N] [--chunk-size N]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.support import ROOT, load_qt_app, timer
+
+
+FORMATS = {
+    "csv": "enrollments.csv",
+    "csv.gz": "enrollments.csv.gz",
+    "csv.xz": "enrollments.csv.xz",
+    "parquet": "enrollments.parquet",
+}
+
+
+def seed(db, count):
+    """
+    Fills ``student_course`` with ``count`` synthetic rows.
+    """
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO student_course (student_id, course_id) "
+            "WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i + 1 < ?) "
+            "SELECT i / 5 + 1, i % 500 + 1 FROM n",
+            (count,),
+        )
+
+
+def run_one(directory, export_format, chunk_size):
+    """
+    Exports once in this process and prints the measurements as JSON.
+    """
+    db = load_qt_app(directory).database
+    file_name = os.path.join(directory, FORMATS[export_format])
+    with timer() as elapsed:
+        if export_format == "parquet":
+            rows = db.export_to_parquet("student_course", file_name, chunk_size=chunk_size)
+        else:
+            rows = db.export_to_csv("student_course", file_name, chunk_size=chunk_size)
+    print(json.dumps({
+        "format": export_format,
+        "rows": rows,
+        "seconds": elapsed["seconds"],
+        "bytes": os.path.getsize(file_name),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--run", nargs=2, metavar=("DIRECTORY", "FORMAT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(args.run[0], args.run[1], args.chunk_size)
+        return
+
+    directory = tempfile.mkdtemp(prefix="bench-export-")
+    seed(load_qt_app(directory).database, args.rows)
+    print(f"{'format':<10} {'rows':>10} {'seconds':>9} {'rows/s':>10} {'MB':>9} {'MB/s':>9} {'peak RSS MB':>12}")
+    for export_format in FORMATS:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.export", "--chunk-size", str(args.chunk_size),
+             "--run", directory, export_format],
+            cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        megabytes = result["bytes"] / 1e6
+        print(f"{export_format:<10} {result['rows']:>10} {result['seconds']:>9.2f} "
+              f"{result['rows'] / result['seconds']:>10.0f} {megabytes:>9.1f} "
+              f"{megabytes / result['seconds']:>9.1f} {result['peak_rss_kb'] / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
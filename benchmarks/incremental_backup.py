@@ -0,0 +1,73 @@
+"""
+Compares a full ``DatabaseManager.backup`` with ``backup_incremental`` after a day's
+worth of changes, and measures what change tracking costs the writes.
+
+Usage::
+
+    python -m benchmarks.incremental_backup [--rows N] [--changes N]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.bulk_insert import fresh_manager, student_rows
+from benchmarks.support import load_tk_app, report, timer
+
+
+def change(manager, count, offset):
+    """
+    Updates, deletes and inserts ``count`` students in total, one commit each.
+    """
+    for i in range(count):
+        student_id = offset + i * 7 + 1
+        if i % 3 == 0:
+            manager.update_student(student_id, f"Renamed {i}", 30, f"renamed{i}@mail.com")
+        elif i % 3 == 1:
+            manager.delete_student(student_id)
+        else:
+            manager.create_student(f"New {i}", 19, f"new{offset + i}@mail.com")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--changes", type=int, default=1000, help="changed rows between backups")
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    directory = tempfile.mkdtemp(prefix="bench-incremental-")
+
+    for tracked in (False, True):
+        manager = fresh_manager(app, directory, f"tracked_{tracked}.db", app.DEFAULT_PROFILE)
+        if tracked:
+            manager.track_changes()
+        label = "tracked" if tracked else "untracked"
+        with timer() as elapsed:
+            inserted = manager.create_students(student_rows(args.rows))
+        report(f"{label}: create_students", inserted, elapsed["seconds"])
+        with timer() as elapsed:
+            change(manager, args.changes, 0)
+        report(f"{label}: per-row changes", args.changes, elapsed["seconds"])
+        manager.close()
+
+    manager = app.DatabaseManager(os.path.join(directory, "tracked_True.db"))
+    base = os.path.join(directory, "base.db.gz")
+    with timer() as elapsed:
+        manager.backup(base)
+    print(f"{'full backup':<32} {os.path.getsize(base) / 1e6:>10.1f} MB {elapsed['seconds']:>9.3f} s")
+    change(manager, args.changes, args.changes * 7)
+    delta = os.path.join(directory, "delta.jsonl.gz")
+    with timer() as elapsed:
+        rows = manager.backup_incremental(delta)
+    print(f"{'incremental backup':<32} {os.path.getsize(delta) / 1e6:>10.3f} MB {elapsed['seconds']:>9.3f} s "
+          f"({rows} rows)")
+    rebuilt = app.DatabaseManager(os.path.join(directory, "rebuilt.db"))
+    with timer() as elapsed:
+        rebuilt.restore_incremental(base, [delta])
+    print(f"{'rebuild from base + delta':<32} {elapsed['seconds']:>24.3f} s")
+    rebuilt.close()
+    manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compares saving one new student with a full ``update_data`` rewrite and with the
+append-only ``journal_record``, at several dataset sizes.
+
+Usage::
+
+    python -m benchmarks.journal_save [--sizes 1000 10000 100000] [--saves N]
+"""
+import argparse
+import tempfile
+
+from benchmarks.support import load_tk_app, timer, working_directory
+
+
+def populate(app, size):
+    """
+    Replaces the app's in-memory records with ``size`` synthetic students.
+    """
+    app.students = [app.Student(f"Student {i}", 20, f"student{i}@mail.com", str(i), []) for i in range(size)]
+    app.instructors = [app.Instructor("John Doe", 30, "mail@mail.com", "12345", [])]
+    app.courses = [app.Course("CSC101", "Introduction to Computer Science", None, [])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--saves", type=int, default=20, help="single-student saves per measurement")
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    app.JOURNAL_COMPACT_BYTES = float("inf")
+    print(f"{'records':>10} {'update_data ms':>16} {'journal_record ms':>18}")
+    for size in args.sizes:
+        with working_directory(tempfile.mkdtemp(prefix="bench-journal-")):
+            populate(app, size)
+            app.update_data()
+
+            with timer() as full:
+                for i in range(args.saves):
+                    app.students.append(app.Student("New", 20, f"new{i}@mail.com", f"new{i}", []))
+                    app.update_data()
+            with timer() as journal:
+                for i in range(args.saves):
+                    student = app.Student("New", 20, f"journal{i}@mail.com", f"journal{i}", [])
+                    app.students.append(student)
+                    app.journal_record("students", student)
+        print(f"{size:>10} {full['seconds'] / args.saves * 1000:>16.3f} {journal['seconds'] / args.saves * 1000:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compares finding a student by ID and checking an email for duplicates with a linear
+scan of the list, as the Tk callbacks used to, against the Repository hash indexes.
+
+Usage::
+
+    python -m benchmarks.lookup [--sizes 1000 10000 100000] [--lookups 1000]
+"""
+import argparse
+import random
+
+from benchmarks.support import load_tk_app, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    rng = random.Random(0)
+    print(f"{'records':>10} {'scan us':>10} {'index us':>10} {'email scan us':>14} {'email index us':>15} {'index build ms':>15}")
+    for size in args.sizes:
+        records = [app.Student(f"Student {i}", 20, f"student{i}@mail.com", str(i), ()) for i in range(size)]
+        keys = [str(rng.randrange(size)) for _ in range(args.lookups)]
+        emails = [f"student{key}@mail.com" for key in keys]
+
+        with timer() as scan:
+            for key in keys:
+                next(student for student in records if student.student_id == key)
+        with timer() as email_scan:
+            for email in emails:
+                any(student.get_email() == email for student in records)
+
+        repository = app.Repository("students", records)
+        with timer() as build:
+            repository.has_id("")
+        with timer() as index:
+            for key in keys:
+                repository.get(key)
+        with timer() as email_index:
+            for email in emails:
+                repository.has_email(email)
+        print(f"{size:>10} {scan['seconds'] / args.lookups * 1e6:>10.1f} {index['seconds'] / args.lookups * 1e6:>10.2f} "
+              f"{email_scan['seconds'] / args.lookups * 1e6:>14.1f} {email_index['seconds'] / args.lookups * 1e6:>15.2f} "
+              f"{build['seconds'] * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures the memory held per Tk ``Student`` record, comparing the slotted model class
+with the previous layout: a per-instance ``__dict__`` and a list of course ID strings.
+
+Records are decoded from JSON the way ``read_data`` decodes them, so every course ID
+starts out as its own string object.
+
+Usage::
+
+    python -m benchmarks.model_memory [--records 100000] [--courses-per-student 6]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.support import load_tk_app
+
+
+class DictStudent:
+    """
+    The pre-slots ``Student`` layout, kept here as the baseline.
+    """
+
+    def __init__(self, name, age, email, student_id, registered_courses):
+        self.name = name
+        self.age = age
+        self._Person__email = email
+        self.student_id = student_id
+        self.registered_courses = list(registered_courses)
+
+
+def encoded_students(count, courses_per_student, course_count=500):
+    """
+    Builds the serialized form of ``count`` students.
+    """
+    return [
+        json.dumps({
+            "name": f"Student {i}",
+            "age": 18 + i % 10,
+            "_Person__email": f"student{i}@mail.com",
+            "student_id": str(i),
+            "registered_courses": [f"CSC{(i + k) % course_count:03d}" for k in range(courses_per_student)],
+        })
+        for i in range(count)
+    ]
+
+
+def bytes_per_record(cls, lines):
+    """
+    Decodes every line into ``cls`` and returns the traced bytes held per record.
+    """
+    gc.collect()
+    tracemalloc.start()
+    records = []
+    for line in lines:
+        data = json.loads(line)
+        records.append(cls(data["name"], data["age"], data["_Person__email"], data["student_id"], data["registered_courses"]))
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--courses-per-student", type=int, default=6)
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    lines = encoded_students(args.records, args.courses_per_student)
+    before = bytes_per_record(DictStudent, lines)
+    after = bytes_per_record(app.Student, lines)
+    print(f"{'layout':>10} {'bytes/record':>14}")
+    print(f"{'__dict__':>10} {before:>14.1f}")
+    print(f"{'__slots__':>10} {after:>14.1f}")
+    print(f"saved {1 - after / before:.1%} at {args.records} records")
+
+
+if __name__ == "__main__":
+    main()
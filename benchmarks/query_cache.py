@@ -0,0 +1,65 @@
+"""
+Replays the PyQt window's repeated reads (search pages, the registration lookups and
+the combobox names) with the query cache off and on. An enrollment is committed every
+few rounds, so the cached runs also pay for invalidation.
+
+Usage::
+
+    python -m benchmarks.query_cache [--students N] [--rounds N] [--terms N]
+                                     [--commit-every N]
+"""
+import argparse
+
+from benchmarks.enrollment import seed
+from benchmarks.support import load_qt_app, timer
+
+
+def replay(app, terms, rounds, commit_every):
+    """
+    Runs ``rounds`` rounds of searches and lookups.
+
+    :return: The number of reads made.
+    :rtype: int
+    """
+    db = app.database
+    model = app.PagedQueryModel(["Name", "Age", "Email", "ID"], app.student_row)
+    reads = 0
+    for round_number in range(rounds):
+        term = terms[round_number % len(terms)]
+        model.set_query(db.full_text_search(db.student_query(), db.StudentTable, term))
+        student = db.find_entity(db.StudentTable, "student_id", f"S{round_number % len(terms):07d}")
+        course = db.find_entity(db.CourseTable, "course_id", f"C{round_number % 10:05d}")
+        db.cached_query(("student_names",), ("students",), lambda: [
+            tuple(row) for row in db.session.query(db.StudentTable.name, db.StudentTable.student_id).
+            order_by(db.StudentTable.id)])
+        reads += 4
+        if round_number % commit_every == 0:
+            db.enroll(student.id, course.id)
+    return reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--terms", type=int, default=20, help="distinct search terms")
+    parser.add_argument("--commit-every", type=int, default=25)
+    args = parser.parse_args()
+
+    app = load_qt_app()
+    db = app.database
+    seed(db, args.students, 100)
+    terms = [f"student{i}" for i in range(args.terms)]
+
+    print(f"{'cache':>6} {'ms/round':>9} {'hits':>7} {'misses':>7} {'invalidations':>14}")
+    for label, size in (("off", 0), ("on", db.QUERY_CACHE_SIZE)):
+        db.query_cache = db.QueryCache(size)
+        with timer() as elapsed:
+            replay(app, terms, args.rounds, args.commit_every)
+        stats = db.query_cache.stats()
+        print(f"{label:>6} {elapsed['seconds'] / args.rounds * 1000:>9.2f} {stats['hits']:>7} "
+              f"{stats['misses']:>7} {stats['invalidations']:>14}")
+
+
+if __name__ == "__main__":
+    main()
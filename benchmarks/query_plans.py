@@ -0,0 +1,121 @@
+"""
+Shows the query plans and latency of the PyQt window's lookups on a database file in
+the version 0 layout (no name or instructor indexes, ``student_course`` a rowid table
+with a unique pair index), then upgrades the file in place with
+``database.migrate_schema`` and shows them again.
+
+Usage::
+
+    python -m benchmarks.query_plans [--students N] [--courses N] [--enrollments N]
+                                     [--repeat N]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+
+from benchmarks.support import load_qt_app, timer
+
+# The layout init_database() created before versioned migrations.
+VERSION_0_SCHEMA = """
+CREATE TABLE students (
+    id INTEGER NOT NULL, name VARCHAR NOT NULL, age INTEGER NOT NULL, email VARCHAR NOT NULL,
+    student_id VARCHAR NOT NULL, PRIMARY KEY (id), UNIQUE (email), UNIQUE (student_id));
+CREATE TABLE instructors (
+    id INTEGER NOT NULL, name VARCHAR NOT NULL, age INTEGER NOT NULL, email VARCHAR NOT NULL,
+    instructor_id VARCHAR NOT NULL, PRIMARY KEY (id), UNIQUE (email), UNIQUE (instructor_id));
+CREATE TABLE courses (
+    id INTEGER NOT NULL, course_name VARCHAR NOT NULL, course_id VARCHAR NOT NULL, instructor_id INTEGER,
+    PRIMARY KEY (id), UNIQUE (course_id), FOREIGN KEY(instructor_id) REFERENCES instructors (id));
+CREATE TABLE student_course (
+    student_id INTEGER, course_id INTEGER,
+    FOREIGN KEY(student_id) REFERENCES students (id), FOREIGN KEY(course_id) REFERENCES courses (id));
+CREATE UNIQUE INDEX ix_student_course_pair ON student_course (student_id, course_id);
+"""
+
+
+def create_version_0(path, students, courses, enrollments):
+    """
+    Writes a version 0 database file with generated rows.
+    """
+    connection = sqlite3.connect(path)
+    connection.executescript(VERSION_0_SCHEMA)
+    instructors = courses // 10 + 1
+    with connection:
+        connection.executemany(
+            "INSERT INTO students (name, age, email, student_id) VALUES (?, ?, ?, ?)",
+            ((f"Student {i}", 20, f"student{i}@mail.com", f"S{i:07d}") for i in range(students)))
+        connection.executemany(
+            "INSERT INTO instructors (name, age, email, instructor_id) VALUES (?, ?, ?, ?)",
+            ((f"Instructor {i}", 40, f"instructor{i}@mail.com", f"I{i:05d}") for i in range(instructors)))
+        connection.executemany(
+            "INSERT INTO courses (course_name, course_id, instructor_id) VALUES (?, ?, ?)",
+            ((f"Course {i}", f"C{i:05d}", i % instructors + 1) for i in range(courses)))
+        connection.executemany(
+            "INSERT OR IGNORE INTO student_course (student_id, course_id) VALUES (?, ?)",
+            ((i % students + 1, (i * 7) % courses + 1) for i in range(enrollments)))
+    connection.close()
+
+
+def lookups(db, students, courses):
+    """
+    The statements the window runs to find rows, compiled with their parameters.
+
+    :return: (label, SQL) pairs.
+    :rtype: list
+    """
+    query_session = db.Session()
+    student, course = students // 2, courses // 2
+    statements = [
+        ("student by name", query_session.query(db.StudentTable).filter_by(name=f"Student {student}")),
+        ("course by name", query_session.query(db.CourseTable).filter_by(course_name=f"Course {course}")),
+        ("courses of instructor", query_session.query(db.CourseTable).filter_by(instructor_id=course // 10 + 1)),
+        ("students of course", query_session.query(db.StudentTable).join(db.StudentTable.courses).
+            filter(db.CourseTable.id == course)),
+        ("is enrolled", query_session.query(db.exists().where(
+            db.student_course.c.student_id == student, db.student_course.c.course_id == course))),
+    ]
+    query_session.close()
+    return [(label, str(query.statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})))
+            for label, query in statements]
+
+
+def measure(path, statements, repeat):
+    """
+    Prints each statement's query plan and mean latency.
+    """
+    connection = sqlite3.connect(path)
+    for label, sql in statements:
+        plan = "; ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        with timer() as elapsed:
+            for _ in range(repeat):
+                connection.execute(sql).fetchall()
+        print(f"  {label:<22} {elapsed['seconds'] / repeat * 1000:>9.3f} ms  {plan}")
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200000)
+    parser.add_argument("--courses", type=int, default=2000)
+    parser.add_argument("--enrollments", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = load_qt_app().database
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-plans-"), "version0.db")
+    create_version_0(path, args.students, args.courses, args.enrollments)
+    statements = lookups(db, args.students, args.courses)
+
+    print("version 0")
+    measure(path, statements, args.repeat)
+    engine = db.create_database_engine(f"sqlite:///{path}")
+    with timer() as elapsed:
+        db.migrate_schema(engine)
+    engine.dispose()
+    print(f"migrated to version {db.SCHEMA_VERSION} in {elapsed['seconds']:.2f} s")
+    measure(path, statements, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
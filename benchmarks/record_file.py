@@ -0,0 +1,52 @@
+"""
+Measures registering a student for a course when the data is kept in 'data.records':
+only that student's slot is read and rewritten. For comparison, the same registration
+followed by a full 'data.json' rewrite, as with JOURNAL_MODE off, and the time to open
+the record file's index against loading every record.
+
+Usage::
+
+    python -m benchmarks.record_file [--sizes 10000 100000] [--registrations 200]
+"""
+import argparse
+import tempfile
+
+from benchmarks.snapshot_codec import populate
+from benchmarks.support import load_tk_app, timer, working_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--registrations", type=int, default=200)
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    print(f"{'records':>10} {'record file ms':>15} {'full rewrite ms':>16} {'open index ms':>14} {'read all ms':>12}")
+    for size in args.sizes:
+        with working_directory(tempfile.mkdtemp(prefix="bench-records-")):
+            populate(app, size, 6)
+            app.update_data("records")
+            app.close_record_file()
+            with timer() as opened:
+                record_file = app.record_file()
+            with timer() as slot:
+                for i in range(args.registrations):
+                    student = record_file.read("students", str(i * size // args.registrations))
+                    student.register_course("EXTRA")
+                    record_file.write("students", student)
+            with timer() as everything:
+                record_file.read_all()
+
+            app.update_data("json")
+            with timer() as full:
+                for i in range(args.registrations // 10):
+                    app.students[i * size // args.registrations].register_course("EXTRA")
+                    app.write_snapshot(app.students, app.instructors, app.courses, "json")
+        print(f"{size:>10} {slot['seconds'] / args.registrations * 1000:>15.3f} "
+              f"{full['seconds'] / (args.registrations // 10) * 1000:>16.1f} "
+              f"{opened['seconds'] * 1000:>14.1f} {everything['seconds'] * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
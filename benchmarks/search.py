@@ -0,0 +1,58 @@
+"""
+Compares student search through the FTS5 index (``database.full_text_search``) with the
+previous ``LIKE '%term%'`` filter.
+
+Usage::
+
+    python -m benchmarks.search [--rows N] [--repeat N]
+"""
+import argparse
+
+from benchmarks.support import load_qt_app, timer
+
+
+TERMS = ["Student 4242", "student42", "4242", "Nobody"]
+
+
+def seed(db, count):
+    """
+    Inserts ``count`` students through a single executemany; the sync triggers index them.
+    """
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO students (name, age, email, student_id) VALUES (?, ?, ?, ?)",
+            [(f"Student {i}", 18 + i % 10, f"student{i}@mail.com", f"S{i:07d}") for i in range(count)],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = load_qt_app()
+    db = app.database
+    with timer() as elapsed:
+        seed(db, args.rows)
+    print(f"seeded {args.rows} students in {elapsed['seconds']:.1f} s")
+
+    StudentTable = db.StudentTable
+    print(f"{'term':<16} {'LIKE ms':>10} {'FTS5 ms':>10} {'LIKE rows':>10} {'FTS5 rows':>10}")
+    for term in TERMS:
+        like = db.session.query(StudentTable).filter(
+            (StudentTable.name.like(f"%{term}%")) | (StudentTable.student_id == term)
+        ).limit(app.PAGE_SIZE)
+        fts = db.full_text_search(db.session.query(StudentTable), StudentTable, term).limit(app.PAGE_SIZE)
+        with timer() as like_time:
+            for _ in range(args.repeat):
+                like_rows = len(like.all())
+        with timer() as fts_time:
+            for _ in range(args.repeat):
+                fts_rows = len(fts.all())
+        print(f"{term:<16} {like_time['seconds'] / args.repeat * 1000:>10.2f} "
+              f"{fts_time['seconds'] / args.repeat * 1000:>10.2f} {like_rows:>10} {fts_rows:>10}")
+
+
+if __name__ == "__main__":
+    main()
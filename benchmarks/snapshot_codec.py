@@ -0,0 +1,81 @@
+"""
+Compares saving and loading 'data.json' with the single-pass record codec against the
+old double encoding, where every record was a JSON string inside the outer document.
+
+Usage::
+
+    python -m benchmarks.snapshot_codec [--sizes 10000 100000] [--courses-per-student 6]
+"""
+import argparse
+import json
+import tempfile
+
+from benchmarks.support import load_tk_app, timer, working_directory
+
+
+def populate(app, size, courses_per_student):
+    """
+    Replaces the app's in-memory records with ``size`` synthetic students.
+    """
+    course_ids = [f"CSC{i:03d}" for i in range(500)]
+    app.students = [
+        app.Student(f"Student {i}", 20, f"student{i}@mail.com", str(i),
+                    [course_ids[(i + k) % len(course_ids)] for k in range(courses_per_student)])
+        for i in range(size)
+    ]
+    app.instructors = [app.Instructor("John Doe", 30, "mail@mail.com", "12345", course_ids)]
+    app.courses = [app.Course(course_id, "Course", None, []) for course_id in course_ids]
+
+
+def legacy_save(app):
+    """
+    The previous write_snapshot(): each record serialized on its own, then dumped again.
+    """
+    data = {
+        "students": [student.serialize() for student in app.students],
+        "instructors": [instructor.serialize() for instructor in app.instructors],
+        "courses": [course.serialize() for course in app.courses]
+    }
+    with open(app.DATA_FILE, "w") as file:
+        json.dump(data, file)
+
+
+def legacy_load(app):
+    """
+    The previous read_data(): the outer document, then every record string.
+    """
+    with open(app.DATA_FILE, "r") as file:
+        data = json.load(file)
+    return ([app.Student.deserialize(item) for item in data["students"]],
+            [app.Instructor.deserialize(item) for item in data["instructors"]],
+            [app.Course.deserialize(item) for item in data["courses"]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--courses-per-student", type=int, default=6)
+    args = parser.parse_args()
+
+    app = load_tk_app()
+    print(f"{'records':>10} {'legacy save ms':>15} {'save ms':>9} {'legacy load ms':>15} {'load ms':>9} {'old file load ms':>17}")
+    for size in args.sizes:
+        with working_directory(tempfile.mkdtemp(prefix="bench-codec-")):
+            populate(app, size, args.courses_per_student)
+            with timer() as old_save:
+                legacy_save(app)
+            with timer() as old_load:
+                legacy_load(app)
+            # read_data() on the legacy file goes through the compatibility path.
+            with timer() as compat_load:
+                app.read_data()
+            with timer() as save:
+                app.update_data()
+            with timer() as load:
+                app.read_data()
+        print(f"{size:>10} {old_save['seconds'] * 1000:>15.1f} {save['seconds'] * 1000:>9.1f} "
+              f"{old_load['seconds'] * 1000:>15.1f} {load['seconds'] * 1000:>9.1f} {compat_load['seconds'] * 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
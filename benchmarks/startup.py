@@ -0,0 +1,105 @@
+"""
+Startup cost of the PyQt front-end: ``python -X importtime`` for ``import pygt`` and
+wall-clock time from process launch to the first painted window.
+
+Usage::
+
+    python -m benchmarks.startup [--runs N] [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.support import QT_DIR
+
+
+HEAVY_MODULES = ("sqlalchemy", "marshmallow", "pandas", "pyarrow", "tkinter")
+
+FIRST_PAINT = f"""
+import sys, time
+sys.path.append({QT_DIR!r})
+import pygt
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+window = pygt.StudentManagementSystem()
+window.show()
+window.repaint()
+painted = time.time()
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(painted, ",".join(loaded) or "none")
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def import_times(top):
+    """
+    Runs ``import pygt`` under ``-X importtime``.
+
+    :return: The total import time in ms and the ``top`` slowest top-level imports.
+    :rtype: tuple
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.append({QT_DIR!r}); import pygt"],
+        cwd=tempfile.mkdtemp(prefix="bench-startup-"), env=child_env(), check=True,
+        capture_output=True, text=True,
+    ).stderr
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under their importer.
+        if cumulative.strip().isdigit() and not name.startswith("   "):
+            modules.append((int(cumulative) / 1000, name.strip()))
+    total = sum(ms for ms, name in modules)
+    return total, sorted(modules, reverse=True)[:top]
+
+
+def first_paint():
+    """
+    Launches a process that shows the main window.
+
+    :return: Seconds from launch to the first painted window, and the heavy modules
+        already imported at that point.
+    :rtype: tuple
+    """
+    start = time.time()
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_PAINT], cwd=tempfile.mkdtemp(prefix="bench-startup-"),
+        env=child_env(), check=True, capture_output=True, text=True,
+    ).stdout
+    painted, loaded = output.strip().splitlines()[-1].split(" ", 1)
+    return float(painted) - start, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    total, slowest = import_times(args.top)
+    print(f"import pygt: {total:.1f} ms")
+    for ms, name in slowest:
+        print(f"  {ms:>8.1f} ms  {name}")
+
+    samples = []
+    for _ in range(args.runs):
+        seconds, loaded = first_paint()
+        samples.append(seconds)
+    samples.sort()
+    print(f"launch to first paint: median {samples[len(samples) // 2] * 1000:.0f} ms, "
+          f"best {samples[0] * 1000:.0f} ms over {args.runs} runs")
+    print(f"heavy modules imported before first paint: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
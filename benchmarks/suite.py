@@ -0,0 +1,213 @@
+"""
+Reproducible data-layer benchmark suite.
+
+Generates a seeded synthetic dataset, runs timed scenarios against the Tk app's
+``DatabaseManager`` and the PyQt app's ``database`` module, and writes the results as
+JSON so runs on different commits can be compared. Runs headless.
+
+Usage::
+
+    python -m benchmarks.suite --size 100000 --seed 0 --output results.json
+    python -m benchmarks.suite --size 100000 --compare results.json
+    python -m benchmarks.suite --size 1000 --only tk
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import tempfile
+from itertools import islice
+
+from benchmarks.support import ROOT, load_qt_app, load_tk_app, timer
+from benchmarks.synthetic import SyntheticDataset
+
+
+BATCH_SIZE = 10000
+REGISTRATIONS = 200
+SEARCHES = 30
+
+
+class Results:
+    """
+    Collects timed scenarios and prints one line per scenario as it finishes.
+    """
+
+    def __init__(self):
+        self.scenarios = []
+
+    def measure(self, name, fn, unit="rows"):
+        """
+        Times ``fn()``, which returns how many ``unit`` it processed.
+        """
+        with timer() as elapsed:
+            count = fn()
+        seconds = elapsed["seconds"]
+        rate = count / seconds if seconds else None
+        self.scenarios.append({"scenario": name, "count": count, "unit": unit, "seconds": seconds, "per_second": rate})
+        print(f"{name:<28} {count:>11} {unit:<5} {seconds:>10.3f} s {rate or 0:>14.0f} {unit}/s")
+
+
+def batched(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_tk(dataset, results, directory):
+    app = load_tk_app()
+    path = os.path.join(directory, "tk.db")
+    app.create_tables(path)
+    manager = app.DatabaseManager(path)
+
+    results.measure("tk.insert.students",
+                    lambda: manager.create_students((name, age, email) for name, age, email, _ in dataset.students()))
+    results.measure("tk.insert.instructors",
+                    lambda: manager.create_instructors((name, age, email) for name, age, email, _ in dataset.instructors()))
+    results.measure("tk.insert.courses",
+                    lambda: manager.create_courses((name, instructor) for name, _, instructor in dataset.courses()))
+    results.measure("tk.insert.registrations", lambda: manager.create_registrations(dataset.enrollments()))
+
+    pairs = list(islice(dataset.enrollments(), REGISTRATIONS))
+
+    def register():
+        for student_id, course_id in pairs:
+            manager.create_registration(student_id, course_id)
+        return len(pairs)
+
+    results.measure("tk.registration", register)
+    results.measure("tk.refresh.students", lambda: len(manager.read_students()))
+    results.measure("tk.refresh.courses", lambda: len(manager.read_courses()))
+    results.measure("tk.refresh.registrations", lambda: len(manager.read_registrations()))
+
+    backup = os.path.join(directory, "tk.backup")
+    results.measure("tk.backup", lambda: manager.backup(backup) or os.path.getsize(backup), unit="bytes")
+    manager.close()
+
+    restored = app.DatabaseManager(os.path.join(directory, "tk_restored.db"))
+    results.measure("tk.restore", lambda: restored.restore(backup) or os.path.getsize(backup), unit="bytes")
+    restored.close()
+
+
+def run_qt(dataset, results, directory):
+    db = load_qt_app(directory).database
+
+    def insert(query, rows):
+        count = 0
+        with db.engine.begin() as connection:
+            for batch in batched(rows):
+                connection.exec_driver_sql(query, batch)
+                count += len(batch)
+        return count
+
+    results.measure("qt.insert.students", lambda: insert(
+        "INSERT INTO students (name, age, email, student_id) VALUES (?, ?, ?, ?)", dataset.students()))
+    results.measure("qt.insert.instructors", lambda: insert(
+        "INSERT INTO instructors (name, age, email, instructor_id) VALUES (?, ?, ?, ?)", dataset.instructors()))
+    results.measure("qt.insert.courses", lambda: insert(
+        "INSERT INTO courses (course_name, course_id, instructor_id) VALUES (?, ?, ?)", dataset.courses()))
+    results.measure("qt.insert.enrollments", lambda: insert(
+        "INSERT INTO student_course (student_id, course_id) VALUES (?, ?)", dataset.enrollments()))
+
+    terms = dataset.search_terms(SEARCHES)
+
+    def search():
+        rows = 0
+        for term in terms:
+            rows += len(db.full_text_search(db.student_query(), db.StudentTable, term).limit(200).all())
+        return rows
+
+    results.measure("qt.search.students", search)
+
+    # Shift each course by one so most pairs are new enrollments.
+    pairs = [(student, (course % dataset.course_count) + 1)
+             for student, course in islice(dataset.enrollments(), REGISTRATIONS)]
+
+    def register():
+        # The same steps as StudentManagementSystem.register_student_for_course.
+        enrollments = db.EnrollmentCache()
+        for student_row, course_row in pairs:
+            student = db.session.get(db.StudentTable, student_row)
+            course = db.session.get(db.CourseTable, course_row)
+            enrollments.enroll(student.id, course.id)
+        return len(pairs)
+
+    results.measure("qt.registration", register)
+    db.session.expunge_all()
+    results.measure("qt.refresh.students", lambda: len(db.student_query().all()))
+    results.measure("qt.refresh.courses", lambda: len(db.course_query().all()))
+    results.measure("qt.refresh.enrollments", lambda: len(db.enrollment_query().all()))
+    db.session.expunge_all()
+
+    for table_name in ("students", "courses", "student_course"):
+        file_name = os.path.join(directory, f"{table_name}.csv")
+        results.measure(f"qt.export.{table_name}", lambda: db.export_to_csv(table_name, file_name))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_file, scenarios):
+    """
+    Prints the speed-up of each scenario against a previous results file.
+    """
+    with open(previous_file) as file:
+        previous = {entry["scenario"]: entry for entry in json.load(file)["results"]}
+    print(f"\n{'scenario':<28} {'before s':>10} {'after s':>10} {'speed-up':>9}")
+    for entry in scenarios:
+        before = previous.get(entry["scenario"])
+        if before and entry["seconds"]:
+            print(f"{entry['scenario']:<28} {before['seconds']:>10.3f} {entry['seconds']:>10.3f} "
+                  f"{before['seconds'] / entry['seconds']:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10000, help="number of students (1k to 10M)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", choices=("tk", "qt"), help="run only one front-end's scenarios")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="RESULTS", help="a previous results file to compare against")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+    previous = os.path.abspath(args.compare) if args.compare else None
+
+    dataset = SyntheticDataset(args.size, seed=args.seed)
+    directory = tempfile.mkdtemp(prefix="bench-suite-")
+    results = Results()
+    if args.only in (None, "tk"):
+        run_tk(dataset, results, directory)
+    if args.only in (None, "qt"):
+        run_qt(dataset, results, directory)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "size": args.size,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "results": results.scenarios,
+    }
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nresults written to {output}")
+    if previous:
+        compare(previous, results.scenarios)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TK_APP = os.path.join(ROOT, "tkinter", "tkinter.py")
+QT_DIR = os.path.join(ROOT, "pyqt")
+
+
+@contextmanager
+def working_directory(path):
+    """
+    Temporarily changes the current working directory.
+
+    :param path: The directory to switch to.
+    :type path: str
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+
+
+def load_tk_app():
+    """
+    Imports the Tkinter front-end as module ``main`` without starting its GUI.
+
+    The file is named ``tkinter.py`` and would shadow the standard library if its
+    directory were put on ``sys.path``, so it is loaded by path instead. Its import-time
+    side effects (reading ``data.json``, creating ``students.db``) happen in a scratch
+    directory.
+
+    :return: The loaded module.
+    :rtype: module
+    """
+    if "main" in sys.modules:
+        return sys.modules["main"]
+    spec = importlib.util.spec_from_file_location("main", TK_APP)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["main"] = module
+    with working_directory(tempfile.mkdtemp(prefix="tkapp-")):
+        spec.loader.exec_module(module)
+    return module
+
+
+def load_qt_app(directory=None):
+    """
+    Imports the PyQt front-end as module ``pygt`` and initializes its data layer.
+
+    It is loaded by path for the same reason as load_tk_app(); its own directory goes
+    at the end of ``sys.path`` so ``database`` can be imported without the sibling
+    ``tkinter.py`` shadowing the standard library. The engine uses a relative database
+    path, which SQLite resolves against the working directory every time a new
+    connection opens, so this switches to ``directory`` (a scratch directory by
+    default) for the rest of the run.
+
+    :param directory: Where the app's database file is created.
+    :type directory: str
+    :return: The loaded module; its data layer is ``module.database``.
+    :rtype: module
+    """
+    if "pygt" in sys.modules:
+        return sys.modules["pygt"]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if QT_DIR not in sys.path:
+        sys.path.append(QT_DIR)
+    spec = importlib.util.spec_from_file_location("pygt", os.path.join(QT_DIR, "pygt.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["pygt"] = module
+    os.chdir(directory or tempfile.mkdtemp(prefix="qtapp-"))
+    spec.loader.exec_module(module)
+    module.init_app()
+    return module
+
+
+@contextmanager
+def timer():
+    """
+    Measures wall-clock time of the enclosed block.
+
+    :return: A dict whose ``seconds`` key is filled in when the block exits.
+    :rtype: dict
+    """
+    result = {"seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def report(label, rows, seconds):
+    """
+    Prints a one-line throughput summary.
+
+    :param label: The scenario name.
+    :type label: str
+    :param rows: The number of rows processed.
+    :type rows: int
+    :param seconds: The elapsed time.
+    :type seconds: float
+    """
+    rate = rows / seconds if seconds else float("inf")
+    print(f"{label:<32} {rows:>10} rows {seconds:>9.3f} s {rate:>12.0f} rows/s")
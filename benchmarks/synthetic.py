@@ -0,0 +1,106 @@
+"""
+Seeded synthetic registrar data for the benchmarks.
+
+The same size and seed always produce the same rows, on any machine, so results from
+different commits can be compared. Rows are generated lazily, so datasets of millions
+of students never have to fit in memory.
+"""
+import random
+
+
+FIRST_NAMES = (
+    "Alice", "Bilal", "Carla", "Dana", "Elias", "Fatima", "George", "Hana", "Ibrahim", "Julia",
+    "Karim", "Layla", "Maya", "Nadim", "Omar", "Petra", "Rami", "Sara", "Tarek", "Yasmine",
+)
+LAST_NAMES = (
+    "Haddad", "Khoury", "Smith", "Nasser", "Saad", "Chen", "Garcia", "Hammoud", "Aoun", "Rizk",
+    "Johnson", "Fares", "Khalil", "Mansour", "Daher", "Brown", "Salem", "Youssef", "Issa", "Taylor",
+)
+SUBJECTS = (
+    ("EECE", "Software Engineering"), ("CMPS", "Data Structures"), ("MATH", "Linear Algebra"),
+    ("PHYS", "Electromagnetism"), ("CHEM", "Organic Chemistry"), ("BIOL", "Genetics"),
+    ("ECON", "Microeconomics"), ("ENGL", "Technical Writing"), ("HIST", "Modern History"),
+    ("ARCH", "Urban Design"),
+)
+
+
+class SyntheticDataset:
+    """
+    A reproducible dataset of students, instructors, courses, and enrollments.
+
+    :param students: The number of students.
+    :type students: int
+    :param seed: The random seed.
+    :type seed: int
+    :param courses_per_student: The maximum number of courses a student takes.
+    :type courses_per_student: int
+    """
+
+    def __init__(self, students, seed=0, courses_per_student=6):
+        self.student_count = students
+        self.instructor_count = max(1, students // 50)
+        self.course_count = max(1, students // 20)
+        self.seed = seed
+        self.courses_per_student = min(courses_per_student, self.course_count)
+
+    def _random(self, stream):
+        # One independent stream per entity, so each generator can be restarted alone.
+        return random.Random(f"{self.seed}:{stream}")
+
+    def _person(self, rng, index):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        return f"{first} {last}", f"{first.lower()}.{last.lower()}{index}@example.edu"
+
+    def students(self):
+        """
+        Yields (name, age, email, student_id) tuples.
+        """
+        rng = self._random("students")
+        for i in range(self.student_count):
+            name, email = self._person(rng, i)
+            yield name, rng.randint(17, 30), email, f"S{i:08d}"
+
+    def instructors(self):
+        """
+        Yields (name, age, email, instructor_id) tuples.
+        """
+        rng = self._random("instructors")
+        for i in range(self.instructor_count):
+            name, email = self._person(rng, i)
+            yield name, rng.randint(28, 70), email, f"I{i:06d}"
+
+    def courses(self):
+        """
+        Yields (course_name, course_id, instructor_row) tuples; instructor_row is the
+        1-based position of the teaching instructor in instructors().
+        """
+        rng = self._random("courses")
+        for i in range(self.course_count):
+            code, title = rng.choice(SUBJECTS)
+            yield f"{title} {i}", f"{code}{i:06d}", rng.randint(1, self.instructor_count)
+
+    def enrollments(self):
+        """
+        Yields (student_row, course_row) pairs, both 1-based, without duplicates.
+        """
+        rng = self._random("enrollments")
+        for student in range(1, self.student_count + 1):
+            for course in rng.sample(range(1, self.course_count + 1), rng.randint(0, self.courses_per_student)):
+                yield student, course
+
+    def search_terms(self, count):
+        """
+        Returns ``count`` search strings of the kinds users type: names, name
+        prefixes, and student IDs.
+        """
+        rng = self._random("search")
+        terms = []
+        for i in range(count):
+            kind = i % 3
+            if kind == 0:
+                terms.append(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+            elif kind == 1:
+                terms.append(rng.choice(LAST_NAMES)[:3])
+            else:
+                terms.append(f"S{rng.randrange(self.student_count):08d}")
+        return terms
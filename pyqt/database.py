@@ -0,0 +1,964 @@
+import re
+import os
+import csv
+import json
+import gzip
+import lzma
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from sqlalchemy import create_engine, event, inspect, Column, Integer, String, ForeignKey, Table, Index, text, table, column, select, exists
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker, relationship, joinedload, selectinload, object_mapper
+from sqlalchemy.sql.util import find_tables
+from marshmallow import Schema, fields, validate, ValidationError
+
+DATABASE_URL = 'sqlite:///student_managementpyqt.db'
+
+# Connection profiles: the PRAGMAs applied to every connection the engine opens. They
+# match the Tkinter app's SQLITE_PROFILES. All use WAL, so the view loaders on the
+# thread pool keep reading while the window commits.
+#   durable      every commit is fsynced; the default.
+#   fast-bulk    no fsyncs and a large cache for imports; a power cut can lose the
+#                latest commits, though an application crash cannot.
+#   read-mostly  commits are fsynced at checkpoints only, and the file is mapped into
+#                memory with a large cache for repeated reads.
+SQLITE_PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8192,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    'fast-bulk': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'read-mostly': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 1073741824,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+DEFAULT_PROFILE = 'durable'
+
+Base = declarative_base()
+engine = None
+Session = sessionmaker()
+session = None
+
+
+# The (student_id, course_id) primary key is the table itself: WITHOUT ROWID stores the
+# rows in that key's B-tree, so a pair check is one SEARCH and duplicates are refused.
+# The course_id index serves the course-to-students direction.
+student_course = Table('student_course', Base.metadata,
+    Column('student_id', Integer, ForeignKey('students.id'), primary_key=True),
+    Column('course_id', Integer, ForeignKey('courses.id'), primary_key=True),
+    Index('ix_student_course_course_id', 'course_id'),
+    sqlite_with_rowid=False,
+)
+class StudentTable(Base):
+    __tablename__ = 'students'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False, index=True)
+    age = Column(Integer, nullable=False)
+    email = Column(String, nullable=False, unique=True)
+    student_id = Column(String, nullable=False, unique=True)
+    courses = relationship('CourseTable', secondary=student_course, back_populates='students')
+
+class InstructorTable(Base):
+    __tablename__ = 'instructors'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    age = Column(Integer, nullable=False)
+    email = Column(String, nullable=False, unique=True)
+    instructor_id = Column(String, nullable=False, unique=True)
+    courses = relationship('CourseTable', back_populates='instructor')
+
+class CourseTable(Base):
+    __tablename__ = 'courses'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    course_name = Column(String, nullable=False, index=True)
+    course_id = Column(String, nullable=False, unique=True)
+    instructor_id = Column(Integer, ForeignKey('instructors.id'), index=True)
+    instructor = relationship('InstructorTable', back_populates='courses')
+    students = relationship('StudentTable', secondary=student_course, back_populates='courses')
+
+# Full-text search. Each table gets an external-content FTS5 index over its names,
+# emails and IDs; triggers keep it in step with every INSERT, UPDATE and DELETE.
+SEARCH_INDEXES = {
+    'students': ('students_fts', ('name', 'email', 'student_id')),
+    'instructors': ('instructors_fts', ('name', 'email', 'instructor_id')),
+    'courses': ('courses_fts', ('course_name', 'course_id')),
+}
+
+def create_search_index(engine):
+    with engine.begin() as connection:
+        for table_name, (index_name, columns) in SEARCH_INDEXES.items():
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": index_name}
+            ).first()
+            if exists:
+                continue
+            names = ", ".join(columns)
+            new_values = ", ".join(f"new.{name}" for name in columns)
+            old_values = ", ".join(f"old.{name}" for name in columns)
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {index_name} USING fts5({names}, content='{table_name}', content_rowid='id')"
+            )
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER {index_name}_ai AFTER INSERT ON {table_name} BEGIN "
+                f"INSERT INTO {index_name}(rowid, {names}) VALUES (new.id, {new_values}); END"
+            )
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER {index_name}_ad AFTER DELETE ON {table_name} BEGIN "
+                f"INSERT INTO {index_name}({index_name}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            connection.exec_driver_sql(
+                f"CREATE TRIGGER {index_name}_au AFTER UPDATE ON {table_name} BEGIN "
+                f"INSERT INTO {index_name}({index_name}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {index_name}(rowid, {names}) VALUES (new.id, {new_values}); END"
+            )
+            # Index the rows that existed before the search table did.
+            connection.exec_driver_sql(f"INSERT INTO {index_name}({index_name}) VALUES ('rebuild')")
+
+def match_expression(search_term):
+    # Every word must match; the last one may still be half-typed, so it matches
+    # as a prefix: "alice smi" -> "alice" "smi"*
+    words = [f'"{word}"' for word in re.findall(r"\w+", search_term)]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+def full_text_search(query, model, search_term):
+    expression = match_expression(search_term)
+    if not expression:
+        return query.order_by(model.id)
+    index_name = SEARCH_INDEXES[model.__tablename__][0]
+    index = table(index_name, column('rowid'), column('rank'), column(index_name))
+    return query.join(index, index.c.rowid == model.id).\
+        filter(index.c[index_name].op('MATCH')(expression)).\
+        order_by(index.c.rank)
+
+class StudentSchema(Schema):
+    name = fields.String(required=True, validate=validate.Length(min=1))
+    age = fields.Integer(required=True, validate=validate.Range(min=1))
+    email = fields.Email(required=True)
+    student_id = fields.String(required=True, validate=validate.Length(min=1))
+
+class InstructorSchema(Schema):
+    name = fields.String(required=True, validate=validate.Length(min=1))
+    age = fields.Integer(required=True, validate=validate.Range(min=1))
+    email = fields.Email(required=True)
+    instructor_id = fields.String(required=True, validate=validate.Length(min=1))
+
+class CourseSchema(Schema):
+    course_name = fields.String(required=True, validate=validate.Length(min=1))
+    course_id = fields.String(required=True, validate=validate.Length(min=1))
+    # The instructor's public instructor_id, not the instructors.id primary key.
+    instructor_id = fields.String()
+
+class EnrollmentSchema(Schema):
+    student_id = fields.String(required=True, validate=validate.Length(min=1))
+    course_id = fields.String(required=True, validate=validate.Length(min=1))
+
+instructor_schema = InstructorSchema()
+course_schema = CourseSchema()
+student_schema = StudentSchema()
+
+def create_database_engine(url=DATABASE_URL, profile=DEFAULT_PROFILE):
+    """
+    Creates an engine whose connections get the PRAGMAs of an SQLITE_PROFILES entry.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    pragmas = SQLITE_PROFILES[profile]
+    new_engine = create_engine(url)
+
+    @event.listens_for(new_engine, 'connect')
+    def apply_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+    return new_engine
+
+def init_database(url=DATABASE_URL, profile=DEFAULT_PROFILE):
+    """
+    Opens the database, creates any missing tables and search indexes, and migrates
+    an older file to SCHEMA_VERSION.
+
+    Nothing touches the database at import time; call this once at startup.
+    """
+    global engine, session
+    engine = create_database_engine(url, profile)
+    Session.configure(bind=engine)
+    session = Session()
+    migrate_schema(engine)
+    create_search_index(engine)
+    return engine
+
+# Schema migrations. PRAGMA user_version holds the schema version of a database file,
+# and MIGRATIONS[n - 1] upgrades a file from version n - 1 to n. Each step runs in one
+# transaction with its version bump, so an interrupted upgrade resumes at the step it
+# stopped in. A new file is created at SCHEMA_VERSION by create_all() and skips them.
+# The steps spell out their DDL instead of reading the models, which keep changing.
+
+def add_lookup_indexes(connection):
+    """Version 1: B-tree indexes on the columns the window looks rows up by."""
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_students_name ON students (name)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_courses_course_name ON courses (course_name)")
+    connection.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_courses_instructor_id ON courses (instructor_id)")
+
+def rebuild_student_course(connection):
+    """
+    Version 2: rebuilds ``student_course`` as a WITHOUT ROWID table keyed by
+    (student_id, course_id). Duplicate pairs and pairs with a NULL side are dropped.
+    """
+    connection.exec_driver_sql(
+        "CREATE TABLE student_course_new ("
+        "student_id INTEGER NOT NULL REFERENCES students (id), "
+        "course_id INTEGER NOT NULL REFERENCES courses (id), "
+        "PRIMARY KEY (student_id, course_id)) WITHOUT ROWID")
+    connection.exec_driver_sql(
+        "INSERT OR IGNORE INTO student_course_new (student_id, course_id) "
+        "SELECT student_id, course_id FROM student_course "
+        "WHERE student_id IS NOT NULL AND course_id IS NOT NULL "
+        "ORDER BY student_id, course_id")
+    connection.exec_driver_sql("DROP TABLE student_course")
+    connection.exec_driver_sql("ALTER TABLE student_course_new RENAME TO student_course")
+    connection.exec_driver_sql("CREATE INDEX ix_student_course_course_id ON student_course (course_id)")
+
+MIGRATIONS = [add_lookup_indexes, rebuild_student_course]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def schema_version(connection):
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+def migrate_schema(engine):
+    """
+    Creates any missing tables, then brings the database to SCHEMA_VERSION.
+
+    :return: The version the database was at before; SCHEMA_VERSION for a new file.
+    :raises RuntimeError: If the file is newer than this code.
+    """
+    with engine.begin() as connection:
+        version = schema_version(connection)
+        if version == 0 and not inspect(connection).has_table('students'):
+            version = SCHEMA_VERSION
+            connection.exec_driver_sql(f"PRAGMA user_version = {version}")
+        Base.metadata.create_all(connection)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f"The database is at schema version {version}; this version of the app "
+                           f"only knows up to {SCHEMA_VERSION}.")
+    while True:
+        with engine.begin() as connection:
+            # sqlite3 would run the DDL outside any transaction. Taking the write lock
+            # first also makes a second process wait and then see the new version.
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            current = schema_version(connection)
+            if current >= SCHEMA_VERSION:
+                return version
+            MIGRATIONS[current](connection)
+            connection.exec_driver_sql(f"PRAGMA user_version = {current + 1}")
+
+# Read queries. Views load through these so related rows arrive with their parents
+# in a fixed number of statements instead of one lazy load per row.
+
+def student_query(query_session=None):
+    return (query_session or session).query(StudentTable)
+
+def students_with_courses(query_session=None):
+    # One extra SELECT ... WHERE id IN (...) per page loads every student's courses.
+    return (query_session or session).query(StudentTable).options(selectinload(StudentTable.courses))
+
+def instructor_query(query_session=None):
+    return (query_session or session).query(InstructorTable)
+
+def course_query(query_session=None):
+    # The instructor is LEFT OUTER JOINed into the same statement.
+    return (query_session or session).query(CourseTable).options(joinedload(CourseTable.instructor))
+
+def enrollment_query(query_session=None):
+    return (query_session or session).query(StudentTable, CourseTable).\
+        join(student_course, StudentTable.id == student_course.c.student_id).\
+        join(CourseTable, CourseTable.id == student_course.c.course_id)
+
+# Enrollments. The (student_id, course_id) primary key makes a membership check one
+# indexed EXISTS and a registration one INSERT ... ON CONFLICT DO NOTHING, so neither
+# depends on how many courses the student already has.
+
+def is_enrolled(student_key, course_key, query_session=None):
+    """
+    Tells whether a student is registered for a course, by primary key.
+    """
+    return (query_session or session).query(exists().where(
+        student_course.c.student_id == student_key,
+        student_course.c.course_id == course_key)).scalar()
+
+def enroll(student_key, course_key, query_session=None):
+    """
+    Registers a student for a course, by primary key, and commits.
+
+    :return: True if the enrollment is new, False if it already existed.
+    """
+    query_session = query_session or session
+    result = query_session.execute(
+        insert(student_course).values(student_id=student_key, course_id=course_key).
+        on_conflict_do_nothing(index_elements=['student_id', 'course_id']))
+    query_session.commit()
+    return result.rowcount == 1
+
+# Shifts a signed 64-bit SQLite integer key to a non-negative one.
+KEY_OFFSET = 2 ** 63
+
+class EnrollmentCache:
+    """
+    Known (student, course) enrollments, by primary key, for checks in the GUI.
+
+    Each pair is packed into one int, which takes far less memory than a tuple. SQLite
+    keys are signed 64-bit integers, so each is shifted into 0 .. 2**64 - 1 and given
+    64 bits of its own, and no two pairs share a packed value. The cache only ever
+    answers "enrolled"; a pair it does not hold is checked against the database by
+    enroll(), and remembered either way.
+    """
+    def __init__(self, pairs=()):
+        self.pairs = {self.pack(student_key, course_key) for student_key, course_key in pairs}
+
+    @staticmethod
+    def pack(student_key, course_key):
+        return (student_key + KEY_OFFSET) << 64 | (course_key + KEY_OFFSET)
+
+    @classmethod
+    def load(cls, query_session=None):
+        """Builds a cache holding every enrollment in the database."""
+        return cls((query_session or session).execute(
+            select(student_course.c.student_id, student_course.c.course_id)))
+
+    def __contains__(self, pair):
+        return self.pack(*pair) in self.pairs
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def add(self, student_key, course_key):
+        self.pairs.add(self.pack(student_key, course_key))
+
+    def enroll(self, student_key, course_key, query_session=None):
+        """
+        Registers a student for a course unless the pair is already known.
+
+        :return: True if the enrollment is new, False if it already existed.
+        """
+        if (student_key, course_key) in self:
+            return False
+        added = enroll(student_key, course_key, query_session)
+        self.add(student_key, course_key)
+        return added
+
+# Async access. Each call runs on an executor thread with a connection and session of
+# its own; the connection's progress handler polls the call's cancel event every
+# CANCEL_CHECK_STEPS SQLite instructions and aborts the statement once it is set.
+
+CANCEL_CHECK_STEPS = 1000
+
+def run_with_session(cancelled, fn, args):
+    """
+    Runs ``fn(worker_session, *args)`` on a connection that aborts once ``cancelled`` is set.
+    """
+    if cancelled.is_set():
+        return None
+    with engine.connect() as connection:
+        dbapi_connection = connection.connection.dbapi_connection
+        dbapi_connection.set_progress_handler(cancelled.is_set, CANCEL_CHECK_STEPS)
+        worker_session = Session(bind=connection)
+        try:
+            return fn(worker_session, *args)
+        finally:
+            worker_session.close()
+            dbapi_connection.set_progress_handler(None, 0)
+
+class AsyncDatabase:
+    """
+    Runs data-layer calls from asyncio code without blocking the event loop.
+
+    ``run(fn, *args)`` awaits ``fn(worker_session, *args)`` on a thread pool, with a
+    session of its own that is closed when ``fn`` returns; the other coroutines wrap
+    the module's queries and enrollment functions. Every call takes an optional
+    ``timeout`` in seconds, defaulting to the one given here.
+
+    A call that is cancelled, or outlives its timeout, raises CancelledError or
+    TimeoutError at once. If it has not started it never runs; if its statement is
+    running, SQLite aborts it and uncommitted changes are rolled back. init_database()
+    must have been called first.
+    """
+    def __init__(self, max_workers=4, timeout=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='database')
+        self.timeout = timeout
+
+    async def run(self, fn, *args, timeout=None):
+        cancelled = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, partial(run_with_session, cancelled, fn, args))
+        try:
+            return await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            cancelled.set()
+            raise
+
+    async def read_students(self, timeout=None):
+        return await self.run(lambda worker_session: student_query(worker_session).all(), timeout=timeout)
+
+    async def read_instructors(self, timeout=None):
+        return await self.run(lambda worker_session: instructor_query(worker_session).all(), timeout=timeout)
+
+    async def read_courses(self, timeout=None):
+        return await self.run(lambda worker_session: course_query(worker_session).all(), timeout=timeout)
+
+    async def read_enrollments(self, timeout=None):
+        return await self.run(lambda worker_session: enrollment_query(worker_session).all(), timeout=timeout)
+
+    async def add(self, record, timeout=None):
+        """
+        Inserts a new StudentTable, InstructorTable or CourseTable row and commits.
+
+        :return: The record, refreshed so its generated keys can be read.
+        """
+        def add_record(worker_session):
+            worker_session.add(record)
+            worker_session.commit()
+            worker_session.refresh(record)
+            return record
+        return await self.run(add_record, timeout=timeout)
+
+    async def is_enrolled(self, student_key, course_key, timeout=None):
+        return await self.run(
+            lambda worker_session: is_enrolled(student_key, course_key, worker_session), timeout=timeout)
+
+    async def create_registration(self, student_key, course_key, timeout=None):
+        """
+        Registers a student for a course, by primary key, through enroll().
+
+        :return: True if the enrollment is new, False if it already existed.
+        """
+        return await self.run(
+            lambda worker_session: enroll(student_key, course_key, worker_session), timeout=timeout)
+
+    async def close(self):
+        """Waits for running calls to finish and stops the thread pool."""
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+# Query cache. Results are kept as plain values (display tuples, Rows, names) under a
+# key naming the query and its parameters, together with the tables they were read
+# from. Sessions note which tables each flush and DML statement writes; when the
+# transaction commits or rolls back, only the entries that read one of those tables
+# are dropped.
+
+QUERY_CACHE_SIZE = 512
+
+class QueryCache:
+    """
+    A thread-safe LRU cache of query results with per-table invalidation.
+
+    At most ``max_entries`` results are kept; the least recently used goes first.
+    ``max_entries=0`` turns caching off while still counting misses.
+    """
+    def __init__(self, max_entries=QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, tables, load):
+        """
+        Returns the result cached under ``key``, calling ``load()`` on a miss.
+
+        :param tables: The names of the tables the result is read from.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self.generation
+        value = load()
+        with self.lock:
+            # A commit landing while load() ran may have made the value stale.
+            if self.max_entries and generation == self.generation:
+                self.entries[key] = (frozenset(tables), value)
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, tables):
+        """Drops every result read from one of ``tables``."""
+        if not tables:
+            return
+        with self.lock:
+            self.generation += 1
+            stale = [key for key, (entry_tables, _) in self.entries.items() if not entry_tables.isdisjoint(tables)]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'invalidations': self.invalidations, 'size': len(self.entries)}
+
+query_cache = QueryCache()
+
+def mapper_tables(mapper):
+    """The tables a mapped class is stored in, plus its association tables."""
+    names = {mapped_table.name for mapped_table in mapper.tables}
+    names.update(relation.secondary.name for relation in mapper.relationships if relation.secondary is not None)
+    return names
+
+def query_tables(query):
+    """
+    Names the tables a query's results may depend on: those it selects from, and
+    those one relationship away from its entities, which eager loads and row
+    builders read.
+    """
+    names = {found.name for found in find_tables(query.statement, include_aliases=True) if hasattr(found, 'name')}
+    for description in query.column_descriptions:
+        if description['entity'] is None:
+            continue
+        mapper = inspect(description['entity']).mapper
+        names |= mapper_tables(mapper)
+        for relation in mapper.relationships:
+            names |= mapper_tables(relation.mapper)
+    return frozenset(names)
+
+def query_key(query, *extra):
+    """A cache key for ``query``: its SQL and parameters, plus ``extra``."""
+    compiled = query.statement.compile()
+    return (str(compiled), tuple(sorted(compiled.params.items())), *extra)
+
+def cached_query(key, tables, load):
+    return query_cache.get(key, tables, load)
+
+def find_entity(model, column_name, value, query_session=None):
+    """
+    Finds the row of ``model`` whose ``column_name`` equals ``value``, through the
+    entity cache.
+
+    ``column_name`` must be unique, such as ``student_id`` or ``course_id``: the cache
+    keeps one row per value, which for a column like ``name`` could be the wrong one.
+
+    :return: A Row of the table's columns, readable by attribute like the mapped
+        object but detached from any session, or None if there is no such row.
+    :raises ValueError: If ``column_name`` is not a unique column.
+    """
+    mapped_table = model.__table__
+    key_column = mapped_table.c[column_name]
+    if not (key_column.primary_key or key_column.unique):
+        raise ValueError(f"{mapped_table.name}.{column_name} is not unique")
+    def load():
+        return (query_session or session).execute(
+            select(*mapped_table.columns).where(key_column == value)).first()
+    return query_cache.get(('entity', mapped_table.name, column_name, value), (mapped_table.name,), load)
+
+def written_tables(write_session):
+    return write_session.info.setdefault('written_tables', set())
+
+@event.listens_for(Session, 'after_flush')
+def record_flushed_tables(flush_session, flush_context):
+    tables = written_tables(flush_session)
+    for instance in chain(flush_session.new, flush_session.dirty, flush_session.deleted):
+        tables |= mapper_tables(object_mapper(instance))
+
+@event.listens_for(Session, 'do_orm_execute')
+def record_statement_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        written_tables(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def invalidate_written_tables(write_session):
+    # Rolled-back writes are dropped too: a read inside the transaction may have
+    # cached them.
+    query_cache.invalidate(write_session.info.pop('written_tables', ()))
+
+# Exports. Both read through ``bind`` when given, so the legacy Tkinter app in this
+# directory can export its own database. Foreign keys are written as the public ID of
+# the row they point to (the instructor_id, student_id or course_id typed into the
+# forms), which is what import_from_csv() reads back; primary keys mean nothing in
+# another database.
+EXPORT_CHUNK_SIZE = 10000
+CSV_OPENERS = {None: open, 'gzip': gzip.open, 'xz': lzma.open}
+CSV_COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.xz': 'xz'}
+
+# table name: {foreign key column: model whose column of the same name is the public ID}
+PUBLIC_ID_REFERENCES = {
+    'courses': {'instructor_id': InstructorTable},
+    'student_course': {'student_id': StudentTable, 'course_id': CourseTable},
+}
+
+def export_statement(table_name):
+    """The SELECT for an export, with foreign keys swapped for public IDs."""
+    references = PUBLIC_ID_REFERENCES.get(table_name)
+    if not references:
+        return f'SELECT * FROM "{table_name}"'
+    selected = []
+    joins = []
+    for name in Base.metadata.tables[table_name].columns.keys():
+        if name not in references:
+            selected.append(f'exported."{name}"')
+            continue
+        alias = f'referenced_{name}'
+        selected.append(f'{alias}."{name}" AS "{name}"')
+        joins.append(f'LEFT JOIN "{references[name].__tablename__}" {alias} ON {alias}.id = exported."{name}"')
+    return f'SELECT {", ".join(selected)} FROM "{table_name}" exported {" ".join(joins)}'
+
+def read_chunks(connection, table_name, chunk_size):
+    # stream_results keeps the cursor open and pulls rows as they are consumed,
+    # so only one chunk is ever held in memory.
+    result = connection.execution_options(stream_results=True).\
+        exec_driver_sql(export_statement(table_name))
+    return list(result.keys()), result.partitions(chunk_size)
+
+def export_to_csv(table_name, file_name, compression='infer', chunk_size=EXPORT_CHUNK_SIZE, bind=None):
+    if compression == 'infer':
+        compression = CSV_COMPRESSION_SUFFIXES.get(os.path.splitext(file_name)[1])
+    rows = 0
+    with (bind or engine).connect() as connection, CSV_OPENERS[compression](file_name, 'wt', newline='') as file:
+        columns, chunks = read_chunks(connection, table_name, chunk_size)
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            rows += len(chunk)
+    print(f"Data from table '{table_name}' has been exported to '{file_name}'")
+    return rows
+
+def export_to_parquet(table_name, file_name, chunk_size=EXPORT_CHUNK_SIZE, bind=None):
+    # pyarrow is only needed for Parquet output.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {'INTEGER': pa.int64(), 'REAL': pa.float64(), 'FLOAT': pa.float64()}
+    rows = 0
+    with (bind or engine).connect() as connection:
+        declared = {info[1]: info[2].upper() for info in connection.exec_driver_sql(f'PRAGMA table_info("{table_name}")')}
+        declared.update((name, 'TEXT') for name in PUBLIC_ID_REFERENCES.get(table_name, ()))
+        columns, chunks = read_chunks(connection, table_name, chunk_size)
+        schema = pa.schema([(name, arrow_types.get(declared.get(name), pa.string())) for name in columns])
+        with pq.ParquetWriter(file_name, schema) as writer:
+            # Each chunk becomes one row group.
+            for chunk in chunks:
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(chunk)
+    print(f"Data from table '{table_name}' has been exported to '{file_name}'")
+    return rows
+
+# Batch validation. validate_batch() checks a DataFrame column by column against the
+# fields of a schema, with pandas string operations and the patterns marshmallow
+# compiles, and reports the messages marshmallow's many=True load would give. Cells
+# are kept as Python objects so every pattern runs on the re engine marshmallow uses.
+# Only the failing cells are passed to the marshmallow validators, to format their
+# messages.
+
+# The text int() accepts, which is what fields.Integer deserializes.
+INTEGER_PATTERN = re.compile(r'\s*[+-]?\d+(?:_\d+)*\s*')
+
+def parse_integer(text):
+    """
+    Returns ``int(text)``, or None past ``sys.get_int_max_str_digits()``, where
+    marshmallow reports the cell as not a valid integer.
+    """
+    try:
+        return int(text)
+    except (ValueError, OverflowError):
+        return None
+
+def deserialize_column(field, column, present):
+    """
+    Deserializes the present cells of a column as ``field`` does.
+
+    :return: The values as an object Series, and a boolean array of the present
+        cells that deserialized.
+    """
+    import numpy as np
+    import pandas as pd
+    if isinstance(field, fields.Integer):
+        if pd.api.types.is_integer_dtype(column.dtype):
+            return column.astype(object), present.copy()
+        text = column.where(present, '')
+        is_text = np.fromiter((type(value) is str for value in text), bool, len(text))
+        ok = present & is_text & text.where(is_text, '').str.fullmatch(INTEGER_PATTERN).to_numpy(bool)
+        values = [parse_integer(value) if good else None for value, good in zip(column, ok)]
+        ok &= np.fromiter((value is not None for value in values), bool, len(values))
+        return pd.Series(values, index=column.index, dtype=object), ok
+    if isinstance(field, fields.String):
+        if pd.api.types.infer_dtype(column, skipna=True) in ('string', 'empty'):
+            return column, present.copy()
+        return column, present & np.fromiter((type(value) is str for value in column), bool, len(column))
+    raise TypeError(f"validate_batch does not support {type(field).__name__} fields")
+
+def failing_cells(validator, values, ok):
+    """
+    Flags the cells among ``ok`` that ``validator`` may reject, checking the whole
+    column at once for the validators marshmallow's schemas here use. The flagged
+    cells are then confirmed one by one by the validator itself.
+    """
+    import numpy as np
+    if isinstance(validator, validate.Length):
+        lengths = values.where(ok, '').str.len().to_numpy()
+        bad = np.zeros(len(values), bool)
+        if validator.min is not None:
+            bad |= lengths < validator.min
+        if validator.max is not None:
+            bad |= lengths > validator.max
+        if validator.equal is not None:
+            bad |= lengths != validator.equal
+        return ok & bad
+    if isinstance(validator, validate.Range):
+        numbers = values.where(ok, validator.min if validator.min is not None else validator.max)
+        bad = np.zeros(len(values), bool)
+        if validator.min is not None:
+            bad |= (numbers < validator.min if validator.min_inclusive else numbers <= validator.min).to_numpy(bool)
+        if validator.max is not None:
+            bad |= (numbers > validator.max if validator.max_inclusive else numbers >= validator.max).to_numpy(bool)
+        return ok & bad
+    if isinstance(validator, validate.Email):
+        text = values.where(ok, '')
+        has_at = text.str.contains('@', regex=False).to_numpy(bool)
+        parts = text.where(has_at, '@').str.rsplit('@', n=1, expand=True)
+        user_ok = parts[0].str.match(validator.USER_REGEX).to_numpy(bool)
+        domain_ok = (parts[1].isin(validator.DOMAIN_WHITELIST) | parts[1].str.match(validator.DOMAIN_REGEX)).to_numpy(bool)
+        return ok & ~(has_at & user_ok & domain_ok)
+    return ok
+
+def validate_batch(schema_class, frame):
+    """
+    Validates every row of a DataFrame against a schema, a column at a time.
+
+    Cells are text, or NaN/None when missing; integer columns are accepted for
+    Integer fields. Columns the schema does not know are ignored.
+
+    :return: The deserialized values (a DataFrame with an object column per field,
+        None where missing), a boolean array marking the invalid rows, and the error
+        messages by row position, as ``schema_class(many=True).load`` reports them.
+    :rtype: tuple
+    """
+    import numpy as np
+    import pandas as pd
+    count = len(frame)
+    values = {}
+    errors = {}
+    for name, field in schema_class._declared_fields.items():
+        key = field.data_key or name
+        if key in frame:
+            column = frame[key].reset_index(drop=True)
+            if not (isinstance(field, fields.Integer) and pd.api.types.is_integer_dtype(column.dtype)):
+                column = column.astype(object)
+        else:
+            column = pd.Series(None, index=range(count), dtype=object)
+        present = column.notna().to_numpy(bool)
+        column = column.where(present, None)
+        converted, ok = deserialize_column(field, column, present)
+        failures = []
+        if field.required:
+            failures.append((~present, field.error_messages['required']))
+        failures.append((present & ~ok, field.error_messages['invalid']))
+        for validator in field.validators:
+            failures.append((failing_cells(validator, converted, ok), validator))
+        for mask, check in failures:
+            for position in np.flatnonzero(mask).tolist():
+                if isinstance(check, str):
+                    messages = [check]
+                else:
+                    try:
+                        check(converted[position])
+                        continue
+                    except ValidationError as err:
+                        messages = err.messages if isinstance(err.messages, list) else [err.messages]
+                errors.setdefault(position, {}).setdefault(key, []).extend(messages)
+        values[name] = converted.where(ok, None)
+    invalid = np.zeros(count, bool)
+    invalid[list(errors)] = True
+    return pd.DataFrame(values), invalid, errors
+
+# Imports. A CSV file is read IMPORT_CHUNK_SIZE rows at a time; each chunk is checked
+# with validate_batch() against its table's schema and inserted with one executemany,
+# all inside a single transaction. Foreign keys hold public IDs, as the exports write
+# them (see PUBLIC_ID_REFERENCES), and are resolved to primary keys through dicts
+# built once per import; the same goes for the values that must be unique. Rows that
+# fail are written to the reject file with their errors.
+IMPORT_CHUNK_SIZE = 10000
+
+# table name: (schema class, {foreign key column: referenced model}, unique column groups)
+IMPORT_TABLES = {
+    'students': (StudentSchema, {}, (('student_id',), ('email',))),
+    'instructors': (InstructorSchema, {}, (('instructor_id',), ('email',))),
+    'courses': (CourseSchema, PUBLIC_ID_REFERENCES['courses'], (('course_id',),)),
+    'student_course': (EnrollmentSchema, PUBLIC_ID_REFERENCES['student_course'], (('student_id', 'course_id'),)),
+}
+
+def read_lookup(connection, model, column_name):
+    """Maps each public ID in ``model.column_name``, as text, to its primary key."""
+    key_column = model.__table__.c[column_name]
+    return {str(key): row_id for key, row_id in connection.execute(select(key_column, model.id))}
+
+def read_unique_values(connection, table_name, columns):
+    """The existing values, or tuples of values, of a unique column group."""
+    rows = connection.execute(select(*(Base.metadata.tables[table_name].c[name] for name in columns)))
+    if len(columns) == 1:
+        return {value for value, in rows}
+    return {tuple(row) for row in rows}
+
+@contextmanager
+def deferred_search_index(connection, table_name):
+    """
+    Indexes the rows inserted into ``table_name`` within the block in one statement
+    at its end, instead of through the per-row insert trigger.
+
+    The caller must have opened the transaction with an explicit BEGIN; sqlite3 would
+    otherwise commit the DROP TRIGGER at once. The trigger is recreated before the
+    block exits, even when it raises, and a rollback restores it as well, so no other
+    connection sees it missing.
+    """
+    if table_name not in SEARCH_INDEXES:
+        yield
+        return
+    index_name, columns = SEARCH_INDEXES[table_name]
+    names = ", ".join(columns)
+    trigger = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"), {"name": f"{index_name}_ai"}
+    ).scalar()
+    last_id = connection.exec_driver_sql(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}").scalar()
+    if not trigger:
+        yield
+        return
+    connection.exec_driver_sql(f"DROP TRIGGER {index_name}_ai")
+    try:
+        yield
+        connection.exec_driver_sql(
+            f"INSERT INTO {index_name}(rowid, {names}) SELECT id, {names} FROM {table_name} WHERE id > ?", (last_id,))
+    finally:
+        connection.exec_driver_sql(trigger)
+
+def resolve_rows(results, errors, lookups, taken, field_names):
+    """
+    Resolves the foreign keys of the rows that passed validation and checks their
+    unique values against ``taken``, which is updated as rows are accepted. Failures
+    are added to ``errors``.
+
+    :return: The rows to insert, as tuples in ``field_names`` order.
+    """
+    rows = []
+    for index, row in enumerate(results):
+        if index in errors:
+            continue
+        for name, (table_name, lookup) in lookups.items():
+            if row.get(name) is not None:
+                row[name] = lookup.get(str(row[name]))
+                if row[name] is None:
+                    errors.setdefault(index, {})[name] = [f'No {table_name} row has this ID.']
+        if index in errors:
+            continue
+        keys = [(columns, row[columns[0]] if len(columns) == 1 else tuple(row[name] for name in columns))
+                for columns in taken]
+        duplicate = next((columns for columns, key in keys if key in taken[columns]), None)
+        if duplicate is not None:
+            errors[index] = {duplicate[-1]: ['Already exists.']}
+            continue
+        for columns, key in keys:
+            taken[columns].add(key)
+        rows.append(tuple(row.get(name) for name in field_names))
+    return rows
+
+def import_from_csv(table_name, file_name, reject_file=None, compression='infer', chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Loads the rows of a CSV file into a table, skipping the invalid ones.
+
+    Columns the table's schema does not know, such as an exported ``id``, are
+    ignored, and empty cells count as missing. The whole import is one transaction.
+
+    :param reject_file: Where rejected rows go, as CSV with an ``errors`` column; they
+        are only counted if this is None.
+    :return: The numbers of imported and rejected rows.
+    :rtype: tuple
+    """
+    # pandas is only needed for imports.
+    import pandas as pd
+
+    if compression == 'infer':
+        compression = CSV_COMPRESSION_SUFFIXES.get(os.path.splitext(file_name)[1])
+    schema_class, references, unique_groups = IMPORT_TABLES[table_name]
+    field_names = list(schema_class._declared_fields)
+    # Plain DBAPI parameter tuples skip SQLAlchemy's per-row parameter processing.
+    statement = 'INSERT INTO %s (%s) VALUES (%s)' % (
+        table_name, ', '.join(field_names), ', '.join('?' * len(field_names)))
+    imported = rejected = 0
+    rejects = reject_writer = None
+    try:
+        with engine.begin() as connection, CSV_OPENERS[compression](file_name, 'rt', newline='') as file:
+            # sqlite3 runs DDL outside any transaction, so the trigger swap in
+            # deferred_search_index() needs this one opened explicitly.
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            lookups = {name: (model.__tablename__, read_lookup(connection, model, name))
+                       for name, model in references.items()}
+            taken = {columns: read_unique_values(connection, table_name, columns) for columns in unique_groups}
+            # Object columns keep every cell a str, for the re-based checks.
+            chunks = pd.read_csv(file, dtype=object, keep_default_na=False, na_values=[''], chunksize=chunk_size)
+            with deferred_search_index(connection, table_name):
+                for chunk in chunks:
+                    values, invalid, errors = validate_batch(schema_class, chunk)
+                    rows = resolve_rows(values.to_dict('records'), errors, lookups, taken, field_names)
+                    if rows:
+                        connection.exec_driver_sql(statement, rows)
+                    imported += len(rows)
+                    rejected += len(errors)
+                    if not errors or reject_file is None:
+                        continue
+                    if reject_writer is None:
+                        reject_compression = CSV_COMPRESSION_SUFFIXES.get(os.path.splitext(reject_file)[1])
+                        rejects = CSV_OPENERS[reject_compression](reject_file, 'wt', newline='')
+                        reject_writer = csv.writer(rejects)
+                        reject_writer.writerow([*chunk.columns, 'errors'])
+                    for index in sorted(errors):
+                        cells = chunk.iloc[index]
+                        reject_writer.writerow([*cells.where(cells.notna(), ''), json.dumps(errors[index])])
+    finally:
+        if rejects is not None:
+            rejects.close()
+    # The rows went in through the engine, not a session, so no commit event saw them.
+    query_cache.invalidate({table_name})
+    print(f"Imported {imported} rows into table '{table_name}' from '{file_name}', rejected {rejected}")
+    return imported, rejected
@@ -1,7 +1,13 @@
 import json
 import re
+import sys
+
+# Shared with pygt.py and tkinter.py.
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
 
 class person(object):
+    # self.__email is stored in the mangled slot name
+    __slots__ = ('name', 'age', '_person__email')
     def __init__(self,name, age ,email):
         self.name=name
         self.age=age
@@ -19,23 +25,27 @@ class person(object):
             return cls(**data)
     ## the below function was found online to verify the integrity of the email
     def validate_email(self, email):
-        email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        if not re.match(email_regex, email):
+        if not EMAIL_PATTERN.match(email):
             raise ValueError(f"Invalid email format: {email}")
         return email
     def validate_age(self, age):
         if not isinstance(age, int) or age < 0:
             raise ValueError(f"Invalid age: {age}. Age must be a non-negative integer.")
         return age
+
+def compact_ids(ids):
+    # the same IDs repeat across many records, so keep one interned copy of each
+    return tuple(sys.intern(i) if isinstance(i, str) else i for i in ids)
     
 
 class student(person):
-    def __init__(self,name, age ,email,student_id,registered_courses=[]):
+    __slots__ = ('student_id', 'registered_courses')
+    def __init__(self,name, age ,email,student_id,registered_courses=()):
         super().__init__(name,age,email)
         self.student_id=student_id
-        self.registered_courses=registered_courses
+        self.registered_courses=compact_ids(registered_courses)
     def register_course(self,course):
-        self.registered_courses.append(course.course_id)
+        self.registered_courses+=compact_ids((course.course_id,))
     
     def serialize(self):
         return json.dumps({
@@ -47,12 +57,13 @@ class student(person):
         })
 
 class instructor(person):
-    def __init__(self,name, age ,email,instructor_id,assigned_courses=[]):
+    __slots__ = ('instructor_id', 'assigned_courses')
+    def __init__(self,name, age ,email,instructor_id,assigned_courses=()):
         super().__init__(name,age,email)
         self.instructor_id=instructor_id
-        self.assigned_courses=assigned_courses     
+        self.assigned_courses=compact_ids(assigned_courses)
     def assign_cource(self,course):
-        self.assigned_courses.append(course.course_id)
+        self.assigned_courses+=compact_ids((course.course_id,))
     def serialize(self):
         return json.dumps({
             "name":self.name,
@@ -63,13 +74,14 @@ class instructor(person):
         })
 
 class course():
-    def __init__(self,course_id,course_name,instructor,enrolled_students=[]):
+    __slots__ = ('course_id', 'course_name', 'instructor', 'enrolled_students')
+    def __init__(self,course_id,course_name,instructor,enrolled_students=()):
         self.course_id=course_id
         self.course_name=course_name
         self.instructor=instructor
-        self.enrolled_students=enrolled_students
+        self.enrolled_students=compact_ids(enrolled_students)
     def add_student(self,student):
-        self.enrolled_students.append(student.student_id)
+        self.enrolled_students+=compact_ids((student.student_id,))
     
     def serialize(self):
         return json.dumps({
@@ -1,78 +1,31 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import sqlite3
 import json
-import re
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Table
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from marshmallow import Schema, fields, validate, ValidationError
-import pandas as pd
-
-Base = declarative_base()
-engine = create_engine('sqlite:///student_managementpyqt.db')
-Session = sessionmaker(bind=engine)
-session = Session()
-
-
-student_course = Table('student_course', Base.metadata,
-    Column('student_id', Integer, ForeignKey('students.id')),
-    Column('course_id', Integer, ForeignKey('courses.id'))
-)
-class StudentTable(Base):
-    __tablename__ = 'students'
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False)
-    age = Column(Integer, nullable=False)
-    email = Column(String, nullable=False, unique=True)
-    student_id = Column(String, nullable=False, unique=True)
-    courses = relationship('CourseTable', secondary=student_course, back_populates='students')
-
-class InstructorTable(Base):
-    __tablename__ = 'instructors'
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False)
-    age = Column(Integer, nullable=False)
-    email = Column(String, nullable=False, unique=True)
-    instructor_id = Column(String, nullable=False, unique=True)
-    courses = relationship('CourseTable', back_populates='instructor')
-
-class CourseTable(Base):
-    __tablename__ = 'courses'
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    course_name = Column(String, nullable=False)
-    course_id = Column(String, nullable=False, unique=True)
-    instructor_id = Column(Integer, ForeignKey('instructors.id'))
-    instructor = relationship('InstructorTable', back_populates='courses')
-    students = relationship('StudentTable', secondary=student_course, back_populates='courses')
-
-Base.metadata.create_all(engine)
-
-class StudentSchema(Schema):
-    name = fields.String(required=True, validate=validate.Length(min=1))
-    age = fields.Integer(required=True, validate=lambda n: n > 0)
-    email = fields.Email(required=True)
-    student_id = fields.String(required=True, validate=validate.Length(min=1))
-
-class InstructorSchema(Schema):
-    name = fields.String(required=True, validate=validate.Length(min=1))
-    age = fields.Integer(required=True, validate=lambda n: n > 0)
-    email = fields.Email(required=True)
-    instructor_id = fields.String(required=True, validate=validate.Length(min=1))
-
-class CourseSchema(Schema):
-    course_name = fields.String(required=True, validate=validate.Length(min=1))
-    course_id = fields.String(required=True, validate=validate.Length(min=1))
-    instructor_id = fields.Integer()
-
-instructor_schema = InstructorSchema()
-course_schema = CourseSchema()
-student_schema = StudentSchema()
+import sys
+
+from modules import EMAIL_PATTERN, compact_ids
+
+# SQLAlchemy and marshmallow are slow to import, so the data layer in database.py is
+# only imported by init_app(), after the window is on screen.
+database = None
+
+def init_app(url=None, profile=None):
+    """
+    Imports the data layer and opens the database. Safe to call more than once.
+
+    :param profile: The SQLite connection profile, a key of ``database.SQLITE_PROFILES``.
+    :return: The ``database`` module.
+    """
+    global database
+    if database is None:
+        import database as data_layer
+        data_layer.init_database(url or data_layer.DATABASE_URL, profile or data_layer.DEFAULT_PROFILE)
+        database = data_layer
+    return database
 
 available_courses = []
 students_list = []
 instructors_list = []
 class person(object):
+    __slots__ = ('name', 'age', '_person__email')
     def __init__(self,name, age ,email):
         self.name=name
         self.age=age
@@ -90,23 +43,24 @@ class person(object):
             return cls(**data)
     ## the below function was found online to verify the integrity of the email
     def validate_email(self, email):
-        email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        if not re.match(email_regex, email):
+        if not EMAIL_PATTERN.match(email):
             raise ValueError(f"Invalid email format: {email}")
         return email
     def validate_age(self, age):
         if not isinstance(age, int) or age < 0:
             raise ValueError(f"Invalid age: {age}. Age must be a non-negative integer.")
         return age
+
     
 
 class student(person):
-    def __init__(self,name, age ,email,student_id,registered_courses=[]):
+    __slots__ = ('student_id', 'registered_courses')
+    def __init__(self,name, age ,email,student_id,registered_courses=()):
         super().__init__(name,age,email)
         self.student_id=student_id
-        self.registered_courses=registered_courses
+        self.registered_courses=compact_ids(registered_courses)
     def register_course(self,course):
-        self.registered_courses.append(course.course_id)
+        self.registered_courses+=compact_ids((course.course_id,))
     
     def serialize(self):
         return json.dumps({
@@ -119,12 +73,13 @@ class student(person):
 
 
 class instructor(person):
-    def __init__(self,name, age ,email,instructor_id,assigned_courses=[]):
+    __slots__ = ('instructor_id', 'assigned_courses')
+    def __init__(self,name, age ,email,instructor_id,assigned_courses=()):
         super().__init__(name,age,email)
         self.instructor_id=instructor_id
-        self.assigned_courses=assigned_courses     
+        self.assigned_courses=compact_ids(assigned_courses)
     def assign_cource(self,course):
-        self.assigned_courses.append(course.course_id)
+        self.assigned_courses+=compact_ids((course.course_id,))
     def serialize(self):
         return json.dumps({
             "name":self.name,
@@ -135,13 +90,14 @@ class instructor(person):
         })
 
 class course():
-    def __init__(self,course_id,course_name,instructor,enrolled_students=[]):
+    __slots__ = ('course_id', 'course_name', 'instructor', 'enrolled_students')
+    def __init__(self,course_id,course_name,instructor,enrolled_students=()):
         self.course_id=course_id
         self.course_name=course_name
         self.instructor=instructor
-        self.enrolled_students=enrolled_students
+        self.enrolled_students=compact_ids(enrolled_students)
     def add_student(self,student):
-        self.enrolled_students.append(student.student_id)
+        self.enrolled_students+=compact_ids((student.student_id,))
     
     def serialize(self):
         return json.dumps({
@@ -159,16 +115,317 @@ class course():
             return cls(**data)
 
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QComboBox, QTreeWidget, 
-                             QTreeWidgetItem, QTabWidget, QFormLayout, QMessageBox, QScrollArea)
-from PyQt5.QtCore import Qt
-import sys
-import pandas as pd
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+                             QPushButton, QLabel, QLineEdit, QComboBox, QTreeView, 
+                             QTabWidget, QFormLayout, QMessageBox, QScrollArea)
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool,
+                          QTimer, pyqtSignal, pyqtSlot)
+from bisect import bisect_left
+from functools import lru_cache
+from operator import attrgetter
 
 # Assume we have imported all necessary classes and schemas
 
+PAGE_SIZE = 200
+
+
+class QueryTaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class QueryTask(QRunnable):
+    """
+    Runs ``fn(worker_session)`` on a QThreadPool thread with a session of its own.
+
+    The result, or the error message, is delivered through ``signals`` on the GUI
+    thread. ``fn`` should return plain values: ORM objects belong to the worker
+    session, which is closed as soon as ``fn`` returns.
+    """
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = QueryTaskSignals()
+
+    def run(self):
+        worker_session = database.Session()
+        try:
+            result = self.fn(worker_session)
+        except Exception as err:
+            self.signals.failed.emit(str(err))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            worker_session.close()
+
+
+def run_in_background(fn, on_finished, on_failed=None):
+    task = QueryTask(fn)
+    task.signals.finished.connect(on_finished)
+    if on_failed is not None:
+        task.signals.failed.connect(on_failed)
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+class PagedQueryModel(QAbstractTableModel):
+    """
+    A table model that pages rows in from a SQLAlchemy query as the view scrolls.
+
+    Only the first page is queried when the query is set; the view asks for more
+    through ``canFetchMore``/``fetchMore`` when the user scrolls near the end. Each
+    page is turned into plain tuples of display strings, so no ORM objects are kept
+    alive by the model.
+
+    When the query has a sort key, the model also keeps the sorted keys of its rows,
+    so a single written record can be inserted, updated or removed in place with
+    ``upsert``/``remove`` instead of re-running the query.
+
+    Attributes
+    ----------
+    headers : list
+        The column titles.
+    row_builder : callable
+        Turns one query result into a tuple of display strings.
+    page_size : int
+        The number of rows fetched per page.
+
+    Methods
+    -------
+    set_query(query, key=None, sort_key=None):
+        Replaces the rows with the first page of a new query.
+    load(build_query, key=None, sort_key=None):
+        Like set_query, but the first page is fetched on a worker thread.
+    upsert(result):
+        Inserts or updates the row for one record.
+    remove(key):
+        Removes the row for one record.
+    """
+    loadingChanged = pyqtSignal(bool)
+    loadFailed = pyqtSignal(str)
+
+    def __init__(self, headers, row_builder, page_size=PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.row_builder = row_builder
+        self.page_size = page_size
+        self.query = None
+        self.key = None
+        self.last_key = None
+        self.exhausted = True
+        self.sort_key = None
+        self.keys = []
+        self.rows = []
+        self.loading = False
+        self.generation = 0
+        self.task = None
+
+    def set_query(self, query, key=None, sort_key=None):
+        """
+        Replaces the rows with the first page of ``query``.
+
+        With a ``key`` column the query is paged by keyset (``key > last seen``),
+        which stays fast deep into the table; without one it falls back to
+        LIMIT/OFFSET. ``sort_key`` gives the value a result is ordered by (the
+        ``key`` column by default); without either, ``upsert`` is unavailable.
+        """
+        self.reset_query(query, key, sort_key)
+        self.fetchMore(QModelIndex())
+
+    def load(self, build_query, key=None, sort_key=None):
+        """
+        Replaces the rows with the first page of ``build_query(session)``, fetched on
+        a worker thread with its own session.
+
+        The model stays empty, and ``loadingChanged(True)`` tells the view to show
+        its loading indicator, until the page arrives. A load started later
+        supersedes one still running.
+        """
+        self.reset_query(build_query(database.session), key, sort_key)
+        self.loading = True
+        generation = self.generation
+        self.loadingChanged.emit(True)
+        self.task = run_in_background(
+            lambda worker_session: (generation, self.build_page(build_query(worker_session))),
+            self.finish_load, lambda message: self.fail_load(generation, message))
+
+    @pyqtSlot(object)
+    def finish_load(self, result):
+        generation, page = result
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.task = None
+        self.add_page(*page)
+        self.loadingChanged.emit(False)
+
+    def fail_load(self, generation, message):
+        if generation != self.generation:
+            return
+        self.loading = False
+        self.exhausted = True
+        self.task = None
+        self.loadingChanged.emit(False)
+        self.loadFailed.emit(message)
+
+    def reset_query(self, query, key, sort_key):
+        if sort_key is None and key is not None:
+            sort_key = column_getter(key.key)
+        self.beginResetModel()
+        self.generation += 1
+        self.query = query
+        self.key = key
+        self.last_key = None
+        self.exhausted = query is None
+        self.loading = False
+        self.sort_key = sort_key
+        self.keys = []
+        self.rows = []
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and not self.exhausted and not self.loading
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self.exhausted or self.loading:
+            return
+        self.add_page(*self.build_page(self.query))
+
+    def build_page(self, query):
+        """
+        Runs ``query`` for the page after the fetched rows, or takes the page from
+        the query cache.
+
+        :return: The display rows, their sort keys and the new keyset position.
+        :rtype: tuple
+        """
+        last_key = self.last_key
+        if self.key is None:
+            query = query.offset(len(self.rows)).limit(self.page_size)
+        else:
+            if last_key is not None:
+                query = query.filter(self.key > last_key)
+            query = query.order_by(self.key).limit(self.page_size)
+        return database.cached_query(
+            database.query_key(query, self.row_builder, self.sort_key),
+            database.query_tables(query),
+            lambda: self.run_page(query, last_key))
+
+    def run_page(self, query, last_key):
+        results = query.all()
+        if self.key is not None and results:
+            last_key = getattr(results[-1], self.key.key)
+        keys = [self.sort_key(result) for result in results] if self.sort_key is not None else []
+        return [self.row_builder(result) for result in results], keys, last_key
+
+    def add_page(self, rows, keys, last_key):
+        self.last_key = last_key
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.keys.extend(keys)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def upsert(self, result):
+        """
+        Inserts or updates the row for ``result`` without re-running the query.
+
+        A record that sorts after the last fetched row while more pages remain is
+        left for ``fetchMore`` to page in.
+
+        :return: False if the current query has no sort key, or is still loading,
+            and must be reloaded.
+        :rtype: bool
+        """
+        if self.sort_key is None or self.loading:
+            return False
+        key = self.sort_key(result)
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            self.rows[position] = self.row_builder(result)
+            self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.headers) - 1))
+        elif position < len(self.keys) or self.exhausted:
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.keys.insert(position, key)
+            self.rows.insert(position, self.row_builder(result))
+            self.endInsertRows()
+        return True
+
+    def remove(self, key):
+        """
+        Removes the row whose sort key is ``key``, if it has been fetched.
+
+        :return: False if the current query has no sort key, or is still loading,
+            and must be reloaded.
+        :rtype: bool
+        """
+        if self.sort_key is None or self.loading:
+            return False
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self.keys[position]
+            del self.rows[position]
+            self.endRemoveRows()
+        return True
+
+
+@lru_cache(maxsize=None)
+def column_getter(name):
+    # One getter per column, so pages sorted by the same column share cache keys.
+    return attrgetter(name)
+
+def student_row(student):
+    return (student.name, str(student.age), student.email, student.student_id)
+
+def instructor_row(instructor):
+    return (instructor.name, str(instructor.age), instructor.email, instructor.instructor_id)
+
+def course_row(course):
+    instructor_id = course.instructor.instructor_id if course.instructor else "N/A"
+    return (course.course_name, course.course_id, instructor_id)
+
+def enrollment_row(enrollment):
+    student, course = enrollment
+    return (student.name, student.student_id, course.course_name, course.course_id)
+
+def enrollment_key(enrollment):
+    student, course = enrollment
+    return (student.id, course.id)
+
+
+def make_table_view(model):
+    view = QTreeView()
+    view.setRootIsDecorated(False)
+    view.setUniformRowHeights(True)
+    view.setModel(model)
+    return view
+
+def make_loading_label(model, text):
+    label = QLabel(text)
+    label.setVisible(model.loading)
+    model.loadingChanged.connect(label.setVisible)
+    return label
+
+
 class StudentManagementSystem(QMainWindow):
     """
     A PyQt5-based Student Management System GUI.
@@ -213,32 +470,32 @@ class StudentManagementSystem(QMainWindow):
         self.setup_registration_tab()
         self.setup_enrollment_tab()
 
-        self.load_data()
+        # Load once the window is on screen; the first load imports the data layer.
+        QTimer.singleShot(0, self.load_data)
     
     def load_data(self):
+        init_app()
+        # Filled in the background by update_enrollment_cache(); until then registrations
+        # are checked against the database.
+        self.enrollments = database.EnrollmentCache()
+
+        # Every load below runs on the thread pool with its own session, so they
+        # proceed concurrently and the window can be shown straight away.
+
         # Load students
-        students = session.query(StudentTable).all()
-        self.student_tree.clear()
-        for student in students:
-            QTreeWidgetItem(self.student_tree, [student.name, str(student.age), student.email, student.student_id])
+        self.update_student_tree()
         self.update_student_combobox()
 
         # Load instructors
-        instructors = session.query(InstructorTable).all()
-        self.instructor_tree.clear()
-        for instructor in instructors:
-            QTreeWidgetItem(self.instructor_tree, [instructor.name, str(instructor.age), instructor.email, instructor.instructor_id])
+        self.update_instructor_tree()
 
         # Load courses
-        courses = session.query(CourseTable).all()
-        self.course_tree.clear()
-        for course in courses:
-            instructor_id = course.instructor.instructor_id if course.instructor else "N/A"
-            QTreeWidgetItem(self.course_tree, [course.course_name, course.course_id, instructor_id])
+        self.update_course_tree()
         self.update_course_combobox()
 
         # Load enrollments
         self.update_enrollment_tree()
+        self.update_enrollment_cache()
 
     def setup_students_tab(self):
         students_tab = QWidget()
@@ -261,13 +518,15 @@ class StudentManagementSystem(QMainWindow):
         search_button = QPushButton("Search Student")
         search_button.clicked.connect(self.search_student)
 
-        self.student_tree = QTreeWidget()
-        self.student_tree.setHeaderLabels(["Name", "Age", "Email", "ID"])
+        self.student_model = PagedQueryModel(["Name", "Age", "Email", "ID"], student_row)
+        self.student_tree = make_table_view(self.student_model)
+        self.student_model.loadFailed.connect(self.show_load_error)
 
         layout.addLayout(form_layout)
         layout.addWidget(submit_button)
         layout.addWidget(self.student_search_input)
         layout.addWidget(search_button)
+        layout.addWidget(make_loading_label(self.student_model, "Loading students..."))
         layout.addWidget(self.student_tree)
 
         self.tab_widget.addTab(students_tab, "Students")
@@ -293,13 +552,15 @@ class StudentManagementSystem(QMainWindow):
         search_button = QPushButton("Search Instructor")
         search_button.clicked.connect(self.search_instructor)
 
-        self.instructor_tree = QTreeWidget()
-        self.instructor_tree.setHeaderLabels(["Name", "Age", "Email", "ID"])
+        self.instructor_model = PagedQueryModel(["Name", "Age", "Email", "ID"], instructor_row)
+        self.instructor_tree = make_table_view(self.instructor_model)
+        self.instructor_model.loadFailed.connect(self.show_load_error)
 
         layout.addLayout(form_layout)
         layout.addWidget(submit_button)
         layout.addWidget(self.instructor_search_input)
         layout.addWidget(search_button)
+        layout.addWidget(make_loading_label(self.instructor_model, "Loading instructors..."))
         layout.addWidget(self.instructor_tree)
 
         self.tab_widget.addTab(instructors_tab, "Instructors")
@@ -323,13 +584,15 @@ class StudentManagementSystem(QMainWindow):
         search_button = QPushButton("Search Course")
         search_button.clicked.connect(self.search_course)
 
-        self.course_tree = QTreeWidget()
-        self.course_tree.setHeaderLabels(["Course Name", "Course ID", "Instructor ID"])
+        self.course_model = PagedQueryModel(["Course Name", "Course ID", "Instructor ID"], course_row)
+        self.course_tree = make_table_view(self.course_model)
+        self.course_model.loadFailed.connect(self.show_load_error)
 
         layout.addLayout(form_layout)
         layout.addWidget(submit_button)
         layout.addWidget(self.course_search_input)
         layout.addWidget(search_button)
+        layout.addWidget(make_loading_label(self.course_model, "Loading courses..."))
         layout.addWidget(self.course_tree)
 
         self.tab_widget.addTab(courses_tab, "Courses")
@@ -355,9 +618,11 @@ class StudentManagementSystem(QMainWindow):
         enrollment_tab = QWidget()
         layout = QVBoxLayout(enrollment_tab)
 
-        self.enrollment_tree = QTreeWidget()
-        self.enrollment_tree.setHeaderLabels(["Student Name", "Student ID", "Course Name", "Course ID"])
+        self.enrollment_model = PagedQueryModel(["Student Name", "Student ID", "Course Name", "Course ID"], enrollment_row)
+        self.enrollment_tree = make_table_view(self.enrollment_model)
+        self.enrollment_model.loadFailed.connect(self.show_load_error)
 
+        layout.addWidget(make_loading_label(self.enrollment_model, "Loading enrollments..."))
         layout.addWidget(self.enrollment_tree)
 
         self.tab_widget.addTab(enrollment_tab, "Enrollments")
@@ -377,23 +642,25 @@ class StudentManagementSystem(QMainWindow):
                 "email": email,
                 "student_id": student_id
             }
-            validated_data = student_schema.load(student_data)
+            validated_data = database.student_schema.load(student_data)
 
             # Check if student already exists
-            existing_student = session.query(StudentTable).filter(
-                (StudentTable.student_id == student_id) | (StudentTable.email == email)
+            existing_student = database.session.query(database.StudentTable).filter(
+                (database.StudentTable.student_id == student_id) | (database.StudentTable.email == email)
             ).first()
 
             if existing_student:
                 QMessageBox.warning(self, "Error", "Student ID or Email already exists in the database!")
             else:
-                new_student = StudentTable(**validated_data)
-                session.add(new_student)
-                session.commit()
-                self.update_student_tree()
+                new_student = database.StudentTable(**validated_data)
+                database.session.add(new_student)
+                database.session.commit()
+                if not self.student_model.upsert(new_student):
+                    self.update_student_tree()
+                self.student_combobox.addItem(new_student.name, new_student.student_id)
                 QMessageBox.information(self, "Success", f"Student {name} added to the database!")
 
-        except ValidationError as err:
+        except database.ValidationError as err:
             QMessageBox.warning(self, "Validation Error", f"Invalid input: {err.messages}")
         except ValueError as ve:
             QMessageBox.warning(self, "Error", f"Invalid input: {ve}")
@@ -418,23 +685,24 @@ class StudentManagementSystem(QMainWindow):
                 "email": email,
                 "instructor_id": instructor_id
             }
-            validated_data = instructor_schema.load(instructor_data)
+            validated_data = database.instructor_schema.load(instructor_data)
 
             # Check if instructor already exists
-            existing_instructor = session.query(InstructorTable).filter(
-                (InstructorTable.instructor_id == instructor_id) | (InstructorTable.email == email)
+            existing_instructor = database.session.query(database.InstructorTable).filter(
+                (database.InstructorTable.instructor_id == instructor_id) | (database.InstructorTable.email == email)
             ).first()
 
             if existing_instructor:
                 QMessageBox.warning(self, "Error", "Instructor ID or Email already exists in the database!")
             else:
-                new_instructor = InstructorTable(**validated_data)
-                session.add(new_instructor)
-                session.commit()
-                self.update_instructor_tree()
+                new_instructor = database.InstructorTable(**validated_data)
+                database.session.add(new_instructor)
+                database.session.commit()
+                if not self.instructor_model.upsert(new_instructor):
+                    self.update_instructor_tree()
                 QMessageBox.information(self, "Success", f"Instructor {name} added to the database!")
 
-        except ValidationError as err:
+        except database.ValidationError as err:
             QMessageBox.warning(self, "Validation Error", f"Invalid input: {err.messages}")
         except ValueError as ve:
             QMessageBox.warning(self, "Error", f"Invalid input: {ve}")
@@ -457,12 +725,10 @@ class StudentManagementSystem(QMainWindow):
                 "course_id": course_id,
                 "instructor_id": instructor_id if instructor_id else None
             }
-            validated_data = course_schema.load(course_data)
+            validated_data = database.course_schema.load(course_data)
 
             # Check if course already exists
-            existing_course = session.query(CourseTable).filter(
-                CourseTable.course_id == course_id
-            ).first()
+            existing_course = database.find_entity(database.CourseTable, 'course_id', course_id)
 
             if existing_course:
                 QMessageBox.warning(self, "Error", "Course ID already exists in the database!")
@@ -470,23 +736,24 @@ class StudentManagementSystem(QMainWindow):
                 # If instructor_id is provided, fetch the instructor
                 instructor = None
                 if instructor_id:
-                    instructor = session.query(InstructorTable).filter_by(instructor_id=instructor_id).first()
+                    instructor = database.find_entity(database.InstructorTable, 'instructor_id', instructor_id)
                     if not instructor:
                         QMessageBox.warning(self, "Error", f"Instructor with ID {instructor_id} not found!")
                         return
 
-                new_course = CourseTable(
+                new_course = database.CourseTable(
                     course_name=validated_data["course_name"],
                     course_id=validated_data["course_id"],
-                    instructor=instructor
+                    instructor_id=instructor.id if instructor else None
                 )
-                session.add(new_course)
-                session.commit()
-                self.update_course_tree()
-                self.update_course_combobox()
+                database.session.add(new_course)
+                database.session.commit()
+                if not self.course_model.upsert(new_course):
+                    self.update_course_tree()
+                self.course_combobox.addItem(new_course.course_name, new_course.course_id)
                 QMessageBox.information(self, "Success", f"Course {course_name} added to the database!")
 
-        except ValidationError as err:
+        except database.ValidationError as err:
             QMessageBox.warning(self, "Validation Error", f"Invalid input: {err.messages}")
         except ValueError as ve:
             QMessageBox.warning(self, "Error", f"Invalid input: {ve}")
@@ -497,18 +764,17 @@ class StudentManagementSystem(QMainWindow):
         self.course_instructor_id_input.clear()
 
     def register_student_for_course(self):
-        selected_student_name = self.student_combobox.currentText()
-        selected_course_name = self.course_combobox.currentText()
+        # Each combobox item carries its row's student_id / course_id; names need not be unique.
+        selected_student_id = self.student_combobox.currentData()
+        selected_course_id = self.course_combobox.currentData()
 
-        student = session.query(StudentTable).filter_by(name=selected_student_name).first()
-        course = session.query(CourseTable).filter_by(course_name=selected_course_name).first()
+        student = database.find_entity(database.StudentTable, 'student_id', selected_student_id)
+        course = database.find_entity(database.CourseTable, 'course_id', selected_course_id)
 
         if student and course:
-            if course not in student.courses:
-                student.courses.append(course)
-                session.commit()
+            if self.enrollments.enroll(student.id, course.id):
                 QMessageBox.information(self, "Success", f"{student.name} registered for {course.course_name}!")
-                self.update_enrollment_tree()
+                self.enrollment_model.upsert((student, course))
             else:
                 QMessageBox.information(self, "Info", f"{student.name} is already registered for {course.course_name}!")
         else:
@@ -516,105 +782,95 @@ class StudentManagementSystem(QMainWindow):
 
     def search_student(self):
         search_term = self.student_search_input.text()
-        self.student_tree.clear()
-        students = session.query(StudentTable).filter(
-            (StudentTable.name.like(f"%{search_term}%")) | (StudentTable.student_id == search_term)
-        ).all()
-        for student in students:
-            QTreeWidgetItem(self.student_tree, [student.name, str(student.age), student.email, student.student_id])
+        students = database.full_text_search(database.student_query(), database.StudentTable, search_term)
+        self.student_model.set_query(students)
 
     def search_instructor(self):
         search_term = self.instructor_search_input.text()
-        self.instructor_tree.clear()
-        instructors = session.query(InstructorTable).filter(
-            (InstructorTable.name.like(f"%{search_term}%")) | 
-            (InstructorTable.instructor_id == search_term) |
-            (InstructorTable.email.like(f"%{search_term}%"))
-        ).all()
-        for instructor in instructors:
-            QTreeWidgetItem(self.instructor_tree, [
-                instructor.name, 
-                str(instructor.age), 
-                instructor.email, 
-                instructor.instructor_id
-            ])
+        instructors = database.full_text_search(database.instructor_query(), database.InstructorTable, search_term)
+        self.instructor_model.set_query(instructors)
         
-        if not instructors:
+        if not self.instructor_model.rowCount():
             QMessageBox.information(self, "Search Result", "No matching instructors found.")
 
     def search_course(self):
         search_term = self.course_search_input.text()
-        self.course_tree.clear()
-        courses = session.query(CourseTable).filter(
-            (CourseTable.course_name.like(f"%{search_term}%")) | 
-            (CourseTable.course_id == search_term)
-        ).all()
-        for course in courses:
-            instructor_id = course.instructor.instructor_id if course.instructor else "N/A"
-            QTreeWidgetItem(self.course_tree, [
-                course.course_name, 
-                course.course_id, 
-                instructor_id
-            ])
+        courses = database.full_text_search(database.course_query(), database.CourseTable, search_term)
+        self.course_model.set_query(courses)
         
-        if not courses:
+        if not self.course_model.rowCount():
             QMessageBox.information(self, "Search Result", "No matching courses found.")
 
 
     def update_student_tree(self):
-        self.student_tree.clear()
-        students = session.query(StudentTable).all()
-        for student in students:
-            QTreeWidgetItem(self.student_tree, [student.name, str(student.age), student.email, student.student_id])
+        self.student_model.load(database.student_query, database.StudentTable.id)
 
     def update_instructor_tree(self):
-        self.instructor_tree.clear()  # Clear the current tree items
-        instructors = session.query(InstructorTable).all()  # Fetch all instructors from the database
-        for instructor in instructors:
-            QTreeWidgetItem(self.instructor_tree, [instructor.name, str(instructor.age), instructor.email, instructor.instructor_id])
+        self.instructor_model.load(database.instructor_query, database.InstructorTable.id)
 
     def update_course_tree(self):
-        self.course_tree.clear()  # Clear the current tree items
-        courses = session.query(CourseTable).all()  # Fetch all courses from the database
-        for course in courses:
-            instructor = session.query(InstructorTable).filter_by(id=course.instructor_id).first()
-            instructor_name = instructor.name if instructor else "N/A"  # If instructor exists, get the name, else "N/A"
-            QTreeWidgetItem(self.course_tree, [course.course_name, course.course_id, instructor_name])
+        self.course_model.load(database.course_query, database.CourseTable.id)
 
     def update_student_combobox(self):
-        self.student_combobox.clear()
-        students = session.query(StudentTable).all()
-        self.student_combobox.addItems([student.name for student in students])
+        self.student_combobox_task = run_in_background(
+            lambda worker_session: database.cached_query(('student_names',), ('students',), lambda: [
+                tuple(row) for row in worker_session.query(database.StudentTable.name, database.StudentTable.student_id).
+                order_by(database.StudentTable.id)]),
+            self.fill_student_combobox, self.show_load_error)
 
     def update_course_combobox(self):
+        self.course_combobox_task = run_in_background(
+            lambda worker_session: database.cached_query(('course_names',), ('courses',), lambda: [
+                tuple(row) for row in worker_session.query(database.CourseTable.course_name, database.CourseTable.course_id).
+                order_by(database.CourseTable.id)]),
+            self.fill_course_combobox, self.show_load_error)
+
+    @pyqtSlot(object)
+    def fill_student_combobox(self, items):
+        self.student_combobox.clear()
+        for name, student_id in items:
+            self.student_combobox.addItem(name, student_id)
+
+    @pyqtSlot(object)
+    def fill_course_combobox(self, items):
         self.course_combobox.clear()
-        courses = session.query(CourseTable).all()
-        self.course_combobox.addItems([course.course_name for course in courses])
+        for name, course_id in items:
+            self.course_combobox.addItem(name, course_id)
+
+    def update_enrollment_cache(self):
+        self.enrollment_cache_task = run_in_background(
+            database.EnrollmentCache.load, self.set_enrollment_cache, self.show_load_error)
+
+    @pyqtSlot(object)
+    def set_enrollment_cache(self, cache):
+        # Keep pairs registered while the cache was loading.
+        cache.pairs |= self.enrollments.pairs
+        self.enrollments = cache
 
     def update_enrollment_tree(self):
-        self.enrollment_tree.clear()
-        enrollments = session.query(StudentTable, CourseTable).\
-            join(student_course, StudentTable.id == student_course.c.student_id).\
-            join(CourseTable, CourseTable.id == student_course.c.course_id).\
-            all()
-        for student, course in enrollments:
-            QTreeWidgetItem(self.enrollment_tree, [student.name, student.student_id, course.course_name, course.course_id])
-
-def export_to_csv(table_name, file_name):
-    query = f"SELECT * FROM {table_name}"
-    df = pd.read_sql_query(query, engine)
-    df.to_csv(file_name, index=False)
-    print(f"Data from table '{table_name}' has been exported to '{file_name}'")
+        self.enrollment_model.load(
+            lambda query_session: database.enrollment_query(query_session).order_by(database.StudentTable.id, database.CourseTable.id),
+            sort_key=enrollment_key)
+
+    @pyqtSlot(str)
+    def show_load_error(self, message):
+        QMessageBox.warning(self, "Error", f"Could not load data: {message}")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    # Let background loads finish before the objects they report to are torn down.
+    app.aboutToQuit.connect(QThreadPool.globalInstance().waitForDone)
     window = StudentManagementSystem()
     window.show()
 
-    # Export data
-    export_to_csv('students', 'students.csv')
-    export_to_csv('instructors', 'instructors.csv')
-    export_to_csv('courses', 'courses.csv')
-    export_to_csv('student_course', 'enrollments.csv')
+    def export_data():
+        init_app()
+        database.export_to_csv('students', 'students.csv')
+        database.export_to_csv('instructors', 'instructors.csv')
+        database.export_to_csv('courses', 'courses.csv')
+        database.export_to_csv('student_course', 'enrollments.csv')
+
+    # Export data once the window has been painted and the data layer is loaded.
+    QTimer.singleShot(0, export_data)
 
     sys.exit(app.exec_())
\ No newline at end of file
@@ -2,12 +2,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
 import json
-import re
 from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from marshmallow import Schema, fields, validate, ValidationError
-import pandas as pd
+from database import create_search_index, full_text_search, export_to_csv
+from modules import EMAIL_PATTERN, compact_ids
 
 Base = declarative_base()
 engine = create_engine('sqlite:///student_management.db')
@@ -48,15 +48,18 @@ class CourseTable(Base):
 
 Base.metadata.create_all(engine)
 
+# The search index and its queries are shared with the PyQt app's data layer.
+create_search_index(engine)
+
 class StudentSchema(Schema):
     name = fields.String(required=True, validate=validate.Length(min=1))
-    age = fields.Integer(required=True, validate=lambda n: n > 0)
+    age = fields.Integer(required=True, validate=validate.Range(min=1))
     email = fields.Email(required=True)
     student_id = fields.String(required=True, validate=validate.Length(min=1))
 
 class InstructorSchema(Schema):
     name = fields.String(required=True, validate=validate.Length(min=1))
-    age = fields.Integer(required=True, validate=lambda n: n > 0)
+    age = fields.Integer(required=True, validate=validate.Range(min=1))
     email = fields.Email(required=True)
     instructor_id = fields.String(required=True, validate=validate.Length(min=1))
 
@@ -73,6 +76,7 @@ available_courses = []
 students_list = []
 instructors_list = []
 class person(object):
+    __slots__ = ('name', 'age', '_person__email')
     def __init__(self,name, age ,email):
         self.name=name
         self.age=age
@@ -90,23 +94,24 @@ class person(object):
             return cls(**data)
     ## the below function was found online to verify the integrity of the email
     def validate_email(self, email):
-        email_regex = r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
-        if not re.match(email_regex, email):
+        if not EMAIL_PATTERN.match(email):
             raise ValueError(f"Invalid email format: {email}")
         return email
     def validate_age(self, age):
         if not isinstance(age, int) or age < 0:
             raise ValueError(f"Invalid age: {age}. Age must be a non-negative integer.")
         return age
+
     
 
 class student(person):
-    def __init__(self,name, age ,email,student_id,registered_courses=[]):
+    __slots__ = ('student_id', 'registered_courses')
+    def __init__(self,name, age ,email,student_id,registered_courses=()):
         super().__init__(name,age,email)
         self.student_id=student_id
-        self.registered_courses=registered_courses
+        self.registered_courses=compact_ids(registered_courses)
     def register_course(self,course):
-        self.registered_courses.append(course.course_id)
+        self.registered_courses+=compact_ids((course.course_id,))
     
     def serialize(self):
         return json.dumps({
@@ -119,12 +124,13 @@ class student(person):
 
 
 class instructor(person):
-    def __init__(self,name, age ,email,instructor_id,assigned_courses=[]):
+    __slots__ = ('instructor_id', 'assigned_courses')
+    def __init__(self,name, age ,email,instructor_id,assigned_courses=()):
         super().__init__(name,age,email)
         self.instructor_id=instructor_id
-        self.assigned_courses=assigned_courses     
+        self.assigned_courses=compact_ids(assigned_courses)
     def assign_cource(self,course):
-        self.assigned_courses.append(course.course_id)
+        self.assigned_courses+=compact_ids((course.course_id,))
     def serialize(self):
         return json.dumps({
             "name":self.name,
@@ -135,13 +141,14 @@ class instructor(person):
         })
 
 class course():
-    def __init__(self,course_id,course_name,instructor,enrolled_students=[]):
+    __slots__ = ('course_id', 'course_name', 'instructor', 'enrolled_students')
+    def __init__(self,course_id,course_name,instructor,enrolled_students=()):
         self.course_id=course_id
         self.course_name=course_name
         self.instructor=instructor
-        self.enrolled_students=enrolled_students
+        self.enrolled_students=compact_ids(enrolled_students)
     def add_student(self,student):
-        self.enrolled_students.append(student.student_id)
+        self.enrolled_students+=compact_ids((student.student_id,))
     
     def serialize(self):
         return json.dumps({
@@ -428,34 +435,22 @@ def register_student_for_course():
 
 def search_student(search_term):
     student_tree.delete(*student_tree.get_children())
-    students = session.query(StudentTable).filter(
-        (StudentTable.name.like(f"%{search_term}%")) | (StudentTable.student_id == search_term)
-    ).all()
+    students = full_text_search(session.query(StudentTable), StudentTable, search_term).all()
     for student in students:
         student_tree.insert("", "end", values=(student.name, student.age, student.email, student.student_id))
 
 def search_instructor(search_term):
     instructor_tree.delete(*instructor_tree.get_children())
-    instructors = session.query(InstructorTable).filter(
-        (InstructorTable.name.like(f"%{search_term}%")) | (InstructorTable.instructor_id == search_term)
-    ).all()
+    instructors = full_text_search(session.query(InstructorTable), InstructorTable, search_term).all()
     for instructor in instructors:
         instructor_tree.insert("", "end", values=(instructor.name, instructor.age, instructor.email, instructor.instructor_id))
 
 def search_course(search_term):
     course_tree.delete(*course_tree.get_children())
-    courses = session.query(CourseTable).filter(
-        (CourseTable.course_name.like(f"%{search_term}%")) | (CourseTable.course_id == search_term)
-    ).all()
+    courses = full_text_search(session.query(CourseTable), CourseTable, search_term).all()
     for course in courses:
         course_tree.insert("", "end", values=(course.course_name, course.course_id, course.instructor_id))
 
-def export_to_csv(table_name, file_name):
-    query = f"SELECT * FROM {table_name}"
-    df = pd.read_sql_query(query, engine)
-    df.to_csv(file_name, index=False)
-    print(f"Data from table '{table_name}' has been exported to '{file_name}'")
-
 load_courses()
 load_instructors()
 load_students()
@@ -633,10 +628,10 @@ update_instructor_list()
 update_course_list_for_instructors()
 
 # Export data
-export_to_csv('students', 'students.csv')
-export_to_csv('instructors', 'instructors.csv')
-export_to_csv('courses', 'courses.csv')
-export_to_csv('student_course', 'enrollments.csv')
+export_to_csv('students', 'students.csv', bind=engine)
+export_to_csv('instructors', 'instructors.csv', bind=engine)
+export_to_csv('courses', 'courses.csv', bind=engine)
+export_to_csv('student_course', 'enrollments.csv', bind=engine)
 
 window.mainloop()
 
@@ -1,7 +1,139 @@
-from sqlite3 import connect
+from sqlite3 import connect, complete_statement
+from itertools import islice, accumulate
+from operator import attrgetter
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections.abc import MutableSequence
+from array import array
+from pathlib import Path
 import tkinter as tk
 from tkinter import ttk
+import asyncio
+import gc
+import gzip
+import io
 import json
+import lzma
+import mmap
+import os
+import queue
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+
+
+def compact_ids(ids):
+    """
+    Packs a sequence of record IDs into a tuple of interned strings.
+
+    The same course and student IDs are repeated across thousands of records, so
+    interning them keeps one copy of each string, and a tuple has no spare capacity
+    the way a list does.
+
+    :param ids: The IDs to pack.
+    :type ids: iterable
+    :return: The packed IDs.
+    :rtype: tuple
+    """
+    try:
+        return tuple(map(sys.intern, ids))
+    except TypeError:
+        return tuple(sys.intern(i) if isinstance(i, str) else i for i in ids)
+
+
+def encode_record(record):
+    """
+    Encodes a record as a plain dict in a single pass over its class's FIELDS.
+
+    The keys are the attribute names the JSON files have always used, including the
+    mangled ``_Person__email``. A record nested in another one, such as a Course's
+    instructor, is left for ``json.dumps(..., default=encode_record)`` to encode.
+
+    :param record: The record to encode.
+    :type record: Person or Course
+    :return: The field names mapped to their values.
+    :rtype: dict
+    """
+    return {field: getattr(record, field) for field in type(record).FIELDS}
+
+
+def decode_record(cls, data):
+    """
+    Builds a record from the dict written by encode_record().
+
+    Files written before the codec existed hold every record as its own JSON string
+    inside the outer document; such strings are decoded first, so old files load
+    unchanged.
+
+    :param cls: The record class: Student, Instructor or Course.
+    :type cls: type
+    :param data: The encoded record, or a legacy JSON string.
+    :type data: dict or str
+    :return: The record.
+    :rtype: Person or Course
+    :raises AssertionError: If age is negative or email is invalid.
+    """
+    if isinstance(data, str):
+        data = json.loads(data)
+    return cls(*[data[field] for field in cls.FIELDS])
+
+
+def encode_rows(cls, records):
+    """
+    Encodes records as rows of field values, in the order of ``cls.FIELDS``.
+
+    Snapshots store the field names once and a row per record, which is much cheaper
+    to write and to parse than repeating every key in every record.
+
+    :param cls: The record class: Student, Instructor or Course.
+    :type cls: type
+    :param records: The records to encode.
+    :type records: list
+    :return: One tuple of field values per record.
+    :rtype: list
+    """
+    row = attrgetter(*cls.FIELDS)
+    return [row(record) for record in records]
+
+
+def decode_rows(cls, fields, rows):
+    """
+    Builds records from rows written by encode_rows().
+
+    :param cls: The record class: Student, Instructor or Course.
+    :type cls: type
+    :param fields: The field names the rows were written with.
+    :type fields: list
+    :param rows: The rows to decode.
+    :type rows: list
+    :return: The records.
+    :rtype: list
+    :raises AssertionError: If an age is negative or an email is invalid.
+    """
+    if tuple(fields) != cls.FIELDS:
+        positions = [fields.index(field) for field in cls.FIELDS]
+        rows = ([row[i] for i in positions] for row in rows)
+    return [cls(*row) for row in rows]
+
+
+@contextmanager
+def gc_paused():
+    """
+    Turns off the cyclic garbage collector for the duration of a bulk load.
+
+    Decoding a snapshot creates millions of containers and none of them are garbage,
+    yet each allocation burst triggers a collection pass over all of them.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 class Person:
@@ -17,6 +149,12 @@ class Person:
     :raises AssertionError: If age is negative or email is invalid.
     """
 
+    # The mangled name is spelled out so self.__email resolves to this slot and the
+    # serialized key stays "_Person__email".
+    __slots__ = ("name", "age", "_Person__email")
+    # The fields encode_record() writes, in constructor argument order.
+    FIELDS = __slots__
+
     def __init__(self, name, age, email):
         assert age >= 0, "Age cannot be negative."
         assert "@" in email, "Invalid email address."
@@ -37,7 +175,7 @@ class Person:
         :return: The JSON string representation of the Person.
         :rtype: str
         """
-        return json.dumps(self, default=lambda o: o.__dict__)
+        return json.dumps(encode_record(self), default=encode_record)
 
     @staticmethod
     def deserialize(data):
@@ -50,10 +188,7 @@ class Person:
         :rtype: Person
         :raises AssertionError: If age is negative or email is invalid.
         """
-        data = json.loads(data)
-        assert data["age"] >= 0, "Age cannot be negative."
-        assert "@" in data["_Person__email"], "Invalid email address."
-        return Person(data["name"], data["age"], data["_Person__email"])
+        return decode_record(Person, data)
 
     def get_email(self):
         """
@@ -77,14 +212,17 @@ class Student(Person):
     :type email: str
     :param student_id: The ID of the student.
     :type student_id: str
-    :param registered_courses: A list of registered course IDs.
-    :type registered_courses: list
+    :param registered_courses: The registered course IDs.
+    :type registered_courses: iterable
     """
 
-    def __init__(self, name, age, email, student_id, registered_courses=[]):
+    __slots__ = ("student_id", "registered_courses")
+    FIELDS = Person.FIELDS + __slots__
+
+    def __init__(self, name, age, email, student_id, registered_courses=()):
         super().__init__(name, age, email)
         self.student_id = student_id
-        self.registered_courses = registered_courses
+        self.registered_courses = compact_ids(registered_courses)
 
     def register_course(self, course_id):
         """
@@ -93,7 +231,7 @@ class Student(Person):
         :param course_id: The ID of the course to register.
         :type course_id: str
         """
-        self.registered_courses.append(course_id)
+        self.registered_courses += compact_ids((course_id,))
 
     @staticmethod
     def deserialize(data):
@@ -105,10 +243,7 @@ class Student(Person):
         :return: A Student object.
         :rtype: Student
         """
-        data = json.loads(data)
-        assert data["age"] >= 0, "Age cannot be negative."
-        assert "@" in data["_Person__email"], "Invalid email address."
-        return Student(data["name"], data["age"], data["_Person__email"], data["student_id"], data["registered_courses"])
+        return decode_record(Student, data)
 
 
 class Instructor(Person):
@@ -123,14 +258,17 @@ class Instructor(Person):
     :type email: str
     :param instructor_id: The ID of the instructor.
     :type instructor_id: str
-    :param assigned_courses: A list of assigned course IDs.
-    :type assigned_courses: list
+    :param assigned_courses: The assigned course IDs.
+    :type assigned_courses: iterable
     """
 
+    __slots__ = ("instructor_id", "assigned_courses")
+    FIELDS = Person.FIELDS + __slots__
+
     def __init__(self, name, age, email, instructor_id, assigned_courses):
         super().__init__(name, age, email)
         self.instructor_id = instructor_id
-        self.assigned_courses = assigned_courses
+        self.assigned_courses = compact_ids(assigned_courses)
 
     def assign_course(self, course_id):
         """
@@ -139,7 +277,7 @@ class Instructor(Person):
         :param course_id: The ID of the course to assign.
         :type course_id: str
         """
-        self.assigned_courses.append(course_id)
+        self.assigned_courses += compact_ids((course_id,))
 
     @staticmethod
     def deserialize(data):
@@ -151,10 +289,7 @@ class Instructor(Person):
         :return: An Instructor object.
         :rtype: Instructor
         """
-        data = json.loads(data)
-        assert data["age"] >= 0, "Age cannot be negative."
-        assert "@" in data["_Person__email"], "Invalid email address."
-        return Instructor(data["name"], data["age"], data["_Person__email"], data["instructor_id"], data["assigned_courses"])
+        return decode_record(Instructor, data)
 
 
 class Course:
@@ -167,15 +302,18 @@ class Course:
     :type course_name: str
     :param instructor: The instructor of the course.
     :type instructor: Instructor
-    :param enrolled_students: A list of enrolled student IDs.
-    :type enrolled_students: list
+    :param enrolled_students: The enrolled student IDs.
+    :type enrolled_students: iterable
     """
 
+    __slots__ = ("course_id", "course_name", "instructor", "enrolled_students")
+    FIELDS = __slots__
+
     def __init__(self, course_id, course_name, instructor, enrolled_students):
         self.course_id = course_id
         self.course_name = course_name
         self.instructor = instructor
-        self.enrolled_students = enrolled_students
+        self.enrolled_students = compact_ids(enrolled_students)
 
     def add_student(self, student_id):
         """
@@ -184,7 +322,7 @@ class Course:
         :param student_id: The ID of the student to add.
         :type student_id: str
         """
-        self.enrolled_students.append(student_id)
+        self.enrolled_students += compact_ids((student_id,))
 
     def serialize(self):
         """
@@ -193,7 +331,7 @@ class Course:
         :return: The JSON string representation of the Course.
         :rtype: str
         """
-        return json.dumps(self, default=lambda o: o.__dict__)
+        return json.dumps(encode_record(self), default=encode_record)
 
     @staticmethod
     def deserialize(data):
@@ -205,8 +343,7 @@ class Course:
         :return: A Course object.
         :rtype: Course
         """
-        data = json.loads(data)
-        return Course(data["course_id"], data["course_name"], data["instructor"], data["enrolled_students"])
+        return decode_record(Course, data)
 
     def __str__(self):
         """
@@ -218,33 +355,1058 @@ class Course:
         return self.course_name
 
 
-def update_data():
+DATA_FILE = "data.json"
+COLUMNAR_FILE = "data.col"
+RECORD_FILE = "data.records"
+# The format update_data() and the Save button write: "json", "columnar" or "records".
+SNAPSHOT_FORMAT = "json"
+SNAPSHOT_FILES = {"json": DATA_FILE, "columnar": COLUMNAR_FILE, "records": RECORD_FILE}
+# Spare bytes left in each slot of 'data.records' so a record can grow in place.
+RECORD_SLACK = 64
+COLUMNAR_MAGIC = b"SMSCOL\x00\x01"
+JOURNAL_FILE = "data.journal"
+JOURNAL_MODE = True
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+RECORD_TYPES = {
+    "students": (Student, "student_id"),
+    "instructors": (Instructor, "instructor_id"),
+    "courses": (Course, "course_id"),
+}
+
+# How write_columnar() stores each field.
+COLUMN_TYPES = {
+    "name": "str",
+    "age": "int",
+    "_Person__email": "str",
+    "student_id": "str",
+    "registered_courses": "ids",
+    "instructor_id": "str",
+    "assigned_courses": "ids",
+    "course_id": "str",
+    "course_name": "str",
+    "instructor": "json",
+    "enrolled_students": "ids",
+}
+
+# The fields each Repository keeps a hash index on; the first is the ID.
+INDEXED_FIELDS = {
+    "students": ("student_id", "_Person__email"),
+    "instructors": ("instructor_id", "_Person__email"),
+    "courses": ("course_id",),
+}
+
+_journal_lock = threading.Lock()
+_compaction = None
+_record_file = None
+
+
+def write_snapshot(students, instructors, courses, snapshot_format=None):
+    """
+    Writes a full snapshot of students, instructors, and courses.
+
+    The snapshot is written to a temporary file first and then moved into place, so a
+    crash never leaves a half-written snapshot behind. In 'data.json' the field names of
+    each record type are written once under "fields", followed by one row per record,
+    and the whole document is encoded in a single json.dumps() call. The columnar format
+    goes to 'data.col' through write_columnar(), and the records format to
+    'data.records' through RecordFile.create(). A snapshot left in another format is
+    removed, so the journal is never replayed on top of a stale one.
+
+    :param students: The students to save.
+    :type students: list
+    :param instructors: The instructors to save.
+    :type instructors: list
+    :param courses: The courses to save.
+    :type courses: list
+    :param snapshot_format: "json", "columnar" or "records"; defaults to SNAPSHOT_FORMAT.
+    :type snapshot_format: str
+    """
+    filename = SNAPSHOT_FILES[snapshot_format or SNAPSHOT_FORMAT]
+    close_record_file()
+    if filename == RECORD_FILE:
+        RecordFile.create(filename, students, instructors, courses)
+    elif filename == COLUMNAR_FILE:
+        write_columnar(filename + ".tmp", students, instructors, courses)
+        os.replace(filename + ".tmp", filename)
+    else:
+        data = {
+            "fields": {kind: cls.FIELDS for kind, (cls, key) in RECORD_TYPES.items()},
+            "students": encode_rows(Student, students),
+            "instructors": encode_rows(Instructor, instructors),
+            "courses": encode_rows(Course, courses)
+        }
+        with open(filename + ".tmp", "w") as file:
+            file.write(json.dumps(data, default=encode_record))
+        os.replace(filename + ".tmp", filename)
+    for other in SNAPSHOT_FILES.values():
+        if other != filename:
+            for stale in (other, other + ".index"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+
+def snapshot_format_on_disk():
+    """
+    Returns the format of the snapshot currently on disk.
+
+    Compaction keeps writing that format, so a dataset saved as columnar stays columnar.
+
+    :return: "json", "columnar" or "records", or SNAPSHOT_FORMAT if there is no snapshot yet.
+    :rtype: str
+    """
+    for snapshot_format, filename in SNAPSHOT_FILES.items():
+        if os.path.exists(filename):
+            return snapshot_format
+    return SNAPSHOT_FORMAT
+
+
+def update_data(snapshot_format=None):
+    """
+    Updates the data by saving students, instructors, and courses to a snapshot.
+
+    This writes a full snapshot, so the change journal is emptied afterwards.
+
+    :param snapshot_format: "json", "columnar" or "records"; defaults to SNAPSHOT_FORMAT.
+    :type snapshot_format: str
+    """
+    if _compaction is not None:
+        _compaction.join()
+    with _journal_lock:
+        write_snapshot(students, instructors, courses, snapshot_format)
+        for journal in (JOURNAL_FILE, JOURNAL_FILE + ".compacting"):
+            if os.path.exists(journal):
+                os.remove(journal)
+
+
+def journal_record(kind, record):
+    """
+    Saves a single added or changed record by appending it to the change journal.
+
+    The cost does not depend on how many records exist. Once the journal grows past
+    JOURNAL_COMPACT_BYTES it is folded into a fresh 'data.json' in the background.
+    With JOURNAL_MODE turned off this falls back to a full update_data(). When the data
+    is kept in 'data.records', the record is written to its slot there instead. Before
+    any snapshot exists, a full one is written instead: a journal alone would be
+    replayed onto empty lists and lose the records it does not mention, such as the
+    seed data.
+
+    :param kind: The record type: "students", "instructors" or "courses".
+    :type kind: str
+    :param record: The record to save.
+    :type record: Student or Instructor or Course
+    """
+    if not any(os.path.exists(filename) for filename in SNAPSHOT_FILES.values()):
+        update_data()
+        return
+    if snapshot_format_on_disk() == "records":
+        with _journal_lock:
+            record_file().write(kind, record)
+        return
+    if not JOURNAL_MODE:
+        update_data()
+        return
+    line = json.dumps({"type": kind, "record": encode_record(record)}, default=encode_record)
+    with _journal_lock:
+        with open(JOURNAL_FILE, "a") as file:
+            file.write(line + "\n")
+            size = file.tell()
+    if size >= JOURNAL_COMPACT_BYTES:
+        compact_journal()
+
+
+def compact_journal():
+    """
+    Folds the change journal into a fresh 'data.json' on a background thread.
+
+    The journal is set aside under a lock so new changes keep going to a fresh journal
+    while the snapshot is written. If the process dies mid-way, load_data() replays the
+    set-aside journal on top of whichever snapshot made it to disk.
+    """
+    global _compaction
+    with _journal_lock:
+        if _compaction is not None and _compaction.is_alive():
+            return
+        if not os.path.exists(JOURNAL_FILE):
+            return
+        if os.path.exists(JOURNAL_FILE + ".compacting"):
+            # Left over from an interrupted compaction: keep its entries.
+            with open(JOURNAL_FILE, "r") as source, open(JOURNAL_FILE + ".compacting", "a") as target:
+                target.write("\n")
+                shutil.copyfileobj(source, target)
+            os.remove(JOURNAL_FILE)
+        else:
+            os.replace(JOURNAL_FILE, JOURNAL_FILE + ".compacting")
+        snapshot = (list(students), list(instructors), list(courses), snapshot_format_on_disk())
+        _compaction = threading.Thread(target=_write_compacted, args=snapshot, daemon=True)
+        _compaction.start()
+
+
+def _write_compacted(students, instructors, courses, snapshot_format):
+    """
+    Writes the compacted snapshot and drops the journal it replaces.
+    """
+    write_snapshot(students, instructors, courses, snapshot_format)
+    os.remove(JOURNAL_FILE + ".compacting")
+
+
+def replay_journal(filename, records):
+    """
+    Applies the changes recorded in a journal file, in order.
+
+    A record replaces the record with the same ID, or is appended if it is new. Lines
+    that cannot be decoded, such as one left half-written by a crash, are skipped.
+
+    :param filename: The journal file name.
+    :type filename: str
+    :param records: The lists of records by type, updated in place.
+    :type records: dict
+    """
+    if not os.path.exists(filename):
+        return
+    indexes = {}
+    with open(filename, "r") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            kind = entry["type"]
+            cls, key = RECORD_TYPES[kind]
+            record = decode_record(cls, entry["record"])
+            if kind not in indexes:
+                items = records[kind]
+                keys = items.keys(key) if isinstance(items, LazyRecords) else [getattr(item, key) for item in items]
+                indexes[kind] = {value: i for i, value in enumerate(keys)}
+            index = indexes[kind]
+            position = index.get(getattr(record, key))
+            if position is None:
+                index[getattr(record, key)] = len(records[kind])
+                records[kind].append(record)
+            else:
+                records[kind][position] = record
+
+
+def write_columnar(filename, students, instructors, courses):
+    """
+    Writes students, instructors, and courses to a binary columnar snapshot.
+
+    Each record type is stored column by column: ages as a fixed-width integer column,
+    text as string tables (an offsets array into a UTF-8 blob), and ID lists as an
+    offsets array into one array of indexes in a string table of IDs shared by the
+    whole file. A course's instructor, which can be anything, is stored as JSON text.
+    A small JSON header after the magic bytes records where each column starts.
+
+    :param filename: The file to write.
+    :type filename: str
+    :param students: The students to save.
+    :type students: list
+    :param instructors: The instructors to save.
+    :type instructors: list
+    :param courses: The courses to save.
+    :type courses: list
+    """
+    chunks = []
+    position = 0
+    ids = {}
+
+    def add(values):
+        # Columns start on 8-byte boundaries so they can be cast in place when mapped.
+        nonlocal position
+        data = memoryview(values).cast("B")
+        padding = -position % 8
+        chunks.append(b"\0" * padding)
+        chunks.append(data)
+        position += padding
+        start = position
+        position += data.nbytes
+        return start, data.nbytes
+
+    def add_strings(values):
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = array("Q", accumulate(map(len, encoded), initial=0))
+        return {"offsets": add(offsets), "data": add(b"".join(encoded))}
+
+    sections = {}
+    for kind, records in zip(RECORD_TYPES, (students, instructors, courses)):
+        cls, key = RECORD_TYPES[kind]
+        columns = {}
+        for field in cls.FIELDS:
+            column_type = COLUMN_TYPES[field]
+            values = [getattr(record, field) for record in records]
+            if column_type == "int":
+                columns[field] = {"type": column_type, "values": add(array("q", values))}
+            elif column_type == "str":
+                columns[field] = dict(type=column_type, **add_strings(values))
+            elif column_type == "json":
+                columns[field] = dict(type=column_type, **add_strings(json.dumps(value, default=encode_record) for value in values))
+            else:
+                offsets = array("Q", [0])
+                indexes = array("I")
+                for value in values:
+                    indexes.extend(ids.setdefault(item, len(ids)) for item in value)
+                    offsets.append(len(indexes))
+                columns[field] = {"type": column_type, "offsets": add(offsets), "indexes": add(indexes)}
+        sections[kind] = {"count": len(records), "fields": list(cls.FIELDS), "columns": columns}
+
+    header = {"byteorder": sys.byteorder, "ids": dict(count=len(ids), **add_strings(ids)), "sections": sections}
+    header = json.dumps(header).encode("utf-8")
+    with open(filename, "wb") as file:
+        file.write(COLUMNAR_MAGIC)
+        file.write(struct.pack("<Q", len(header)))
+        file.write(header)
+        file.write(b"\0" * (-(len(COLUMNAR_MAGIC) + 8 + len(header)) % 8))
+        for chunk in chunks:
+            file.write(chunk)
+
+
+class ColumnarSnapshot:
+    """
+    A columnar snapshot written by write_columnar(), mapped into memory with mmap.
+
+    Opening one only parses the header; column values are read from the mapping as
+    records are built. The mapping is closed once every section has built all of its
+    records, so a later save can replace the file.
+
+    :param filename: The snapshot file.
+    :type filename: str
+    :raises ValueError: If the file is not a columnar snapshot.
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+            self.map.close()
+            raise ValueError(f"{filename} is not a columnar snapshot.")
+        start = len(COLUMNAR_MAGIC) + 8
+        (length,) = struct.unpack_from("<Q", self.map, len(COLUMNAR_MAGIC))
+        self.header = json.loads(self.map[start:start + length])
+        self.base = start + length + (-(start + length) % 8)
+        self.buffer = memoryview(self.map)
+        self.views = []
+        self.swap = self.header["byteorder"] != sys.byteorder
+        self.open_sections = len(self.header["sections"])
+        self.ids = {}
+        ids = self.header["ids"]
+        self.id_text = self.string_column(ids["offsets"], ids["data"])
+
+    def view(self, location, typecode):
+        """
+        Returns a column as a sequence of ``typecode`` values, without copying it.
+
+        :param location: The column's (offset, size) in the data area.
+        :type location: list
+        :param typecode: An array typecode: "B", "I", "Q" or "q".
+        :type typecode: str
+        :return: The column values.
+        :rtype: memoryview or array.array
+        """
+        offset, size = location
+        data = self.buffer[self.base + offset:self.base + offset + size]
+        if typecode == "B":
+            self.views.append(data)
+            return data
+        if self.swap:
+            values = array(typecode, data)
+            values.byteswap()
+            data.release()
+            return values
+        values = data.cast(typecode)
+        self.views.extend((data, values))
+        return values
+
+    def string_column(self, offsets, data):
+        """
+        Returns a function that reads the ``i``-th string of a string table.
+        """
+        offsets = self.view(offsets, "Q")
+        data = self.view(data, "B")
+        return lambda i: str(data[offsets[i]:offsets[i + 1]], "utf-8")
+
+    def record_id(self, index):
+        """
+        Returns the ID stored at ``index`` in the shared ID table, interned.
+        """
+        value = self.ids.get(index)
+        if value is None:
+            value = self.ids[index] = sys.intern(self.id_text(index))
+        return value
+
+    def column(self, spec):
+        """
+        Returns a function that reads one record's value from a column.
+
+        :param spec: The column entry from the header.
+        :type spec: dict
+        :return: A function from row number to value.
+        :rtype: callable
+        """
+        if spec["type"] == "int":
+            return self.view(spec["values"], "q").__getitem__
+        if spec["type"] == "str":
+            return self.string_column(spec["offsets"], spec["data"])
+        if spec["type"] == "json":
+            text = self.string_column(spec["offsets"], spec["data"])
+            return lambda i: json.loads(text(i))
+        offsets = self.view(spec["offsets"], "Q")
+        indexes = self.view(spec["indexes"], "I")
+        cached = self.ids
+
+        def read(i):
+            values = []
+            for index in indexes[offsets[i]:offsets[i + 1]].tolist():
+                value = cached.get(index)
+                values.append(value if value is not None else self.record_id(index))
+            return tuple(values)
+
+        return read
+
+    def release_section(self):
+        """
+        Called by a LazyRecords once it has built all of its records.
+        """
+        self.open_sections -= 1
+        if self.open_sections == 0:
+            self.close()
+
+    def close(self):
+        """
+        Releases the column views and unmaps the file.
+        """
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.buffer.release()
+        self.map.close()
+
+
+class LazyRecords(MutableSequence):
+    """
+    A list of records backed by one section of a ColumnarSnapshot.
+
+    A record is built from its columns the first time it is accessed and kept from
+    then on. Appending and replacing records work on the list directly; inserting in
+    the middle or deleting builds every remaining record first, since the positions
+    of unbuilt records must keep matching their rows in the file.
+
+    :param snapshot: The mapped snapshot.
+    :type snapshot: ColumnarSnapshot
+    :param kind: The record type: "students", "instructors" or "courses".
+    :type kind: str
+    """
+
+    def __init__(self, snapshot, kind):
+        section = snapshot.header["sections"][kind]
+        self.cls, key = RECORD_TYPES[kind]
+        self.snapshot = snapshot
+        self.columns = [snapshot.column(section["columns"][field]) for field in self.cls.FIELDS]
+        self.records = [None] * section["count"]
+        self.pending = section["count"]
+        if not self.pending:
+            self.release()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.records)))]
+        record = self.records[index]
+        if record is None:
+            if index < 0:
+                index += len(self.records)
+            record = self.records[index] = self.cls(*[column(index) for column in self.columns])
+            self.built()
+        return record
+
+    def __iter__(self):
+        for i in range(len(self.records)):
+            yield self[i]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.materialize()
+        elif self.records[index] is None:
+            self.built()
+        self.records[index] = value
+
+    def __delitem__(self, index):
+        self.materialize()
+        del self.records[index]
+
+    def insert(self, index, value):
+        if index < len(self.records):
+            self.materialize()
+        self.records.insert(index, value)
+
+    def keys(self, field):
+        """
+        Returns one field of every record, reading unbuilt records' values from their column.
+
+        :param field: The field to read, such as "student_id".
+        :type field: str
+        :return: The field values, in record order.
+        :rtype: list
+        """
+        column = self.columns[self.cls.FIELDS.index(field)] if self.pending else None
+        return [getattr(record, field) if record is not None else column(i) for i, record in enumerate(self.records)]
+
+    def materialize(self):
+        """
+        Builds every record that has not been built yet.
+        """
+        with gc_paused():
+            for i in range(len(self.records)):
+                self[i]
+
+    def built(self):
+        """
+        Counts one more built record, releasing the columns after the last one.
+        """
+        self.pending -= 1
+        if not self.pending:
+            self.release()
+
+    def release(self):
+        """
+        Drops the column readers and lets the snapshot unmap the file.
+        """
+        self.columns = None
+        self.snapshot.release_section()
+
+
+def read_columnar(filename):
+    """
+    Opens a columnar snapshot. No records are built until they are accessed.
+
+    :param filename: The snapshot file.
+    :type filename: str
+    :return: A LazyRecords for each record type.
+    :rtype: dict
+    :raises ValueError: If the file is not a columnar snapshot.
+    """
+    snapshot = ColumnarSnapshot(filename)
+    return {kind: LazyRecords(snapshot, kind) for kind in RECORD_TYPES}
+
+
+class RecordFile:
+    """
+    Records stored one per slot in 'data.records', with a sidecar index from ID to slot.
+
+    Every slot is one JSON line ``{"type": ..., "record": ...}`` padded with spaces, so
+    a record can be rewritten in place as long as it still fits. A record that outgrows
+    its slot is appended at the end and its old slot blanked out. The sidecar index is
+    append-only as well: each line maps a record type and ID to a slot's offset and
+    size, and the last line for an ID wins. Both files start with the same generation
+    token; if they disagree, or the index is missing, it is rebuilt by scanning the
+    records, and slots appended after the last indexed one are picked up the same way.
+
+    :param filename: The record file.
+    :type filename: str
+    """
+
+    def __init__(self, filename=RECORD_FILE):
+        self.filename = filename
+        self.file = open(filename, "r+b")
+        self.generation = json.loads(self.file.readline())["generation"]
+        self.index = {kind: {} for kind in RECORD_TYPES}
+        end = self.read_index()
+        if end is None:
+            end = self.file.tell()
+            self.index = {kind: {} for kind in RECORD_TYPES}
+            self.index_file = open(filename + ".index", "w")
+            self.index_file.write(json.dumps({"generation": self.generation}) + "\n")
+        else:
+            self.index_file = open(filename + ".index", "a")
+        for kind, key, offset, size in self.scan(end):
+            self.add_slot(kind, key, offset, size)
+        self.index_file.flush()
+
+    @staticmethod
+    def create(filename, students, instructors, courses):
+        """
+        Writes a new record file and its index, replacing any existing ones.
+
+        :param filename: The record file.
+        :type filename: str
+        :param students: The students to save.
+        :type students: list
+        :param instructors: The instructors to save.
+        :type instructors: list
+        :param courses: The courses to save.
+        :type courses: list
+        """
+        generation = os.urandom(8).hex()
+        with open(filename + ".tmp", "wb") as file, open(filename + ".index.tmp", "w") as index:
+            file.write(json.dumps({"generation": generation}).encode("utf-8") + b"\n")
+            index.write(json.dumps({"generation": generation}) + "\n")
+            for kind, records in zip(RECORD_TYPES, (students, instructors, courses)):
+                cls, key = RECORD_TYPES[kind]
+                for record in records:
+                    slot = RecordFile.encode_slot(kind, record)
+                    index.write(json.dumps([kind, getattr(record, key), file.tell(), len(slot)]) + "\n")
+                    file.write(slot)
+        # The index goes last: if it is left behind from an older file, the generation
+        # check on open catches it.
+        os.replace(filename + ".tmp", filename)
+        os.replace(filename + ".index.tmp", filename + ".index")
+
+    @staticmethod
+    def encode_slot(kind, record, size=None):
+        """
+        Encodes a record as a slot of ``size`` bytes, or of its own size plus RECORD_SLACK.
+
+        :return: The slot, ending in a newline.
+        :rtype: bytes
+        """
+        line = json.dumps({"type": kind, "record": encode_record(record)}, default=encode_record).encode("utf-8")
+        if size is None:
+            size = len(line) + RECORD_SLACK + 1
+        return line.ljust(size - 1) + b"\n"
+
+    def read_index(self):
+        """
+        Loads the sidecar index.
+
+        :return: The offset just past the last indexed slot, or None if the index is
+            missing or belongs to another generation of the record file.
+        :rtype: int or None
+        """
+        if not os.path.exists(self.filename + ".index"):
+            return None
+        end = self.file.tell()
+        with open(self.filename + ".index", "r") as file:
+            try:
+                if json.loads(file.readline())["generation"] != self.generation:
+                    return None
+            except ValueError:
+                return None
+            lines = file.read().splitlines()
+        with gc_paused():
+            try:
+                # Parsing the whole index as one array is much faster than line by line;
+                # a torn last line from a crash sends it down the slow path.
+                entries = json.loads("[" + ",".join(lines) + "]")
+            except ValueError:
+                entries = []
+                for line in lines:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+            for kind, key, offset, size in entries:
+                self.index[kind][key] = (offset, size)
+                end = max(end, offset + size)
+        return end
+
+    def scan(self, offset):
+        """
+        Yields ``(kind, key, offset, size)`` for every slot from ``offset`` to the end.
+        """
+        self.file.seek(offset)
+        for line in self.file:
+            size = len(line)
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                    kind = entry["type"]
+                    yield kind, entry["record"][RECORD_TYPES[kind][1]], offset, size
+                except (ValueError, KeyError):
+                    pass
+            offset += size
+
+    def add_slot(self, kind, key, offset, size):
+        """
+        Points the index at a slot and records that in the sidecar.
+        """
+        self.index[kind][key] = (offset, size)
+        self.index_file.write(json.dumps([kind, key, offset, size]) + "\n")
+
+    def read(self, kind, key):
+        """
+        Reads one record without touching the rest of the file.
+
+        :param kind: The record type: "students", "instructors" or "courses".
+        :type kind: str
+        :param key: The record's ID.
+        :type key: str
+        :return: The record, or None if there is no record with that ID.
+        :rtype: Student or Instructor or Course
+        """
+        slot = self.index[kind].get(key)
+        if slot is None:
+            return None
+        offset, size = slot
+        self.file.seek(offset)
+        entry = json.loads(self.file.read(size))
+        return decode_record(RECORD_TYPES[kind][0], entry["record"])
+
+    def write(self, kind, record):
+        """
+        Saves one record, in place if it still fits in its slot and appended otherwise.
+
+        A moved record's old slot is only blanked once the new one is written and
+        indexed, so a crash in between leaves the old copy readable.
+
+        :param kind: The record type: "students", "instructors" or "courses".
+        :type kind: str
+        :param record: The record to save.
+        :type record: Student or Instructor or Course
+        """
+        key = getattr(record, RECORD_TYPES[kind][1])
+        slot = self.index[kind].get(key)
+        data = self.encode_slot(kind, record)
+        if slot is not None:
+            offset, size = slot
+            if len(data) - RECORD_SLACK <= size:
+                self.file.seek(offset)
+                self.file.write(self.encode_slot(kind, record, size))
+                self.file.flush()
+                return
+        end = self.file.seek(0, os.SEEK_END)
+        self.file.write(data)
+        self.file.flush()
+        self.add_slot(kind, key, end, len(data))
+        self.index_file.flush()
+        if slot is not None:
+            self.file.seek(offset)
+            self.file.write(b" " * (size - 1) + b"\n")
+            self.file.flush()
+
+    def read_all(self):
+        """
+        Reads every record, in file order.
+
+        Only the slot the index points at is read for each ID, so the old copy of a
+        record that was being moved when the program stopped is skipped.
+
+        :return: The lists of records by type.
+        :rtype: dict
+        """
+        records = {kind: [] for kind in RECORD_TYPES}
+        self.file.seek(0)
+        offset = len(self.file.readline())
+        for line in self.file:
+            size = len(line)
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if entry is not None:
+                    cls, key = RECORD_TYPES[entry["type"]]
+                    slot = self.index[entry["type"]].get(entry["record"][key])
+                    if slot is not None and slot[0] == offset:
+                        records[entry["type"]].append(decode_record(cls, entry["record"]))
+            offset += size
+        return records
+
+    def close(self):
+        """
+        Closes the record file and its index.
+        """
+        self.file.close()
+        self.index_file.close()
+
+
+def record_file():
+    """
+    Returns the open RecordFile for 'data.records', opening it on first use.
+
+    :return: The record file.
+    :rtype: RecordFile
+    """
+    global _record_file
+    if _record_file is None:
+        _record_file = RecordFile(RECORD_FILE)
+    return _record_file
+
+
+def close_record_file():
+    """
+    Closes the open RecordFile, if any, before its files are replaced or removed.
+    """
+    global _record_file
+    if _record_file is not None:
+        _record_file.close()
+        _record_file = None
+
+
+def update_record(kind, key, change):
+    """
+    Applies ``change`` to one record and saves it.
+
+    The record is found through the Repository's ID index. When the data is kept in
+    'data.records', only that record is read from disk and written back, and the
+    Repository gets the updated record in place of its old copy. Otherwise the
+    in-memory record is changed and saved with journal_record().
+
+    :param kind: The record type: "students", "instructors" or "courses".
+    :type kind: str
+    :param key: The record's ID.
+    :type key: str
+    :param change: Called with the record to modify it.
+    :type change: callable
+    :return: The updated record, or None if there is no record with that ID.
+    :rtype: Student or Instructor or Course
+    """
+    records = {"students": students, "instructors": instructors, "courses": courses}[kind]
+    position = records.position(key)
+    if snapshot_format_on_disk() == "records":
+        with _journal_lock:
+            record = record_file().read(kind, key)
+            if record is None:
+                return None
+            change(record)
+            record_file().write(kind, record)
+        if position is not None:
+            records[position] = record
+        return record
+    if position is None:
+        return None
+    record = records[position]
+    change(record)
+    journal_record(kind, record)
+    return record
+
+
+class Repository(MutableSequence):
+    """
+    The in-memory list of one record type, with hash indexes on its ID and, for people, email.
+
+    It behaves like the list it wraps, so iterating, appending and replacing records
+    work as before, and keeps a dict from each value of the INDEXED_FIELDS to the
+    record's position. The indexes are built on the first lookup, reading a columnar
+    snapshot's key columns without building its records, and are kept up to date by
+    appends and replacements. Inserting in the middle or deleting shifts positions, so
+    the indexes are dropped and rebuilt on the next lookup.
+
+    :param kind: The record type: "students", "instructors" or "courses".
+    :type kind: str
+    :param records: The records to wrap; a new list if omitted.
+    :type records: list or LazyRecords
+    """
+
+    def __init__(self, kind, records=None):
+        self.kind = kind
+        self.records = records if records is not None else []
+        self.fields = INDEXED_FIELDS[kind]
+        self.indexes = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __setitem__(self, index, record):
+        if isinstance(index, slice) or self.indexes is None:
+            self.records[index] = record
+            self.indexes = None
+            return
+        if index < 0:
+            index += len(self.records)
+        self.unindex(self.records[index], index)
+        self.records[index] = record
+        self.add_to_indexes(record, index)
+
+    def __delitem__(self, index):
+        del self.records[index]
+        self.indexes = None
+
+    def insert(self, index, record):
+        if index >= len(self.records):
+            self.records.append(record)
+            if self.indexes is not None:
+                self.add_to_indexes(record, len(self.records) - 1)
+        else:
+            self.records.insert(index, record)
+            self.indexes = None
+
+    def lookup(self, field):
+        """
+        Returns the index for ``field``, building all indexes if needed.
+
+        :param field: One of the INDEXED_FIELDS of this record type.
+        :type field: str
+        :return: The field values mapped to record positions.
+        :rtype: dict
+        """
+        if self.indexes is None:
+            self.indexes = {}
+            for name in self.fields:
+                if isinstance(self.records, LazyRecords):
+                    values = self.records.keys(name)
+                else:
+                    values = [getattr(record, name) for record in self.records]
+                self.indexes[name] = {value: i for i, value in enumerate(values)}
+        return self.indexes[field]
+
+    def add_to_indexes(self, record, position):
+        """
+        Points every index at ``record``, which is at ``position``.
+        """
+        for name in self.fields:
+            self.indexes[name][getattr(record, name)] = position
+
+    def unindex(self, record, position):
+        """
+        Removes the index entries that still point at ``record`` at ``position``.
+        """
+        for name in self.fields:
+            index = self.indexes[name]
+            if index.get(getattr(record, name)) == position:
+                del index[getattr(record, name)]
+
+    def position(self, key):
+        """
+        Returns the position of the record with ID ``key``, or None.
+        """
+        return self.lookup(self.fields[0]).get(key)
+
+    def get(self, key):
+        """
+        Returns the record with ID ``key``, or None.
+        """
+        position = self.lookup(self.fields[0]).get(key)
+        return None if position is None else self.records[position]
+
+    def find(self, field, value):
+        """
+        Returns the record whose indexed ``field`` equals ``value``, or None.
+
+        :param field: One of the INDEXED_FIELDS of this record type.
+        :type field: str
+        :param value: The value to look up.
+        :type value: str
+        :return: The record, or None.
+        :rtype: Student or Instructor or Course
+        """
+        position = self.lookup(field).get(value)
+        return None if position is None else self.records[position]
+
+    def has_id(self, key):
+        """
+        Tells whether a record with ID ``key`` exists.
+        """
+        return key in self.lookup(self.fields[0])
+
+    def has_email(self, email):
+        """
+        Tells whether a student or instructor already uses ``email``.
+        """
+        return email in self.lookup("_Person__email")
+
+    def update(self, record):
+        """
+        Replaces the record with the same ID, or appends ``record`` if it is new.
+
+        :param record: The new version of the record.
+        :type record: Student or Instructor or Course
+        """
+        position = self.position(getattr(record, self.fields[0]))
+        if position is None:
+            self.append(record)
+        else:
+            self[position] = record
+
+
+def seed_records():
     """
-    Updates the data by saving students, instructors, and courses to 'data.json'.
+    Returns the records a new installation starts with.
+
+    :return: Lists of students, instructors and courses by type.
+    :rtype: dict
     """
-    data = {
-        "students": [student.serialize() for student in students],
-        "instructors": [instructor.serialize() for instructor in instructors],
-        "courses": [course.serialize() for course in courses]
+    return {
+        "students": [Student("Alice Smith", 20, "mail2@mail.com", "123445", [])],
+        "instructors": [Instructor("John Doe", 30, "mail@mail.com", "12345", [])],
+        "courses": [Course("CSC101", "Introduction to Computer Science", None, [])],
     }
-    with open("data.json", "w") as file:
-        json.dump(data, file)
 
 
-def load_data():
+def read_data(snapshot_format=None):
+    """
+    Reads the snapshot and replays the change journal on top of it.
+
+    The snapshot in ``snapshot_format`` is read if it exists, otherwise the one in the
+    other formats; with a journal but no snapshot, the journal is replayed onto
+    seed_records(). For 'data.json' both the current layout and the older one, where each
+    record is a JSON string of its own, are accepted. A columnar 'data.col' is mapped
+    and its records are built as they are accessed.
+
+    :param snapshot_format: "json", "columnar" or "records"; defaults to SNAPSHOT_FORMAT.
+    :type snapshot_format: str
+    :return: The students, instructors, and courses, each in a Repository.
+    :rtype: tuple
+    :raises FileNotFoundError: If neither a snapshot nor a journal exists.
     """
-    Loads data from 'data.json' and deserializes it into students, instructors, and courses.
+    journals = [JOURNAL_FILE + ".compacting", JOURNAL_FILE]
+    preferred = SNAPSHOT_FILES[snapshot_format or SNAPSHOT_FORMAT]
+    candidates = [preferred] + [filename for filename in SNAPSHOT_FILES.values() if filename != preferred]
+    filename = next((filename for filename in candidates if os.path.exists(filename)), None)
+    text = None
+    if filename == DATA_FILE:
+        with open(DATA_FILE, "r") as file:
+            text = file.read()
+    elif filename is None and not any(os.path.exists(journal) for journal in journals):
+        raise FileNotFoundError(DATA_FILE)
+    with gc_paused():
+        data = json.loads(text) if text is not None else {kind: [] for kind in RECORD_TYPES}
+        if filename == COLUMNAR_FILE:
+            records = read_columnar(filename)
+        elif filename == RECORD_FILE:
+            records = record_file().read_all()
+        elif filename is None:
+            records = seed_records()
+        elif "fields" in data:
+            records = {kind: decode_rows(cls, data["fields"][kind], data[kind]) for kind, (cls, key) in RECORD_TYPES.items()}
+        else:
+            records = {kind: [decode_record(cls, item) for item in data[kind]] for kind, (cls, key) in RECORD_TYPES.items()}
+        for journal in journals:
+            replay_journal(journal, records)
+    return tuple(Repository(kind, records[kind]) for kind in RECORD_TYPES)
+
+
+def load_data(snapshot_format=None):
     """
+    Loads data from the snapshot and the change journal into students, instructors, and courses.
+
+    :param snapshot_format: "json", "columnar" or "records"; defaults to SNAPSHOT_FORMAT.
+    :type snapshot_format: str
+    """
+    global students, instructors, courses
     try:
-        with open("data.json", "r") as file:
-            data = json.load(file)
-            students = [Student.deserialize(student) for student in data["students"]]
-            instructors = [Instructor.deserialize(instructor) for instructor in data["instructors"]]
-            courses = [Course.deserialize(course) for course in data["courses"]]
+        students, instructors, courses = read_data(snapshot_format)
     except:
-        students = []
-        instructors = []
-        courses = []
+        students = Repository("students")
+        instructors = Repository("instructors")
+        courses = Repository("courses")
+
+
+def fill_course_menu(dropdown, shown, selected):
+    """
+    Lists every course in a dropdown by name. Choosing one shows its name and keeps its
+    ID, since two courses may share a name.
+
+    :param dropdown: The course dropdown.
+    :type dropdown: tk.OptionMenu
+    :param shown: The dropdown's variable, set to the chosen course's name.
+    :type shown: tk.StringVar
+    :param selected: Set to the chosen course's ID.
+    :type selected: tk.StringVar
+    """
+    menu = dropdown["menu"]
+    menu.delete(0, "end")
+    for course in courses:
+        menu.add_command(label=course, command=lambda course=course: (
+            shown.set(course.course_name), selected.set(course.course_id)))
 
 
 def update_row():
@@ -262,25 +1424,16 @@ def delete_row():
 
 
 try:
-    with open("data.json", "r") as file:
-        data = json.load(file)
-        students = [Student.deserialize(student) for student in data["students"]]
-        instructors = [Instructor.deserialize(instructor) for instructor in data["instructors"]]
-        courses = [Course.deserialize(course) for course in data["courses"]]
+    students, instructors, courses = read_data()
 except:
-    students = [
-        Student("Alice Smith", 20, "mail2@mail.com", "123445", []),
-    ]
-    instructors = [
-        Instructor("John Doe", 30, "mail@mail.com", "12345", []),
-    ]
-    courses = [
-        Course("CSC101", "Introduction to Computer Science", None, []),
-    ]
+    seeds = seed_records()
+    students = Repository("students", seeds["students"])
+    instructors = Repository("instructors", seeds["instructors"])
+    courses = Repository("courses", seeds["courses"])
 
 
 # TKINTER GUI
-if True:
+if __name__ == "__main__":
     root = tk.Tk()
     root.title("Student Management System")
     root.geometry("1920x1080")
@@ -309,8 +1462,11 @@ if True:
         Submits the student form and adds a new student to the list.
         """
         student = Student(student_name_entry.get(), int(student_age_entry.get()), student_email_entry.get(), student_id_entry.get())
+        if students.has_id(student.student_id) or students.has_email(student.get_email()):
+            print("A student with this ID or email already exists.")
+            return
         students.append(student)
-        update_data()
+        journal_record("students", student)
         print("Student added successfully.")
 
     tk.Button(student_form, text="Submit", command=submit_student).grid(row=6, column=0, columnspan=2)
@@ -324,28 +1480,26 @@ if True:
 
     student_id_entry = tk.Entry(register_student_form)
     student_id_entry.grid(row=1, column=1)
-    student_course_dropdown = tk.OptionMenu(register_student_form, tk.StringVar(), *courses)
+    student_course_name = tk.StringVar()
+    student_course_id = tk.StringVar()
+    student_course_dropdown = tk.OptionMenu(register_student_form, student_course_name, "")
     student_course_dropdown.grid(row=2, column=1)
 
     def update_student_dropdown():
         """
         Updates the course dropdown menu for students.
         """
-        student_course_dropdown["menu"].delete(0, "end")
-        for course in courses:
-            student_course_dropdown["menu"].add_command(label=course, command=tk._setit(student_course_dropdown.cget("text"), course))
+        fill_course_menu(student_course_dropdown, student_course_name, student_course_id)
+
+    update_student_dropdown()
 
     def register_student():
         """
         Registers a student to a selected course.
         """
         student_id = student_id_entry.get()
-        course_id = student_course_dropdown.cget("text")
-        for student in students:
-            if student.student_id == student_id:
-                student.register_course(course_id)
-                break
-        update_data()
+        course_id = student_course_id.get()
+        update_record("students", student_id, lambda student: student.register_course(course_id))
         print("Student registered successfully.")
 
     tk.Button(register_student_form, text="Submit", command=register_student).grid(row=3, column=0, columnspan=2)
@@ -374,8 +1528,11 @@ if True:
         Submits the instructor form and adds a new instructor to the list.
         """
         instructor = Instructor(instructor_name_entry.get(), int(instructor_age_entry.get()), instructor_email_entry.get(), instructor_id_entry.get(), [])
+        if instructors.has_id(instructor.instructor_id) or instructors.has_email(instructor.get_email()):
+            print("An instructor with this ID or email already exists.")
+            return
         instructors.append(instructor)
-        update_data()
+        journal_record("instructors", instructor)
         print("Instructor added successfully.")
 
     tk.Button(instructor_form, text="Submit", command=submit_instructor).grid(row=5, column=0, columnspan=2)
@@ -389,28 +1546,26 @@ if True:
 
     instructor_id_entry = tk.Entry(assign_instructor_form)
     instructor_id_entry.grid(row=1, column=1)
-    instructor_course_dropdown = tk.OptionMenu(assign_instructor_form, tk.StringVar(), *courses)
+    instructor_course_name = tk.StringVar()
+    instructor_course_id = tk.StringVar()
+    instructor_course_dropdown = tk.OptionMenu(assign_instructor_form, instructor_course_name, "")
     instructor_course_dropdown.grid(row=2, column=1)
 
     def update_instructor_dropdown():
         """
         Updates the course dropdown menu for instructors.
         """
-        instructor_course_dropdown["menu"].delete(0, "end")
-        for course in courses:
-            instructor_course_dropdown["menu"].add_command(label=course, command=tk._setit(instructor_course_dropdown.cget("text"), course))
+        fill_course_menu(instructor_course_dropdown, instructor_course_name, instructor_course_id)
+
+    update_instructor_dropdown()
 
     def assign_instructor():
         """
         Assigns an instructor to a selected course.
         """
         instructor_id = instructor_id_entry.get()
-        course_id = instructor_course_dropdown.cget("text")
-        for instructor in instructors:
-            if instructor.instructor_id == instructor_id:
-                instructor.assign_course(course_id)
-                break
-        update_data()
+        course_id = instructor_course_id.get()
+        update_record("instructors", instructor_id, lambda instructor: instructor.assign_course(course_id))
         print("Instructor assigned successfully.")
 
     tk.Button(assign_instructor_form, text="Submit", command=assign_instructor).grid(row=3, column=0, columnspan=2)
@@ -433,8 +1588,11 @@ if True:
         Submits the course form and adds a new course to the list.
         """
         course = Course(course_id_entry.get(), course_name_entry.get(), None, [])
+        if courses.has_id(course.course_id):
+            print("A course with this ID already exists.")
+            return
         courses.append(course)
-        update_data()
+        journal_record("courses", course)
         update_student_dropdown()
         update_instructor_dropdown()
         print("Course added successfully.")
@@ -537,58 +1695,219 @@ if True:
     delete_button = tk.Button(tab_control, text="Delete Record", command=delete_row)
     delete_button.grid(row=0, column=1)
 
-    save_button = tk.Button(root, text="Save Data", command=update_data)
+    snapshot_format = tk.StringVar(value=SNAPSHOT_FORMAT)
+    tk.Radiobutton(root, text="JSON", variable=snapshot_format, value="json").pack()
+    tk.Radiobutton(root, text="Columnar", variable=snapshot_format, value="columnar").pack()
+    tk.Radiobutton(root, text="Records", variable=snapshot_format, value="records").pack()
+    save_button = tk.Button(root, text="Save Data", command=lambda: update_data(snapshot_format.get()))
     save_button.pack()
-    load_button = tk.Button(root, text="Load Data", command=load_data)
+    load_button = tk.Button(root, text="Load Data", command=lambda: load_data(snapshot_format.get()))
     load_button.pack()
 
     root.mainloop()
 
 
-connection = connect("students.db")
-cursor = connection.cursor()
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS students (
-    student_id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    age INTEGER NOT NULL,
-    email TEXT NOT NULL
-)
-""")
-connection.commit()
-
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS instructors (
-    instructor_id INTEGER PRIMARY KEY,
-    name TEXT NOT NULL,
-    age INTEGER NOT NULL,
-    email TEXT NOT NULL
-)
-""")
-connection.commit()
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS courses (
-    course_id INTEGER PRIMARY KEY,
-    course_name TEXT NOT NULL,
-    instructor_id INTEGER NOT NULL,
-    FOREIGN KEY (instructor_id) REFERENCES instructors (instructor_id)
-)
-""")
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS registrations (
-    student_id INTEGER NOT NULL,
-    course_id INTEGER NOT NULL,
-    FOREIGN KEY (student_id) REFERENCES students (student_id),
-    FOREIGN KEY (course_id) REFERENCES courses (course_id)
-)
-""")
-connection.commit()
-
-connection.close()
+# Connection profiles: the PRAGMAs connect_database() applies to each new connection.
+# All of them use WAL journaling, so readers keep reading while a writer commits.
+#   durable      every commit is fsynced; the default.
+#   fast-bulk    no fsyncs and a large cache for imports; a power cut can lose the
+#                latest commits, though an application crash cannot.
+#   read-mostly  commits are fsynced at checkpoints only, and the file is mapped into
+#                memory with a large cache for repeated reads.
+SQLITE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8192,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "fast-bulk": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "read-mostly": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+DEFAULT_PROFILE = "durable"
+
+
+def connect_database(database, profile=DEFAULT_PROFILE, **kwargs):
+    """
+    Opens an SQLite connection and applies a performance profile to it.
+
+    :param database: The database file name.
+    :type database: str
+    :param profile: A key of SQLITE_PROFILES.
+    :type profile: str
+    :param kwargs: Passed on to ``sqlite3.connect``.
+    :return: The connection.
+    :rtype: sqlite3.Connection
+    :raises ValueError: If the profile is unknown.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    connection = connect(database, **kwargs)
+    for name, value in SQLITE_PROFILES[profile].items():
+        connection.execute(f"PRAGMA {name} = {value}")
+    return connection
+
+
+def create_tables(database, profile=DEFAULT_PROFILE):
+    """
+    Creates the students, instructors, courses, and registrations tables if they do not exist.
+
+    :param database: The database file name.
+    :type database: str
+    :param profile: A key of SQLITE_PROFILES.
+    :type profile: str
+    """
+    connection = connect_database(database, profile)
+    cursor = connection.cursor()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS students (
+        student_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        age INTEGER NOT NULL,
+        email TEXT NOT NULL
+    )
+    """)
+    connection.commit()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS instructors (
+        instructor_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        age INTEGER NOT NULL,
+        email TEXT NOT NULL
+    )
+    """)
+    connection.commit()
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS courses (
+        course_id INTEGER PRIMARY KEY,
+        course_name TEXT NOT NULL,
+        instructor_id INTEGER NOT NULL,
+        FOREIGN KEY (instructor_id) REFERENCES instructors (instructor_id)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS registrations (
+        student_id INTEGER NOT NULL,
+        course_id INTEGER NOT NULL,
+        FOREIGN KEY (student_id) REFERENCES students (student_id),
+        FOREIGN KEY (course_id) REFERENCES courses (course_id)
+    )
+    """)
+    connection.commit()
+
+    connection.close()
+
+
+create_tables("students.db")
+
+
+BULK_BATCH_SIZE = 1000
+
+# Backups are SQLite database images made with the online backup API, copied
+# BACKUP_PAGES_PER_STEP pages at a time and optionally compressed. restore() also
+# reads the SQL text dumps written by earlier versions.
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_CHUNK_SIZE = 1 << 20
+BACKUP_OPENERS = {None: open, "gzip": gzip.open, "xz": lzma.open}
+# Fast settings: the top levels cost several times the time for a few percent less.
+BACKUP_COMPRESSION_LEVELS = {"gzip": {"compresslevel": 6}, "xz": {"preset": 1}}
+BACKUP_COMPRESSION_SUFFIXES = {".gz": "gzip", ".xz": "xz"}
+BACKUP_MAGIC = {b"\x1f\x8b": "gzip", b"\xfd7zXZ\x00": "xz"}
+SQLITE_MAGIC = b"SQLite format 3\x00"
+
+
+def open_backup(filename):
+    """
+    Opens a backup file for binary reading, decompressing it if needed.
+
+    The compression is recognized by the file's magic bytes, not its name.
+
+    :param filename: The backup file name.
+    :type filename: str
+    :return: A binary file object.
+    """
+    with open(filename, "rb") as file:
+        head = file.read(6)
+    compression = next((name for magic, name in BACKUP_MAGIC.items() if head.startswith(magic)), None)
+    return BACKUP_OPENERS[compression](filename, "rb")
+
+
+def scratch_file(near):
+    """
+    Creates an empty temporary file in the directory of ``near``.
+
+    :return: The temporary file name.
+    :rtype: str
+    """
+    descriptor, name = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(near)))
+    os.close(descriptor)
+    return name
+
+
+def dump_statements(file):
+    """
+    Yields the SQL statements of a text dump one at a time.
+
+    :param file: The dump, opened in text mode.
+    """
+    statement = ""
+    for line in file:
+        statement += line
+        if complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def backup_progress(progress):
+    """
+    Adapts a ``progress(copied, total)`` callback to the backup API's signature.
+    """
+    if progress is None:
+        return None
+    return lambda status, remaining, total: progress(total - remaining, total)
+
+
+# Incremental backups. Once track_changes() has run, triggers append the rowid of every
+# inserted, updated or deleted row to change_log, and backup_mark holds the change_log
+# position the latest backup covers. A delta holds the current state of each row
+# changed since then, or null for a deleted row, as JSON lines after a header.
+CHANGE_TRACKED_TABLES = ("students", "instructors", "courses", "registrations")
+DELTA_FORMAT = "student-management-delta"
+
+
+def change_log_position(cursor):
+    """
+    Returns the sequence number of the latest change_log entry.
+
+    :param cursor: A cursor on the database.
+    :type cursor: sqlite3.Cursor
+    :return: The position, 0 before the first change, or None without change tracking.
+    :rtype: int
+    """
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'backup_mark'").fetchone() is None:
+        return None
+    row = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
 
 
 class DatabaseManager:
@@ -597,12 +1916,73 @@ class DatabaseManager:
 
     :param database: The database file name.
     :type database: str
+    :param profile: The connection profile, a key of SQLITE_PROFILES.
+    :type profile: str
     """
 
-    def __init__(self, database):
-        self.connection = connect(database)
+    def __init__(self, database, profile=DEFAULT_PROFILE):
+        self.connection = connect_database(database, profile)
         self.cursor = self.connection.cursor()
 
+    @contextmanager
+    def reading(self):
+        """
+        Provides a cursor for reading.
+
+        :return: A context manager yielding the cursor.
+        """
+        yield self.cursor
+
+    @contextmanager
+    def writing(self):
+        """
+        Provides a cursor inside a transaction that is committed when the block exits,
+        or rolled back if it raises.
+
+        :return: A context manager yielding the cursor.
+        """
+        with self.connection:
+            yield self.cursor
+
+    def connections(self):
+        """
+        Lists every SQLite connection the manager holds.
+
+        :return: The connections.
+        :rtype: list
+        """
+        return [self.connection]
+
+    def _bulk_insert(self, query, rows, batch_size):
+        """
+        Inserts rows in batches inside a single transaction.
+
+        The iterable is consumed lazily, ``batch_size`` rows at a time, so it can be a
+        generator over a file of any size. Nothing is committed unless every batch succeeds.
+
+        :param query: The parameterized INSERT statement.
+        :type query: str
+        :param rows: An iterable of parameter tuples.
+        :type rows: iterable
+        :param batch_size: The number of rows handed to each ``executemany`` call.
+        :type batch_size: int
+        :return: The number of rows inserted.
+        :rtype: int
+        :raises ValueError: If batch_size is not positive.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive.")
+        rows = iter(rows)
+        inserted = 0
+        with self.writing() as cursor:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                cursor.executemany(query, batch)
+                inserted += cursor.rowcount
+        return inserted
+
     def create_student(self, name, age, email):
         """
         Creates a new student in the database.
@@ -614,8 +1994,21 @@ class DatabaseManager:
         :param email: The email address of the student.
         :type email: str
         """
-        self.cursor.execute("INSERT INTO students (name, age, email) VALUES (?, ?, ?)", (name, age, email))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("INSERT INTO students (name, age, email) VALUES (?, ?, ?)", (name, age, email))
+
+    def create_students(self, rows, batch_size=BULK_BATCH_SIZE):
+        """
+        Creates many students in one transaction.
+
+        :param rows: An iterable of (name, age, email) tuples.
+        :type rows: iterable
+        :param batch_size: The number of rows inserted per batch.
+        :type batch_size: int
+        :return: The number of students inserted.
+        :rtype: int
+        """
+        return self._bulk_insert("INSERT INTO students (name, age, email) VALUES (?, ?, ?)", rows, batch_size)
 
     def read_students(self):
         """
@@ -624,8 +2017,9 @@ class DatabaseManager:
         :return: A list of student records.
         :rtype: list
         """
-        self.cursor.execute("SELECT * FROM students")
-        return self.cursor.fetchall()
+        with self.reading() as cursor:
+            cursor.execute("SELECT * FROM students")
+            return cursor.fetchall()
 
     def update_student(self, student_id, name, age, email):
         """
@@ -640,8 +2034,8 @@ class DatabaseManager:
         :param email: The new email address.
         :type email: str
         """
-        self.cursor.execute("UPDATE students SET name = ?, age = ?, email = ? WHERE student_id = ?", (name, age, email, student_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("UPDATE students SET name = ?, age = ?, email = ? WHERE student_id = ?", (name, age, email, student_id))
 
     def delete_student(self, student_id):
         """
@@ -650,8 +2044,8 @@ class DatabaseManager:
         :param student_id: The ID of the student to delete.
         :type student_id: int
         """
-        self.cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
 
     def create_instructor(self, name, age, email):
         """
@@ -664,8 +2058,21 @@ class DatabaseManager:
         :param email: The email address of the instructor.
         :type email: str
         """
-        self.cursor.execute("INSERT INTO instructors (name, age, email) VALUES (?, ?, ?)", (name, age, email))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("INSERT INTO instructors (name, age, email) VALUES (?, ?, ?)", (name, age, email))
+
+    def create_instructors(self, rows, batch_size=BULK_BATCH_SIZE):
+        """
+        Creates many instructors in one transaction.
+
+        :param rows: An iterable of (name, age, email) tuples.
+        :type rows: iterable
+        :param batch_size: The number of rows inserted per batch.
+        :type batch_size: int
+        :return: The number of instructors inserted.
+        :rtype: int
+        """
+        return self._bulk_insert("INSERT INTO instructors (name, age, email) VALUES (?, ?, ?)", rows, batch_size)
 
     def read_instructors(self):
         """
@@ -674,8 +2081,9 @@ class DatabaseManager:
         :return: A list of instructor records.
         :rtype: list
         """
-        self.cursor.execute("SELECT * FROM instructors")
-        return self.cursor.fetchall()
+        with self.reading() as cursor:
+            cursor.execute("SELECT * FROM instructors")
+            return cursor.fetchall()
 
     def update_instructor(self, instructor_id, name, age, email):
         """
@@ -690,8 +2098,8 @@ class DatabaseManager:
         :param email: The new email address.
         :type email: str
         """
-        self.cursor.execute("UPDATE instructors SET name = ?, age = ?, email = ? WHERE instructor_id = ?", (name, age, email, instructor_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("UPDATE instructors SET name = ?, age = ?, email = ? WHERE instructor_id = ?", (name, age, email, instructor_id))
 
     def delete_instructor(self, instructor_id):
         """
@@ -700,8 +2108,8 @@ class DatabaseManager:
         :param instructor_id: The ID of the instructor to delete.
         :type instructor_id: int
         """
-        self.cursor.execute("DELETE FROM instructors WHERE instructor_id = ?", (instructor_id,))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("DELETE FROM instructors WHERE instructor_id = ?", (instructor_id,))
 
     def create_course(self, course_name, instructor_id):
         """
@@ -712,8 +2120,21 @@ class DatabaseManager:
         :param instructor_id: The ID of the instructor teaching the course.
         :type instructor_id: int
         """
-        self.cursor.execute("INSERT INTO courses (course_name, instructor_id) VALUES (?, ?)", (course_name, instructor_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("INSERT INTO courses (course_name, instructor_id) VALUES (?, ?)", (course_name, instructor_id))
+
+    def create_courses(self, rows, batch_size=BULK_BATCH_SIZE):
+        """
+        Creates many courses in one transaction.
+
+        :param rows: An iterable of (course_name, instructor_id) tuples.
+        :type rows: iterable
+        :param batch_size: The number of rows inserted per batch.
+        :type batch_size: int
+        :return: The number of courses inserted.
+        :rtype: int
+        """
+        return self._bulk_insert("INSERT INTO courses (course_name, instructor_id) VALUES (?, ?)", rows, batch_size)
 
     def read_courses(self):
         """
@@ -722,8 +2143,9 @@ class DatabaseManager:
         :return: A list of course records.
         :rtype: list
         """
-        self.cursor.execute("SELECT * FROM courses")
-        return self.cursor.fetchall()
+        with self.reading() as cursor:
+            cursor.execute("SELECT * FROM courses")
+            return cursor.fetchall()
 
     def update_course(self, course_id, course_name, instructor_id):
         """
@@ -736,8 +2158,8 @@ class DatabaseManager:
         :param instructor_id: The new instructor ID.
         :type instructor_id: int
         """
-        self.cursor.execute("UPDATE courses SET course_name = ?, instructor_id = ? WHERE course_id = ?", (course_name, instructor_id, course_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("UPDATE courses SET course_name = ?, instructor_id = ? WHERE course_id = ?", (course_name, instructor_id, course_id))
 
     def delete_course(self, course_id):
         """
@@ -746,8 +2168,8 @@ class DatabaseManager:
         :param course_id: The ID of the course to delete.
         :type course_id: int
         """
-        self.cursor.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
 
     def create_registration(self, student_id, course_id):
         """
@@ -758,8 +2180,21 @@ class DatabaseManager:
         :param course_id: The ID of the course.
         :type course_id: int
         """
-        self.cursor.execute("INSERT INTO registrations (student_id, course_id) VALUES (?, ?)", (student_id, course_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("INSERT INTO registrations (student_id, course_id) VALUES (?, ?)", (student_id, course_id))
+
+    def create_registrations(self, pairs, batch_size=BULK_BATCH_SIZE):
+        """
+        Registers many students for courses in one transaction.
+
+        :param pairs: An iterable of (student_id, course_id) tuples.
+        :type pairs: iterable
+        :param batch_size: The number of rows inserted per batch.
+        :type batch_size: int
+        :return: The number of registrations inserted.
+        :rtype: int
+        """
+        return self._bulk_insert("INSERT INTO registrations (student_id, course_id) VALUES (?, ?)", pairs, batch_size)
 
     def read_registrations(self):
         """
@@ -768,8 +2203,9 @@ class DatabaseManager:
         :return: A list of registration records.
         :rtype: list
         """
-        self.cursor.execute("SELECT * FROM registrations")
-        return self.cursor.fetchall()
+        with self.reading() as cursor:
+            cursor.execute("SELECT * FROM registrations")
+            return cursor.fetchall()
 
     def update_registration(self, student_id, course_id):
         """
@@ -780,8 +2216,8 @@ class DatabaseManager:
         :param course_id: The course ID.
         :type course_id: int
         """
-        self.cursor.execute("UPDATE registrations SET student_id = ?, course_id = ? WHERE student_id = ? AND course_id = ?", (student_id, course_id, student_id, course_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("UPDATE registrations SET student_id = ?, course_id = ? WHERE student_id = ? AND course_id = ?", (student_id, course_id, student_id, course_id))
 
     def delete_registration(self, student_id, course_id):
         """
@@ -792,8 +2228,8 @@ class DatabaseManager:
         :param course_id: The course ID.
         :type course_id: int
         """
-        self.cursor.execute("DELETE FROM registrations WHERE student_id = ? AND course_id = ?", (student_id, course_id))
-        self.connection.commit()
+        with self.writing() as cursor:
+            cursor.execute("DELETE FROM registrations WHERE student_id = ? AND course_id = ?", (student_id, course_id))
 
     def close(self):
         """
@@ -801,25 +2237,439 @@ class DatabaseManager:
         """
         self.connection.close()
 
-    def backup(self, filename):
+    def backup(self, filename, compression="infer", pages=BACKUP_PAGES_PER_STEP, progress=None):
         """
-        Creates a backup of the database.
+        Creates a backup of the database with SQLite's online backup API.
+
+        The pages are copied ``pages`` at a time from one read snapshot, so the
+        backup is consistent and, with WAL journaling, writers carry on while it
+        runs. The image is written next to ``filename`` and then moved into place,
+        or compressed into it in BACKUP_CHUNK_SIZE pieces.
 
         :param filename: The backup file name.
         :type filename: str
+        :param compression: None, "gzip", "xz", or "infer" to pick by the file suffix.
+        :type compression: str
+        :param pages: The number of pages copied per step.
+        :type pages: int
+        :param progress: Called as ``progress(copied, total)`` in pages after each step.
+        :type progress: callable
+        """
+        if compression == "infer":
+            compression = BACKUP_COMPRESSION_SUFFIXES.get(os.path.splitext(filename)[1])
+        image = scratch_file(filename)
+        try:
+            target = connect(image)
+            try:
+                with self.reading() as cursor:
+                    # Hold one read transaction so every step copies the same snapshot.
+                    cursor.execute("BEGIN")
+                    position = change_log_position(cursor)
+                    try:
+                        cursor.connection.backup(target, pages=pages, progress=backup_progress(progress))
+                    finally:
+                        cursor.execute("COMMIT")
+                # The image is a plain file; drop the WAL flag copied from the source.
+                target.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                target.close()
+            if compression is None:
+                os.replace(image, filename)
+            else:
+                with open(image, "rb") as source, BACKUP_OPENERS[compression](
+                        filename, "wb", **BACKUP_COMPRESSION_LEVELS[compression]) as file:
+                    shutil.copyfileobj(source, file, BACKUP_CHUNK_SIZE)
+        finally:
+            if os.path.exists(image):
+                os.remove(image)
+        if position is not None:
+            self._mark_backup(position)
+
+    def track_changes(self):
+        """
+        Starts recording changed rows for backup_incremental().
+
+        Adds the change_log and backup_mark tables and a trigger per table and
+        statement type. Each write then also appends to change_log, which is emptied
+        as backups cover it. The next full backup() starts the chain of deltas.
+        Calling it again does nothing.
+        """
+        with self.writing() as cursor:
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL
+            )
+            """)
+            cursor.execute("CREATE TABLE IF NOT EXISTS backup_mark (seq INTEGER NOT NULL)")
+            cursor.execute("INSERT INTO backup_mark (seq) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM backup_mark)")
+            for table in CHANGE_TRACKED_TABLES:
+                triggers = (
+                    ("insert", "AFTER INSERT", "new"),
+                    ("update", "AFTER UPDATE", "new"),
+                    ("move", "AFTER UPDATE", "old"),
+                    ("delete", "AFTER DELETE", "old"),
+                )
+                for name, event, row in triggers:
+                    condition = " WHEN old.rowid <> new.rowid" if name == "move" else ""
+                    cursor.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_{name}_log {event} ON {table}{condition} "
+                        f"BEGIN INSERT INTO change_log (table_name, row_id) VALUES ('{table}', {row}.rowid); END")
+
+    def _mark_backup(self, position):
+        """
+        Records that a backup covers the change_log up to ``position`` and drops those entries.
+        """
+        with self.writing() as cursor:
+            cursor.execute("UPDATE backup_mark SET seq = ?", (position,))
+            cursor.execute("DELETE FROM change_log WHERE seq <= ?", (position,))
+
+    def backup_incremental(self, filename, compression="infer"):
+        """
+        Writes the rows changed since the previous backup, full or incremental.
+
+        Everything is read from one snapshot, so writers carry on meanwhile. The
+        delta is written next to ``filename`` and moved into place; only then does
+        it become the base for the next one.
+
+        :param filename: The delta file name.
+        :type filename: str
+        :param compression: None, "gzip", "xz", or "infer" to pick by the file suffix.
+        :type compression: str
+        :return: The number of changed rows written.
+        :rtype: int
+        :raises ValueError: If track_changes() has not been called.
+        """
+        if compression == "infer":
+            compression = BACKUP_COMPRESSION_SUFFIXES.get(os.path.splitext(filename)[1])
+        changes = 0
+        scratch = scratch_file(filename)
+        try:
+            with self.reading() as cursor:
+                cursor.execute("BEGIN")
+                try:
+                    position = change_log_position(cursor)
+                    if position is None:
+                        raise ValueError("Change tracking is off; call track_changes() first.")
+                    (after,) = cursor.execute("SELECT seq FROM backup_mark").fetchone()
+                    columns = {table: [info[1] for info in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+                               for table in CHANGE_TRACKED_TABLES}
+                    header = {"format": DELTA_FORMAT, "after": after, "upto": position, "columns": columns}
+                    with BACKUP_OPENERS[compression](
+                            scratch, "wt", **BACKUP_COMPRESSION_LEVELS.get(compression, {})) as file:
+                        file.write(json.dumps(header) + "\n")
+                        for table in CHANGE_TRACKED_TABLES:
+                            rows = cursor.execute(
+                                f"SELECT changed.row_id, {table}.rowid IS NOT NULL, {table}.* "
+                                f"FROM (SELECT DISTINCT row_id FROM change_log WHERE table_name = ? AND seq > ?) AS changed "
+                                f"LEFT JOIN {table} ON {table}.rowid = changed.row_id", (table, after))
+                            for row_id, exists, *values in rows:
+                                file.write(json.dumps([table, row_id, values if exists else None]) + "\n")
+                                changes += 1
+                finally:
+                    cursor.execute("COMMIT")
+            os.replace(scratch, filename)
+        finally:
+            if os.path.exists(scratch):
+                os.remove(scratch)
+        self._mark_backup(position)
+        return changes
+
+    def restore_incremental(self, base, deltas, pages=BACKUP_PAGES_PER_STEP, progress=None):
+        """
+        Rebuilds the database from a full backup and the deltas taken after it.
+
+        The base is restored with restore(), then the deltas are applied in order in
+        one transaction. The result starts a new chain: its next delta follows the
+        last one applied.
+
+        :param base: The full backup file name.
+        :type base: str
+        :param deltas: The delta file names, oldest first.
+        :type deltas: list
+        :param pages: The number of pages copied per step while restoring the base.
+        :type pages: int
+        :param progress: Called as ``progress(copied, total)`` while restoring the base.
+        :type progress: callable
+        :raises ValueError: If the base was taken without change tracking, or a delta
+            does not continue from the file before it or has other columns.
+        """
+        self.restore(base, pages, progress)
+        with self.writing() as cursor:
+            position = change_log_position(cursor)
+            if position is None:
+                raise ValueError(f"{base} was taken without change tracking.")
+            columns = {table: [info[1] for info in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+                       for table in CHANGE_TRACKED_TABLES}
+            upserts = {
+                table: "INSERT OR REPLACE INTO %s (rowid, %s) VALUES (%s)" % (
+                    table, ", ".join(names), ", ".join("?" * (len(names) + 1)))
+                for table, names in columns.items()
+            }
+            for delta in deltas:
+                with open_backup(delta) as file:
+                    lines = io.TextIOWrapper(file, encoding="utf-8")
+                    header = json.loads(next(lines))
+                    if header.get("format") != DELTA_FORMAT:
+                        raise ValueError(f"{delta} is not an incremental backup.")
+                    if header["after"] != position:
+                        raise ValueError(f"{delta} follows change {header['after']}, not {position}.")
+                    if header["columns"] != columns:
+                        raise ValueError(f"{delta} was taken from a different schema.")
+                    for line in lines:
+                        table, row_id, values = json.loads(line)
+                        if values is None:
+                            cursor.execute(f"DELETE FROM {table} WHERE rowid = ?", (row_id,))
+                        else:
+                            cursor.execute(upserts[table], (row_id, *values))
+                    position = header["upto"]
+            cursor.execute("DELETE FROM change_log")
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'change_log'", (position,))
+            cursor.execute("UPDATE backup_mark SET seq = ?", (position,))
+
+    def restore(self, filename, pages=BACKUP_PAGES_PER_STEP, progress=None):
+        """
+        Restores the database from a backup file, replacing its contents.
+
+        Images written by backup() are copied in with the backup API, ``pages`` at
+        a time; a compressed one is first decompressed to a temporary file in
+        BACKUP_CHUNK_SIZE pieces. SQL text dumps are run one statement at a time as
+        they are read. Neither holds the whole file in memory.
+
+        :param filename: The backup file name.
+        :type filename: str
+        :param pages: The number of pages copied per step.
+        :type pages: int
+        :param progress: Called as ``progress(copied, total)`` in pages after each step.
+        :type progress: callable
+        """
+        with open_backup(filename) as file:
+            is_image = file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+            if not is_image:
+                file.seek(0)
+                with self.writing() as cursor:
+                    for statement in dump_statements(io.TextIOWrapper(file)):
+                        cursor.execute(statement)
+                return
+            if isinstance(file, io.BufferedReader):
+                image, scratch = filename, None
+            else:
+                image = scratch = scratch_file(filename)
+                file.seek(0)
+                with open(scratch, "wb") as target:
+                    shutil.copyfileobj(file, target, BACKUP_CHUNK_SIZE)
+        try:
+            source = connect("%s?mode=ro" % Path(image).absolute().as_uri(), uri=True)
+            try:
+                with self.writing() as cursor:
+                    source.backup(cursor.connection, pages=pages, progress=backup_progress(progress))
+            finally:
+                source.close()
+        finally:
+            if scratch is not None:
+                os.remove(scratch)
+
+
+class PooledDatabaseManager(DatabaseManager):
+    """
+    A DatabaseManager that can be shared between threads.
+
+    Writes go through a single connection, one transaction at a time under a lock.
+    Reads check out one of ``pool_size`` read-only connections, so up to that many run
+    at once; with WAL journaling they see the last committed data and do not wait for
+    the writer. Every DatabaseManager method works unchanged, and ``reading()`` and
+    ``writing()`` can be used directly for other statements.
+
+    :param database: The database file name.
+    :type database: str
+    :param pool_size: The number of reader connections.
+    :type pool_size: int
+    :param profile: The connection profile, a key of SQLITE_PROFILES.
+    :type profile: str
+    :param timeout: Seconds to wait for a free reader; None waits indefinitely.
+    :type timeout: float
+    :raises ValueError: If pool_size is not positive.
+    """
+
+    def __init__(self, database, pool_size=4, profile=DEFAULT_PROFILE, timeout=None):
+        if pool_size < 1:
+            raise ValueError("Pool size must be positive.")
+        self.connection = connect_database(database, profile, check_same_thread=False)
+        self.cursor = self.connection.cursor()
+        self.write_lock = threading.Lock()
+        self.timeout = timeout
+        self.reader_connections = []
+        self.readers = queue.Queue()
+        for _ in range(pool_size):
+            reader = connect_database(database, profile, check_same_thread=False)
+            reader.execute("PRAGMA query_only = ON")
+            self.reader_connections.append(reader)
+            self.readers.put(reader)
+        self.pool_size = pool_size
+
+    @contextmanager
+    def reading(self):
         """
-        with open(filename, "w") as file:
-            for line in self.connection.iterdump():
-                file.write("%s\n" % line)
+        Checks out a reader connection for the duration of the block.
 
-    def restore(self, filename):
+        :return: A context manager yielding a cursor on the reader.
+        :raises TimeoutError: If no reader becomes free within ``timeout`` seconds.
         """
-        Restores the database from a backup file.
+        try:
+            reader = self.readers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No reader connection became free in time.") from None
+        cursor = reader.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            self.readers.put(reader)
 
-        :param filename: The backup file name.
-        :type filename: str
+    @contextmanager
+    def writing(self):
+        """
+        Holds the writer for the duration of the block, inside one transaction.
+
+        :return: A context manager yielding the writer's cursor.
+        """
+        with self.write_lock:
+            with self.connection:
+                yield self.cursor
+
+    def connections(self):
+        """
+        Lists the writer and every reader connection.
+
+        :return: The connections.
+        :rtype: list
         """
-        with open(filename, "r") as file:
-            script = file.read()
-        self.cursor.executescript(script)
-        self.connection.commit()
+        return [self.connection] + self.reader_connections
+
+    def close(self):
+        """
+        Closes the writer and every reader, waiting for checked-out readers to come back.
+        """
+        with self.write_lock:
+            self.connection.close()
+        for _ in range(self.pool_size):
+            self.readers.get().close()
+
+
+# SQLite calls the progress handler every CANCEL_CHECK_STEPS virtual machine
+# instructions; a true result aborts the running statement.
+CANCEL_CHECK_STEPS = 1000
+_cancellation = threading.local()
+
+
+def cancel_requested():
+    """
+    Tells whether the AsyncDatabaseManager call running on this thread was cancelled.
+
+    It is installed as the progress handler of the manager's connections, so it is
+    called from inside SQLite on whichever thread runs the statement.
+
+    :return: True if the statement should be aborted.
+    :rtype: bool
+    """
+    event = getattr(_cancellation, "event", None)
+    return event is not None and event.is_set()
+
+
+def run_cancellable(cancelled, function, args, kwargs):
+    """
+    Calls a function on an executor thread, marking the thread with its cancel event.
+
+    :param cancelled: Set when the caller gives up on the call.
+    :type cancelled: threading.Event
+    :param function: The function to call.
+    :type function: callable
+    :return: The function's result, or None if it was cancelled before it started.
+    """
+    if cancelled.is_set():
+        return None
+    _cancellation.event = cancelled
+    try:
+        return function(*args, **kwargs)
+    finally:
+        _cancellation.event = None
+
+
+class AsyncDatabaseManager:
+    """
+    Runs DatabaseManager methods from asyncio code without blocking the event loop.
+
+    Every public method of PooledDatabaseManager is available as a coroutine of the
+    same name, e.g. ``await db.read_students()``; each takes an optional ``timeout``
+    keyword in seconds. Calls run on a thread pool one larger than the reader pool, so
+    reads proceed while a write is in progress.
+
+    A call that is cancelled, or outlives its timeout, raises CancelledError or
+    TimeoutError at once. If it has not started it never runs; if its statement is
+    running, SQLite aborts it within CANCEL_CHECK_STEPS instructions and a write's
+    transaction is rolled back. A statement that already finished is not undone.
+
+    :param database: The database file name.
+    :type database: str
+    :param pool_size: The number of reader connections.
+    :type pool_size: int
+    :param profile: The connection profile, a key of SQLITE_PROFILES.
+    :type profile: str
+    :param timeout: The default timeout in seconds; None waits indefinitely.
+    :type timeout: float
+    """
+
+    def __init__(self, database, pool_size=4, profile=DEFAULT_PROFILE, timeout=None):
+        self.manager = PooledDatabaseManager(database, pool_size, profile)
+        for connection in self.manager.connections():
+            connection.set_progress_handler(cancel_requested, CANCEL_CHECK_STEPS)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size + 1, thread_name_prefix="database")
+        self.timeout = timeout
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name == "manager":
+            raise AttributeError(name)
+        method = getattr(self.manager, name)
+        if not callable(method):
+            return method
+
+        async def call(*args, timeout=None, **kwargs):
+            return await self.run(method, *args, timeout=timeout, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = method.__doc__
+        return call
+
+    async def run(self, function, *args, timeout=None, **kwargs):
+        """
+        Runs a blocking function on the manager's executor.
+
+        :param function: The function to call with ``args`` and ``kwargs``.
+        :type function: callable
+        :param timeout: Seconds before the call is cancelled; defaults to ``self.timeout``.
+        :type timeout: float
+        :return: The function's result.
+        :raises TimeoutError: If the call takes longer than the timeout.
+        """
+        cancelled = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor, partial(run_cancellable, cancelled, function, args, kwargs))
+        try:
+            return await asyncio.wait_for(future, self.timeout if timeout is None else timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            cancelled.set()
+            raise
+
+    async def close(self):
+        """
+        Waits for running calls to finish, then closes every connection.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+        self.manager.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()